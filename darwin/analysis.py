@@ -1,7 +1,17 @@
 import matplotlib.pyplot as plt
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import os
 
+from darwin import config as c
+
+GENE_LABELS = {gene.name: gene.label for gene in c.GENES}
+MARKERS = ("o", "s", "^", "D", "v")
+
+
+def _rgb(color: Tuple[int, int, int], lighten: float = 0.0) -> Tuple[float, ...]:
+    # Matplotlib color from an RGB tuple, optionally blended towards white
+    return tuple((channel + (255 - channel) * lighten) / 255 for channel in color)
+
 
 class Plotter:
 
@@ -12,8 +22,8 @@ class Plotter:
 
         # Generate all graphs (overwrites existing files)
         Plotter._create_population_graph(statistics, output_dir)
-        Plotter._create_predator_genome_graph(statistics, output_dir)
-        Plotter._create_prey_genome_graph(statistics, output_dir)
+        for species in statistics.get("species", c.DEFAULT_SPECIES):
+            Plotter._create_genome_graph(statistics, species, output_dir)
 
         # Return the output directory path
         return output_dir
@@ -26,29 +36,22 @@ class Plotter:
         fig, ax = plt.subplots(figsize=(12, 8))
 
         time_points = pop_history.get("time", [])
-        predator_counts = pop_history.get("predators", [])
-        prey_counts = pop_history.get("prey", [])
+        species_list = statistics.get("species", c.DEFAULT_SPECIES)
+        histories = [pop_history.get(species.name, []) for species in species_list]
 
-        if time_points and predator_counts and prey_counts:
+        if time_points and all(histories):
             # Plot population lines
-            ax.plot(
-                time_points,
-                predator_counts,
-                "r-",
-                label="Predatori",
-                linewidth=3,
-                marker="o",
-                markersize=3,
-            )
-            ax.plot(
-                time_points,
-                prey_counts,
-                "b-",
-                label="Prede",
-                linewidth=3,
-                marker="s",
-                markersize=3,
-            )
+            for index, (species, counts) in enumerate(zip(species_list, histories)):
+                ax.plot(
+                    time_points,
+                    counts,
+                    "-",
+                    color=_rgb(species.color),
+                    label=species.label,
+                    linewidth=3,
+                    marker=MARKERS[index % len(MARKERS)],
+                    markersize=3,
+                )
 
             # Styling
             ax.set_xlabel("Tempo (secondi)", fontsize=14)
@@ -85,94 +88,26 @@ class Plotter:
         return graph_path
 
     @staticmethod
-    def _create_predator_genome_graph(
-        statistics: Dict[str, Any], output_dir: str
+    def _create_genome_graph(
+        statistics: Dict[str, Any], species: c.Species, output_dir: str
     ) -> str:
         genome_stats = statistics.get("genome_statistics", {})
-        predator_stats = genome_stats.get("predators", {})
-
-        plt.style.use("dark_background")
-        fig, ax = plt.subplots(figsize=(10, 6))
-
-        if predator_stats:
-            traits = ["Velocità", "Visione", "Stamina", "Forza Attacco"]
-            values = [
-                predator_stats.get("speed", 0),
-                predator_stats.get("vision", 0),
-                predator_stats.get("stamina", 0),
-                predator_stats.get("attack_strength", 0),
-            ]
-
-            bars = ax.bar(
-                traits,
-                values,
-                color=["#ff6b6b", "#ff8787", "#ffa8a8", "#ffc9c9"],
-                edgecolor="white",
-                linewidth=1.5,
-            )
-
-            # Add value labels on bars
-            for bar, value in zip(bars, values):
-                height = bar.get_height()
-                ax.text(
-                    bar.get_x() + bar.get_width() / 2.0,
-                    height + 1,
-                    f"{value:.1f}",
-                    ha="center",
-                    va="bottom",
-                    fontweight="bold",
-                    color="white",
-                )
-
-            ax.set_ylim(0, 100)
-            ax.set_ylabel("Valore Medio", fontsize=14, color="white")
-            ax.set_title(
-                "Genoma Medio dei Predatori",
-                fontsize=16,
-                fontweight="bold",
-                color="white",
-            )
-            ax.tick_params(colors="white")
-            ax.grid(True, alpha=0.3, axis="y")
-        else:
-            ax.text(
-                0.5,
-                0.5,
-                "Dati genoma predatori non disponibili",
-                ha="center",
-                va="center",
-                transform=ax.transAxes,
-                fontsize=16,
-                color="white",
-            )
-
-        graph_path = os.path.join(output_dir, "predator.png")
-        plt.savefig(graph_path, dpi=150, bbox_inches="tight", facecolor="#1a1a1a")
-        plt.close()
-
-        return graph_path
-
-    @staticmethod
-    def _create_prey_genome_graph(statistics: Dict[str, Any], output_dir: str) -> str:
-        genome_stats = statistics.get("genome_statistics", {})
-        prey_stats = genome_stats.get("prey", {})
+        species_stats = genome_stats.get(species.name, {})
 
         plt.style.use("dark_background")
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        if prey_stats:
-            traits = ["Velocità", "Visione", "Stamina", "Resistenza"]
-            values = [
-                prey_stats.get("speed", 0),
-                prey_stats.get("vision", 0),
-                prey_stats.get("stamina", 0),
-                prey_stats.get("attack_resistance", 0),
-            ]
+        if species_stats:
+            traits = [GENE_LABELS.get(gene, gene) for gene in species.genes]
+            values = [species_stats.get(gene, 0) for gene in species.genes]
 
             bars = ax.bar(
                 traits,
                 values,
-                color=["#4dabf7", "#74c0fc", "#a5d8ff", "#d0ebff"],
+                color=[
+                    _rgb(species.color, 0.3 + 0.5 * i / max(1, len(traits) - 1))
+                    for i in range(len(traits))
+                ],
                 edgecolor="white",
                 linewidth=1.5,
             )
@@ -190,10 +125,10 @@ class Plotter:
                     color="white",
                 )
 
-            ax.set_ylim(0, 100)
+            ax.set_ylim(0, c.MAX_GENE)
             ax.set_ylabel("Valore Medio", fontsize=14, color="white")
             ax.set_title(
-                "Genoma Medio delle Prede",
+                f"Genoma Medio - {species.label}",
                 fontsize=16,
                 fontweight="bold",
                 color="white",
@@ -204,7 +139,7 @@ class Plotter:
             ax.text(
                 0.5,
                 0.5,
-                "Dati genoma prede non disponibili",
+                f"Dati genoma non disponibili: {species.label}",
                 ha="center",
                 va="center",
                 transform=ax.transAxes,
@@ -212,7 +147,7 @@ class Plotter:
                 color="white",
             )
 
-        graph_path = os.path.join(output_dir, "prey.png")
+        graph_path = os.path.join(output_dir, f"{species.key}.png")
         plt.savefig(graph_path, dpi=150, bbox_inches="tight", facecolor="#1a1a1a")
         plt.close()
 
@@ -2,7 +2,7 @@
 import pygame
 from typing import Dict, Any
 from .ui import MenuScreen, SimulationScreen, StatisticsScreen
-from .simulation.simulation import Simulation
+from .simulation.engines import create_simulation
 from darwin.config import SCREEN_WIDTH, SCREEN_HEIGHT
 
 class DarwinApp:
@@ -32,7 +32,7 @@ class DarwinApp:
 
     def start_simulation(self, params: Dict[str, Any]):
         self.simulation_params = params
-        simulation = Simulation(params)
+        simulation = create_simulation(params)
         self.current_screen = SimulationScreen(self, simulation)
 
     def show_statistics(self, statistics: Dict[str, Any]):
@@ -1,7 +1,15 @@
+import math
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, Optional, Tuple
+
 # Screen dimensions
 SCREEN_WIDTH = 1500
 SCREEN_HEIGHT = 900
 
+# World dimensions (independent from the window, the camera scrolls over it)
+WORLD_WIDTH = 1500
+WORLD_HEIGHT = 900
+
 # Colors
 BLACK = (15, 15, 20)
 BLUE = (120, 180, 255)
@@ -23,7 +31,7 @@ DEFAULT_FOOD_COUNT = 70
 DEFAULT_SIMULATION_DURATION = 300  # seconds
 DEFAULT_SIMULATION_SPEED = 1
 
-# Limits
+# Limits (population maxima refer to the default world and grow with its area)
 MIN_PREY_COUNT = 4
 MAX_PREY_COUNT = 200
 MIN_PREDATOR_COUNT = 2
@@ -34,6 +42,9 @@ MIN_SIMULATION_DURATION = 30
 MAX_SIMULATION_DURATION = 600
 MIN_SIMULATION_SPEED = 1
 MAX_SIMULATION_SPEED = 10
+DEFAULT_WORLD_SCALE = 1
+MIN_WORLD_SCALE = 1
+MAX_WORLD_SCALE = 4  # world side as a multiple of the default world
 
 # Genome ranges
 MIN_GENE = 1
@@ -52,9 +63,281 @@ EATING_ENERGY_GAIN = 30
 # Vision
 PREDATOR_VISION_ANGLE = 36  # degrees
 PREY_VISION_ANGLE = 360  # degrees
+PREDATOR_VISION_MULTIPLIER = 1.5  # predators see further than their vision gene
+
+# Genetics
+MUTATION_RATE = 0.1
+
+# Spatial index
+SPATIAL_CELL_SIZE = 100
+
+# Food mode: discrete Food items, or a resource density field on a grid
+FOOD_MODES = ("items", "field")
+DEFAULT_FOOD_MODE = "items"
+RESOURCE_CELL_SIZE = 20  # world units per field cell
+RESOURCE_CAPACITY = 3.0  # energy per cell when fully grown
+RESOURCE_REGROWTH_RATE = 0.02  # fraction of the missing resource regrown per second
+RESOURCE_DIFFUSION_RATE = 0.0  # fraction exchanged with neighbour cells per second
+GRAZING_RATE = 6.0  # energy per second a prey can take from its cell
+RESOURCE_TEXTURE_CELL_SIZE = 4  # screen pixels per sample when drawing the field
+RESOURCE_TEXTURE_REFRESH = 10  # frames between recolorings of a changing field
+
+# Behavior scheduling: full target selection every N ticks, staggered by
+# entity id so each tick handles a fraction of the agents
+DEFAULT_PERCEPTION_INTERVAL = 1
+MIN_PERCEPTION_INTERVAL = 1
+MAX_PERCEPTION_INTERVAL = 10
+PERCEPTION_STAGGER = True
+
+# Agents whose step per tick exceeds this fraction of an interaction radius
+# test attacks, eating and mating against their whole path (swept circle)
+SWEEP_FRACTION = 0.5
+
+# Terrain: "none", "procedural" or the path of a biome image
+TERRAIN_MODES = ("none", "procedural")
+DEFAULT_TERRAIN = "none"
+TERRAIN_CELL_SIZE = 25  # world units per terrain cell
+TERRAIN_FEATURE_SIZE = 300  # typical biome size in world units
+
+# Event log: events buffered before a write
+EVENT_BUFFER_SIZE = 4096
+
+# Headless run cache (results of seeded runs, keyed by the full run spec)
+RUN_CACHE_DIR = ".darwin_cache"
+RUN_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Early stopping of headless runs (params["early_stop"])
+RUNAWAY_POPULATION_FACTOR = 10  # times a species' initial count
+STEADY_STATE_WINDOW = 60  # simulated seconds of stable populations
+STEADY_STATE_TOLERANCE = 0.05  # population spread over the window, relative
+
+# Island model: worlds in separate processes trading migrants
+DEFAULT_ISLANDS = 4
+MIGRATION_INTERVAL = 20  # simulated seconds between migrations
+MIGRANTS_PER_SPECIES = 2  # agents each island sends per species
+
+# Distributed runs: coordinator address and worker liveness
+COORDINATOR_HOST = "127.0.0.1"
+COORDINATOR_PORT = 5917
+HEARTBEAT_INTERVAL = 2.0  # seconds between worker heartbeats
+HEARTBEAT_TIMEOUT = 10.0  # a job without heartbeats this long is handed out again
+MAX_JOB_ATTEMPTS = 3
+
+# Camera
+CAMERA_PAN_SPEED = 600  # screen pixels per second
+CAMERA_ZOOM_STEP = 1.1
+MAX_CAMERA_ZOOM = 4.0
+
+# Density map rendering (used above the population threshold)
+DENSITY_MAP_THRESHOLD = 3000  # predators + prey + food
+DENSITY_MAP_CELL_SIZE = 8  # screen pixels per cell
+
+# Behavior turn rates (fraction of the angle to the target per tick)
+MATE_TURN_RATE = 0.15
+HUNT_TURN_RATE = 0.2
+FORAGE_TURN_RATE = 0.15
+
+# Behavior mode: fixed steering rules, or per-agent evolved neural networks
+# (vectorized engine only)
+BEHAVIOR_MODES = ("rules", "neural")
+DEFAULT_BEHAVIOR = "rules"
+NEURAL_HIDDEN_UNITS = 8
+NEURAL_WEIGHT_SCALE = 0.3  # standard deviation of the initial weights
+NEURAL_MUTATION_SCALE = 0.2  # standard deviation of a weight mutation
+NEURAL_MAX_TURN = 0.3  # radians per tick at full turn output
 
 # Fonts
 FONT_NAME = None  # Use default pygame font
 FONT_SIZE_SMALL = 16
 FONT_SIZE_MEDIUM = 24
 FONT_SIZE_LARGE = 32
+
+
+@dataclass(frozen=True)
+class Gene:
+    # One column of the shared gene array
+    name: str
+    label: str  # shown in reports
+    low: float = MIN_GENE
+    high: float = MAX_GENE
+
+
+# Every species' genome is a row over these columns; genes a species does not
+# list stay at their lower bound
+GENES = (
+    Gene("speed", "Velocità"),
+    Gene("vision", "Visione"),
+    Gene("stamina", "Stamina"),
+    Gene("attack_strength", "Forza Attacco"),
+    Gene("attack_resistance", "Resistenza"),
+)
+
+
+@dataclass(frozen=True)
+class Species:
+    # Declarative species definition. `key` names the params count
+    # ("<key>_count") and report files, `name` the statistics entries. Diet
+    # lists hunted species by name and "food" for plants; a species flees
+    # from every species whose diet contains it.
+    name: str
+    key: str
+    label: str
+    color: Tuple[int, int, int]
+    mating_color: Tuple[int, int, int]
+    genes: Tuple[str, ...]
+    diet: Tuple[str, ...]
+    vision_multiplier: float = 1.0
+    vision_angle: float = 360  # degrees, 360 sees all around
+    reproduction_gain: float = PREY_REPRODUCTION_GAIN  # score per meal
+    birth_spread: float = 0.0  # children land this far around the parents' midpoint
+
+
+DEFAULT_SPECIES = (
+    Species(
+        name="predators",
+        key="predator",
+        label="Predatori",
+        color=RED,
+        mating_color=YELLOW,
+        genes=("speed", "vision", "stamina", "attack_strength"),
+        diet=("prey",),
+        vision_multiplier=PREDATOR_VISION_MULTIPLIER,
+        vision_angle=PREDATOR_VISION_ANGLE,
+        reproduction_gain=PREDATOR_REPRODUCTION_GAIN,
+        birth_spread=20,
+    ),
+    Species(
+        name="prey",
+        key="prey",
+        label="Prede",
+        color=BLUE,
+        mating_color=PURPLE,
+        genes=("speed", "vision", "stamina", "attack_resistance"),
+        diet=("food",),
+        vision_angle=PREY_VISION_ANGLE,
+        reproduction_gain=PREY_REPRODUCTION_GAIN,
+    ),
+)
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    # Per-run constants, so simulations in one process can differ. Defaults
+    # mirror the module constants above; derived values are computed once.
+    world_width: float = WORLD_WIDTH
+    world_height: float = WORLD_HEIGHT
+    entity_radius: float = ENTITY_RADIUS
+    food_radius: float = FOOD_RADIUS
+    spatial_cell_size: float = SPATIAL_CELL_SIZE
+
+    reproduction_score_threshold: float = REPRODUCTION_SCORE_THRESHOLD
+    predator_reproduction_gain: float = PREDATOR_REPRODUCTION_GAIN
+    prey_reproduction_gain: float = PREY_REPRODUCTION_GAIN
+
+    energy_decay_rate: float = ENERGY_DECAY_RATE
+    movement_energy_cost: float = MOVEMENT_ENERGY_COST
+    eating_energy_gain: float = EATING_ENERGY_GAIN
+
+    predator_vision_angle: float = PREDATOR_VISION_ANGLE
+    prey_vision_angle: float = PREY_VISION_ANGLE
+    predator_vision_multiplier: float = PREDATOR_VISION_MULTIPLIER
+
+    mutation_rate: float = MUTATION_RATE
+
+    food_mode: str = DEFAULT_FOOD_MODE
+    resource_cell_size: float = RESOURCE_CELL_SIZE
+    resource_capacity: float = RESOURCE_CAPACITY
+    resource_regrowth_rate: float = RESOURCE_REGROWTH_RATE
+    resource_diffusion_rate: float = RESOURCE_DIFFUSION_RATE
+    grazing_rate: float = GRAZING_RATE
+
+    terrain: str = DEFAULT_TERRAIN
+    terrain_cell_size: float = TERRAIN_CELL_SIZE
+
+    perception_interval: int = DEFAULT_PERCEPTION_INTERVAL
+    perception_stagger: bool = PERCEPTION_STAGGER
+    sweep_fraction: float = SWEEP_FRACTION
+
+    # None runs DEFAULT_SPECIES tuned by the predator/prey fields above;
+    # explicit species carry those values themselves
+    species: Optional[Tuple[Species, ...]] = None
+
+    behavior: str = DEFAULT_BEHAVIOR
+    neural_hidden_units: int = NEURAL_HIDDEN_UNITS
+    neural_mutation_scale: float = NEURAL_MUTATION_SCALE
+
+    # Derived values
+    half_world_width: float = field(init=False, repr=False)
+    half_world_height: float = field(init=False, repr=False)
+    predator_half_cone: float = field(init=False, repr=False)
+    predator_cos_half_cone: float = field(init=False, repr=False)
+    prey_cos_half_cone: float = field(init=False, repr=False)
+    defined_species: Tuple[Species, ...] = field(init=False, repr=False)
+    contact_distance: float = field(init=False, repr=False)
+    contact_distance_sq: float = field(init=False, repr=False)
+    eating_distance: float = field(init=False, repr=False)
+    eating_distance_sq: float = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.food_mode not in FOOD_MODES:
+            raise ValueError(f"Unknown food mode: {self.food_mode}")
+        if self.behavior not in BEHAVIOR_MODES:
+            raise ValueError(f"Unknown behavior: {self.behavior}")
+        if self.species is not None and self._tuned_species() != DEFAULT_SPECIES:
+            raise ValueError(
+                "Predator and prey vision and reproduction fields only tune the "
+                "default species; set them on the explicit species instead"
+            )
+
+        derived = {
+            "half_world_width": self.world_width / 2,
+            "half_world_height": self.world_height / 2,
+            "predator_half_cone": math.radians(self.predator_vision_angle / 2),
+            "predator_cos_half_cone": math.cos(
+                math.radians(self.predator_vision_angle / 2)
+            ),
+            "prey_cos_half_cone": math.cos(math.radians(self.prey_vision_angle / 2)),
+            "contact_distance": self.entity_radius * 2,
+            "contact_distance_sq": (self.entity_radius * 2) ** 2,
+            "eating_distance": self.entity_radius + self.food_radius,
+            "eating_distance_sq": (self.entity_radius + self.food_radius) ** 2,
+            "defined_species": (
+                self.species if self.species is not None else self._tuned_species()
+            ),
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def _tuned_species(self) -> Tuple[Species, ...]:
+        predators, prey = DEFAULT_SPECIES
+        return (
+            replace(
+                predators,
+                vision_multiplier=self.predator_vision_multiplier,
+                vision_angle=self.predator_vision_angle,
+                reproduction_gain=self.predator_reproduction_gain,
+            ),
+            replace(
+                prey,
+                vision_angle=self.prey_vision_angle,
+                reproduction_gain=self.prey_reproduction_gain,
+            ),
+        )
+
+    @staticmethod
+    def from_overrides(
+        overrides: Optional[Dict[str, Any]] = None, **kwargs
+    ) -> "SimulationConfig":
+        values = dict(overrides or {}, **kwargs)
+        return replace(DEFAULT_CONFIG, **values)
+
+    def overrides(self) -> Dict[str, Any]:
+        # Fields that differ from the defaults, enough to rebuild this config
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.init and getattr(self, f.name) != getattr(DEFAULT_CONFIG, f.name)
+        }
+
+
+DEFAULT_CONFIG = SimulationConfig()
@@ -1,7 +1,7 @@
 
-from .base_entity import Entity
+from .base_entity import Entity, Perception, is_present
 from .food import Food
 from .predator import Predator
 from .prey import Prey
 
-__all__ = ['Entity', 'Food', 'Predator', 'Prey']
\ No newline at end of file
+__all__ = ['Entity', 'Food', 'Perception', 'Predator', 'Prey', 'is_present']
\ No newline at end of file
@@ -1,53 +1,177 @@
 import math
-import random
 import pygame
-from typing import List, Optional
+from typing import List, NamedTuple, Optional
 
 from darwin import config as c
+from ..simulation import events
+from ..simulation.rng import ModuleStreams
+
+
+class Perception(NamedTuple):
+    # What an agent reacts to this tick: a target to approach (prey, food or
+    # mate) and, for prey, the closest threat
+    target: Optional[object] = None
+    threat: Optional[object] = None
+
+
+def is_present(entity) -> bool:
+    # Still in the world: alive for agents, not eaten for food
+    if entity is None:
+        return False
+    if hasattr(entity, "available"):
+        return entity.available
+    return entity.alive
 
 
 class Entity:
+    # Name of the matching entry in config.defined_species
+    species: Optional[str] = None
 
-    def __init__(self, x: float, y: float, genome):
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        genome,
+        config: c.SimulationConfig = c.DEFAULT_CONFIG,
+        rng=ModuleStreams,
+        world=None,
+    ):
         self.x = x
         self.y = y
         self.alive = True
+        self.config = config
+        self.rng = rng
+        # Owning simulation, for shared world state such as the food store
+        self.world = world
+        self.id = world.next_entity_id() if world is not None else None
 
         self.genome = genome
         self.energy = genome.stamina
         self.max_energy = genome.stamina
         self.reproduction_score = 0
         self.damage_taken = 0
-        self.direction = random.uniform(0, 2 * math.pi)
+        self.direction = rng.spawn.uniform(0, 2 * math.pi)
         self.can_reproduce = False
 
+        # Terrain multipliers for the cell underneath, refreshed each tick
+        self.speed_modifier = 1.0
+        self.decay_modifier = 1.0
+        self.vision_modifier = 1.0
+
+        # Last full perception and whether it was taken in mating mode
+        self.perception: Optional[Perception] = None
+        self.perceived_mating = False
+
     def update(self, dt: float, entities: List["Entity"]):
         pass
 
+    def perceive(self, entities: List["Entity"]) -> Perception:
+        return Perception()
+
+    def act(self, dt: float, entities: List["Entity"], perception: Perception):
+        pass
+
+    def scheduled_perception(self, entities: List["Entity"]) -> Perception:
+        # Full target selection on this agent's scheduled ticks; in between the
+        # cached perception is kept as long as it stays valid
+        if self.world is None or self.world.perception_due(self):
+            return self.refresh_perception(entities)
+
+        cached = self.revalidate()
+        if cached is None:
+            return self.refresh_perception(entities)
+        return cached
+
+    def refresh_perception(self, entities: List["Entity"]) -> Perception:
+        self.remember(self.perceive(entities))
+        return self.perception
+
+    def remember(self, perception: Perception):
+        self.perception = perception
+        self.perceived_mating = self.can_reproduce
+
+    def revalidate(self) -> Optional[Perception]:
+        # The cached perception, or None when it no longer applies: behavior
+        # mode changed, or a target or threat is gone or out of sight
+        perception = self.perception
+        if perception is None or self.perceived_mating != self.can_reproduce:
+            return None
+
+        target = perception.target
+        if target is not None:
+            if not is_present(target) or not self.can_see(target):
+                return None
+            if type(target) is type(self) and not target.can_reproduce:
+                return None
+
+        threat = perception.threat
+        if threat is not None and (not is_present(threat) or not self.can_see(threat)):
+            return None
+
+        return perception
+
     def draw(
         self,
         screen: pygame.Surface,
+        camera,
         show_vision: bool = False,
     ):
         pass
 
+    def sense_terrain(self):
+        terrain = self.world.terrain if self.world is not None else None
+        if terrain is not None:
+            self.speed_modifier, self.decay_modifier, self.vision_modifier = (
+                terrain.modifiers_at(self.x, self.y)
+            )
+
     def distance_to(self, other) -> float:
+        config = self.config
         dx = abs(self.x - other.x)
         dy = abs(self.y - other.y)
 
-        dx = min(dx, c.SCREEN_WIDTH - dx)
-        dy = min(dy, c.SCREEN_HEIGHT - dy)
+        dx = min(dx, config.world_width - dx)
+        dy = min(dy, config.world_height - dy)
 
         return math.sqrt(dx * dx + dy * dy)
 
+    def reaches(self, target, radius: float, dt: float) -> bool:
+        # Whether the target is within radius now or anywhere along this
+        # tick's straight move. Only agents that move far enough per tick to
+        # skip over the radius pay for the swept test.
+        distance = self.distance_to(target)
+        if distance <= radius:
+            return True
+
+        step = self.genome.speed * self.speed_modifier * dt
+        if step <= radius * self.config.sweep_fraction or distance > step + radius:
+            return False
+
+        config = self.config
+        dx = target.x - self.x
+        dy = target.y - self.y
+        if abs(dx) > config.half_world_width:
+            dx = dx - math.copysign(config.world_width, dx)
+        if abs(dy) > config.half_world_height:
+            dy = dy - math.copysign(config.world_height, dy)
+
+        # Closest point of the path segment to the target
+        heading_x = math.cos(self.direction)
+        heading_y = math.sin(self.direction)
+        along = min(step, max(0.0, dx * heading_x + dy * heading_y))
+        offset_x = dx - along * heading_x
+        offset_y = dy - along * heading_y
+        return offset_x * offset_x + offset_y * offset_y <= radius * radius
+
     def angle_to(self, other) -> float:
+        config = self.config
         dx = other.x - self.x
         dy = other.y - self.y
 
-        if abs(dx) > c.SCREEN_WIDTH / 2:
-            dx = dx - math.copysign(c.SCREEN_WIDTH, dx)
-        if abs(dy) > c.SCREEN_HEIGHT / 2:
-            dy = dy - math.copysign(c.SCREEN_HEIGHT, dy)
+        if abs(dx) > config.half_world_width:
+            dx = dx - math.copysign(config.world_width, dx)
+        if abs(dy) > config.half_world_height:
+            dy = dy - math.copysign(config.world_height, dy)
 
         return math.atan2(dy, dx)
 
@@ -56,12 +180,12 @@ class Entity:
         new_x = self.x + math.cos(direction) * distance
         new_y = self.y + math.sin(direction) * distance
 
-        self.x = new_x % c.SCREEN_WIDTH
-        self.y = new_y % c.SCREEN_HEIGHT
+        self.x = new_x % self.config.world_width
+        self.y = new_y % self.config.world_height
 
     def check_collision(self, entities):
-        entity_radius = c.ENTITY_RADIUS
-        collision_distance = entity_radius * 2
+        config = self.config
+        collision_distance = config.contact_distance
 
         for other in entities:
             other_alive = (hasattr(other, "available") and other.available) or (
@@ -78,14 +202,14 @@ class Entity:
                 dx = self.x - other.x
                 dy = self.y - other.y
 
-                if abs(dx) > c.SCREEN_WIDTH / 2:
-                    dx = dx - math.copysign(c.SCREEN_WIDTH, dx)
-                if abs(dy) > c.SCREEN_HEIGHT / 2:
-                    dy = dy - math.copysign(c.SCREEN_HEIGHT, dy)
+                if abs(dx) > config.half_world_width:
+                    dx = dx - math.copysign(config.world_width, dx)
+                if abs(dy) > config.half_world_height:
+                    dy = dy - math.copysign(config.world_height, dy)
 
                 if dx == 0 and dy == 0:
-                    dx = random.uniform(-1, 1)
-                    dy = random.uniform(-1, 1)
+                    dx = self.rng.collision.uniform(-1, 1)
+                    dy = self.rng.collision.uniform(-1, 1)
 
                 distance = math.sqrt(dx * dx + dy * dy)
                 if distance > 0:
@@ -93,28 +217,32 @@ class Entity:
                     self.x += (dx / distance) * separation_strength
                     self.y += (dy / distance) * separation_strength
 
-                    self.x = self.x % c.SCREEN_WIDTH
-                    self.y = self.y % c.SCREEN_HEIGHT
+                    self.x = self.x % config.world_width
+                    self.y = self.y % config.world_height
 
     def move(self, dt: float):
-        speed = self.genome.speed
+        speed = self.genome.speed * self.speed_modifier
 
         self.move_in_direction(self.direction, speed, dt)
 
-        self.energy -= c.MOVEMENT_ENERGY_COST * dt
+        self.energy -= self.config.movement_energy_cost * dt
 
         if self.energy <= 0:
             self.alive = False
+            self.record_event(events.STARVATION, -1, self.x, self.y)
 
     def update_energy(self, dt: float):
-        self.energy -= c.ENERGY_DECAY_RATE * dt
+        self.energy -= self.config.energy_decay_rate * dt * self.decay_modifier
         self.energy = min(self.max_energy, self.energy)
 
         if self.energy <= 0:
             self.alive = False
+            self.record_event(events.STARVATION, -1, self.x, self.y)
 
     def turn_towards(self, target, turn_speed: float = 0.1):
-        target_angle = self.angle_to(target)
+        self.turn_to_angle(self.angle_to(target), turn_speed)
+
+    def turn_to_angle(self, target_angle: float, turn_speed: float = 0.1):
         angle_diff = target_angle - self.direction
 
         while angle_diff > math.pi:
@@ -127,8 +255,9 @@ class Entity:
     def random_walk(
         self, dt: float, turn_probability: float = 0.1, max_turn: float = 1.0
     ):
-        if random.random() < turn_probability:
-            self.direction += random.uniform(-max_turn, max_turn)
+        behavior_rng = self.rng.behavior
+        if behavior_rng.random() < turn_probability:
+            self.direction += behavior_rng.uniform(-max_turn, max_turn)
 
     def find_closest_visible(
         self, entities: List, entity_type: type
@@ -149,13 +278,52 @@ class Entity:
 
         return min(visible_entities, key=self.distance_to)
 
+    def find_closest_mate(self, entities: List) -> Optional["Entity"]:
+        potential_mates = [
+            e
+            for e in entities
+            if isinstance(e, type(self)) and e.alive and e.can_reproduce and e != self
+        ]
+
+        visible_mates = [mate for mate in potential_mates if self.can_see(mate)]
+
+        if not visible_mates:
+            return None
+
+        return min(visible_mates, key=self.distance_to)
+
     def can_see(self, target) -> bool:
         distance = self.distance_to(target)
-        vision_range = self.genome.vision
+        vision_range = self.genome.vision * self.vision_modifier
         return distance <= vision_range
 
+    def mates_on_contact(self) -> bool:
+        # False when the simulation pairs mates in its own mating stage
+        return self.world is None or not self.world.mating_stage
+
+    def offspring(self, mate, child_genome) -> "Entity":
+        # Child of the same class, born where this parent stands
+        return type(self)(
+            self.x, self.y, child_genome, self.config, self.rng, self.world
+        )
+
+    def record_birth(self, child: "Entity", mate: "Entity"):
+        if self.world is not None:
+            self.world.record_birth(child, self, mate)
+
+    def record_event(self, event: int, target, x: float, y: float):
+        # Event caused by this agent, kept when the world logs events
+        if self.world is not None:
+            self.world.record_event(event, self.id, target, x, y)
+
+    def finish_mating(self, mate):
+        self.reproduction_score = 0
+        mate.reproduction_score = 0
+        self.can_reproduce = False
+        mate.can_reproduce = False
+
     def check_reproduction_status(self):
-        if self.reproduction_score >= c.REPRODUCTION_SCORE_THRESHOLD:
+        if self.reproduction_score >= self.config.reproduction_score_threshold:
             self.can_reproduce = True
         else:
             self.can_reproduce = False
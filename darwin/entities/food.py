@@ -5,18 +5,21 @@ from darwin import config as c
 
 class Food:
 
-    def __init__(self, x: float, y: float):
+    def __init__(
+        self, x: float, y: float, config: c.SimulationConfig = c.DEFAULT_CONFIG
+    ):
         self.x = x
         self.y = y
         self.available = True
-        self.energy_value = c.EATING_ENERGY_GAIN
+        self.slot = None  # Index in the FoodStore that owns it, if any
+        self.config = config
+        self.energy_value = config.eating_energy_gain
 
-    def draw(self, screen: pygame.Surface):
-        screen_x = int(self.x)
-        screen_y = int(self.y)
-
-        if 0 <= screen_x <= c.SCREEN_WIDTH and 0 <= screen_y <= c.SCREEN_HEIGHT:
-            pygame.draw.circle(screen, c.GREEN, (screen_x, screen_y), c.FOOD_RADIUS)
+    def draw(self, screen: pygame.Surface, camera):
+        screen_x, screen_y = camera.world_to_screen(self.x, self.y)
+        pygame.draw.circle(
+            screen, c.GREEN, (screen_x, screen_y), camera.scale(self.config.food_radius)
+        )
 
     def update(self, dt, entities_nearby=None):
         pass
@@ -1,25 +1,42 @@
 import math
-import random
 import pygame
 from typing import List, Optional
 
-from .base_entity import Entity
+from .base_entity import Entity, Perception
 from ..genetics.genomes import PredatorGenome
 from ..genetics.genomes import GenomeFactory
 from ..genetics.operations import GeneticOperations
+from ..simulation import events
+from ..simulation.rng import ModuleStreams
 from darwin import config as c
 
 
 class Predator(Entity):
-    def __init__(self, x: float, y: float, genome: Optional[PredatorGenome] = None):
+    species = "predators"
+
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        genome: Optional[PredatorGenome] = None,
+        config: c.SimulationConfig = c.DEFAULT_CONFIG,
+        rng=ModuleStreams,
+        world=None,
+    ):
         if genome is None:
-            genome = GenomeFactory.create_random_predator_genome()
-        super().__init__(x, y, genome)
+            genome = GenomeFactory.create_random_predator_genome(rng.spawn)
+        super().__init__(x, y, genome, config, rng, world)
         self.target_prey = None
 
     def can_see(self, target: Entity) -> bool:
+        config = self.config
         distance = self.distance_to(target)
-        vision_range = self.genome.vision * 1.5  # Enhanced vision for predators
+        # Enhanced vision for predators
+        vision_range = (
+            self.genome.vision
+            * self.vision_modifier
+            * config.predator_vision_multiplier
+        )
 
         # First check distance
         if distance > vision_range:
@@ -33,13 +50,13 @@ class Predator(Entity):
         while angle_diff > math.pi:
             angle_diff = abs(angle_diff - 2 * math.pi)
 
-        half_cone_angle = math.radians(c.PREDATOR_VISION_ANGLE / 2)
-        return angle_diff <= half_cone_angle
+        return angle_diff <= config.predator_half_cone
 
     def update(self, dt: float, entities: List[Entity]):
         if not self.alive:
             return
 
+        self.sense_terrain()
         self.update_energy(dt)
 
         if not self.alive:
@@ -48,49 +65,51 @@ class Predator(Entity):
         # Check reproduction status
         self.check_reproduction_status()
 
-        # Behavior logic
-        if self.can_reproduce:
-            self._seek_mate(entities, dt)
-        else:
-            self._hunt_behavior(entities, dt)
+        self.act(dt, entities, self.scheduled_perception(entities))
 
         self.move(dt)
 
         # Check for collisions with same species and resolve
         self.check_collision(entities)
 
-    def _hunt_behavior(self, entities: List[Entity], dt: float):
+    def perceive(self, entities: List[Entity]) -> Perception:
+        if self.can_reproduce:
+            return Perception(target=self.find_closest_mate(entities))
+
         # Find closest visible prey
         from .prey import Prey  # Import here to avoid circular import
 
-        closest_prey = self.find_closest_visible(entities, Prey)
+        return Perception(target=self.find_closest_visible(entities, Prey))
+
+    def act(self, dt: float, entities: List[Entity], perception: Perception):
+        # Behavior logic
+        if self.can_reproduce:
+            self._seek_mate(perception.target, entities, dt)
+        else:
+            self._hunt_behavior(perception.target, dt)
 
+    def _hunt_behavior(self, closest_prey: Optional[Entity], dt: float):
         if closest_prey:
             self.target_prey = closest_prey
             self.turn_towards(closest_prey, 0.2)
 
             # Check for attack
-            if self.distance_to(closest_prey) <= c.ENTITY_RADIUS + c.ENTITY_RADIUS:
+            if self.reaches(closest_prey, self.config.contact_distance, dt):
                 self._attack_prey(closest_prey)
         else:
             self.target_prey = None
             self.random_walk(dt)
 
-    def _seek_mate(self, entities: List[Entity], dt: float):
-        potential_mates = [
-            e
-            for e in entities
-            if isinstance(e, Predator) and e.alive and e.can_reproduce and e != self
-        ]
-
-        visible_mates = [mate for mate in potential_mates if self.can_see(mate)]
-
-        if visible_mates:
-            closest_mate = min(visible_mates, key=self.distance_to)
+    def _seek_mate(
+        self, closest_mate: Optional[Entity], entities: List[Entity], dt: float
+    ):
+        if closest_mate:
             self.turn_towards(closest_mate, 0.15)
 
             # Check for reproduction
-            if self.distance_to(closest_mate) <= c.ENTITY_RADIUS * 2:
+            if self.mates_on_contact() and self.reaches(
+                closest_mate, self.config.contact_distance, dt
+            ):
                 self._reproduce(closest_mate, entities)
         else:
             self.random_walk(dt)
@@ -103,46 +122,57 @@ class Predator(Entity):
             prey.take_damage(self.genome.attack_strength)
 
             if was_alive and not prey.alive:
-                self.reproduction_score += c.PREDATOR_REPRODUCTION_GAIN
-                energy_gain = c.EATING_ENERGY_GAIN
+                self.record_event(events.KILL, prey.id, prey.x, prey.y)
+                self.reproduction_score += self.config.predator_reproduction_gain
+                energy_gain = self.config.eating_energy_gain
                 self.energy = min(self.max_energy, self.energy + energy_gain)
 
     def _reproduce(self, mate, entities: List[Entity]):
         # Create offspring
-        child_genome = GeneticOperations.crossover_predator(self.genome, mate.genome)
-        child_x = (self.x + mate.x) / 2 + random.uniform(-20, 20)
-        child_y = (self.y + mate.y) / 2 + random.uniform(-20, 20)
-        child = Predator(child_x, child_y, child_genome)
+        child_genome = GeneticOperations.crossover_predator(
+            self.genome, mate.genome, self.config.mutation_rate, self.rng.genetics
+        )
+        child = self.offspring(mate, child_genome)
         entities.append(child)
+        self.record_birth(child, mate)
 
         # Reset reproduction status
-        self.reproduction_score = 0
-        mate.reproduction_score = 0
-        self.can_reproduce = False
-        mate.can_reproduce = False
+        self.finish_mating(mate)
+
+    def offspring(self, mate, child_genome: PredatorGenome) -> "Predator":
+        # Born near the midpoint between the parents
+        child_x = (self.x + mate.x) / 2 + self.rng.behavior.uniform(-20, 20)
+        child_y = (self.y + mate.y) / 2 + self.rng.behavior.uniform(-20, 20)
+        return Predator(
+            child_x, child_y, child_genome, self.config, self.rng, self.world
+        )
 
     def draw(
         self,
         screen: pygame.Surface,
+        camera,
         show_vision: bool = False,
     ):
-        screen_x, screen_y = int(self.x), int(self.y)
-
-        if (
-            -50 <= screen_x <= c.SCREEN_WIDTH + 50
-            and -50 <= screen_y <= c.SCREEN_HEIGHT + 50
-        ):
-            # Draw vision cone if enabled
-            if show_vision:
-                self._draw_vision_cone(screen, screen_x, screen_y)
-
-            # Draw predator
-            color = c.RED if not self.can_reproduce else c.YELLOW
-            pygame.draw.circle(screen, color, (screen_x, screen_y), c.ENTITY_RADIUS)
-
-    def _draw_vision_cone(self, screen: pygame.Surface, screen_x: int, screen_y: int):
-        vision_range = self.genome.vision * 1.5
-        half_cone_angle = math.radians(c.PREDATOR_VISION_ANGLE / 2)
+        screen_x, screen_y = camera.world_to_screen(self.x, self.y)
+
+        # Draw vision cone if enabled
+        if show_vision:
+            self._draw_vision_cone(screen, camera, screen_x, screen_y)
+
+        # Draw predator
+        color = c.RED if not self.can_reproduce else c.YELLOW
+        pygame.draw.circle(
+            screen, color, (screen_x, screen_y), camera.scale(self.config.entity_radius)
+        )
+
+    def _draw_vision_cone(
+        self, screen: pygame.Surface, camera, screen_x: int, screen_y: int
+    ):
+        config = self.config
+        vision_range = (
+            self.genome.vision * config.predator_vision_multiplier * camera.zoom
+        )
+        half_cone_angle = config.predator_half_cone
 
         # Calculate cone edges
         left_angle = self.direction - half_cone_angle
@@ -2,18 +2,29 @@ import math
 import pygame
 from typing import List, Optional
 
-from .base_entity import Entity
+from .base_entity import Entity, Perception
 from darwin import config as c
 from ..genetics.operations import GeneticOperations
 from ..genetics.genomes import PreyGenome, GenomeFactory
+from ..simulation import events
+from ..simulation.rng import ModuleStreams
 
 
 class Prey(Entity):
+    species = "prey"
 
-    def __init__(self, x: float, y: float, genome: Optional[PreyGenome] = None):
+    def __init__(
+        self,
+        x: float,
+        y: float,
+        genome: Optional[PreyGenome] = None,
+        config: c.SimulationConfig = c.DEFAULT_CONFIG,
+        rng=ModuleStreams,
+        world=None,
+    ):
         if genome is None:
-            genome = GenomeFactory.create_random_prey_genome()
-        super().__init__(x, y, genome)
+            genome = GenomeFactory.create_random_prey_genome(rng.spawn)
+        super().__init__(x, y, genome, config, rng, world)
 
     def can_see(self, target: Entity) -> bool:
         return super().can_see(target)  # Use base distance check only
@@ -22,6 +33,7 @@ class Prey(Entity):
         if not self.alive:
             return
 
+        self.sense_terrain()
         self.update_energy(dt)
 
         if not self.alive:
@@ -30,79 +42,117 @@ class Prey(Entity):
         # Check reproduction status
         self.check_reproduction_status()
 
-        # Behavior logic
-        if self.can_reproduce:
-            self._seek_mate(entities, dt)
-        else:
-            self._survival_behavior(entities, dt)
+        self.act(dt, entities, self.scheduled_perception(entities))
 
         self.move(dt)
 
         # Check for collisions with same species and resolve
         self.check_collision(entities)
 
-    def _survival_behavior(self, entities: List[Entity], dt: float):
+    def perceive(self, entities: List[Entity]) -> Perception:
+        if self.can_reproduce:
+            return Perception(target=self.find_closest_mate(entities))
+
         # Find closest visible predator
         from .predator import Predator  # Import here to avoid circular import
 
         closest_predator = self.find_closest_visible(entities, Predator)
+        if closest_predator:
+            return Perception(threat=closest_predator)
+
+        # Seek food, from the simulation's food store when there is one
+        if self.world is not None:
+            food = self.world.food.nearest(
+                self.x, self.y, self.genome.vision * self.vision_modifier
+            )
+            return Perception(target=food)
+
+        from .food import Food  # Import here to avoid circular import
+
+        return Perception(target=self.find_closest_visible(entities, Food))
+
+    def act(self, dt: float, entities: List[Entity], perception: Perception):
+        # Behavior logic
+        if self.can_reproduce:
+            self._seek_mate(perception.target, entities, dt)
+        else:
+            self._survival_behavior(perception, entities, dt)
+
+    def _survival_behavior(
+        self, perception: Perception, entities: List[Entity], dt: float
+    ):
+        closest_predator = perception.threat
 
         if closest_predator:
             # Flee from predator
             flee_angle = self.angle_to(closest_predator) + math.pi  # Opposite direction
             self.direction = flee_angle
         else:
-            # Seek food
-            from .food import Food  # Import here to avoid circular import
-
-            closest_food = self.find_closest_visible(entities, Food)
+            closest_food = perception.target
             if closest_food:
                 self.turn_towards(closest_food, 0.15)
 
                 # Check for eating
-                if self.distance_to(closest_food) <= c.ENTITY_RADIUS + c.FOOD_RADIUS:
+                if self.reaches(closest_food, self.config.eating_distance, dt):
                     self._eat_food(closest_food, entities)
+            elif self.world is not None and self.world.resources is not None:
+                self._graze(dt)
             else:
                 self.random_walk(dt)
 
-    def _seek_mate(self, entities: List[Entity], dt: float):
-        # Find closest visible mate using vision system
-        potential_mates = [
-            e
-            for e in entities
-            if isinstance(e, Prey) and e.alive and e.can_reproduce and e != self
-        ]
-
-        # Filter by vision range and check if can see them
-        visible_mates = [mate for mate in potential_mates if self.can_see(mate)]
-
-        if visible_mates:
-            closest_mate = min(visible_mates, key=self.distance_to)
+    def _seek_mate(
+        self, closest_mate: Optional[Entity], entities: List[Entity], dt: float
+    ):
+        if closest_mate:
             self.turn_towards(closest_mate, 0.15)
 
             # Check for reproduction
-            if self.distance_to(closest_mate) <= c.ENTITY_RADIUS * 2:
+            if self.mates_on_contact() and self.reaches(
+                closest_mate, self.config.contact_distance, dt
+            ):
                 self._reproduce(closest_mate, entities)
         else:
             self.random_walk(dt)
 
     def _eat_food(self, food, entities: List[Entity]):
         self.energy = min(self.max_energy, self.energy + food.energy_value)
-        self.reproduction_score += c.PREY_REPRODUCTION_GAIN
-        food.available = False
-        entities.remove(food)
+        self.reproduction_score += self.config.prey_reproduction_gain
+        self.record_event(events.MEAL, getattr(food, "slot", -1), food.x, food.y)
+        if self.world is not None:
+            self.world.food.consume(food)
+        else:
+            food.available = False
+            entities.remove(food)
+
+    def _graze(self, dt: float):
+        # Follow the resource gradient within vision and eat from the cell below
+        field = self.world.resources
+        gradient_x, gradient_y = field.gradient(
+            self.x, self.y, self.genome.vision * self.vision_modifier
+        )
+        if gradient_x or gradient_y:
+            self.turn_to_angle(math.atan2(gradient_y, gradient_x), 0.15)
+        else:
+            self.random_walk(dt)
+
+        eaten = field.graze(self.x, self.y, self.config.grazing_rate * dt)
+        self.energy = min(self.max_energy, self.energy + eaten)
+        # Reproduction progress in proportion to a food item's worth of energy
+        self.reproduction_score += (
+            self.config.prey_reproduction_gain * eaten / self.config.eating_energy_gain
+        )
 
     def _reproduce(self, mate, entities: List[Entity]):
         # Create offspring
-        child_genome = GeneticOperations.crossover_prey(self.genome, mate.genome)
-        child = Prey(self.x, self.y, child_genome)
+        child_genome = GeneticOperations.crossover_prey(
+            self.genome, mate.genome, self.config.mutation_rate, self.rng.genetics
+        )
+        child = self.offspring(mate, child_genome)
         entities.append(child)
+        self.record_birth(child, mate)
 
         # Reset reproduction status
-        self.reproduction_score = 0
-        mate.reproduction_score = 0
-        self.can_reproduce = False
-        mate.can_reproduce = False
+        self.finish_mating(mate)
 
     def take_damage(self, damage: float):
         self.damage_taken += damage
@@ -112,21 +162,20 @@ class Prey(Entity):
     def draw(
         self,
         screen: pygame.Surface,
+        camera,
         show_vision: bool = False,
     ):
-        screen_x, screen_y = int(self.x), int(self.y)
-
-        if (
-            -50 <= screen_x <= c.SCREEN_WIDTH + 50
-            and -50 <= screen_y <= c.SCREEN_HEIGHT + 50
-        ):
-            # Draw vision range if enabled (simple circle outline)
-            if show_vision:
-                vision_range = self.genome.vision
-                pygame.draw.circle(
-                    screen, c.BLUE, (screen_x, screen_y), int(vision_range), 2
-                )
-
-            # Draw prey
-            color = c.BLUE if not self.can_reproduce else c.PURPLE
-            pygame.draw.circle(screen, color, (screen_x, screen_y), c.ENTITY_RADIUS)
+        screen_x, screen_y = camera.world_to_screen(self.x, self.y)
+
+        # Draw vision range if enabled (simple circle outline)
+        if show_vision:
+            vision_range = self.genome.vision
+            pygame.draw.circle(
+                screen, c.BLUE, (screen_x, screen_y), camera.scale(vision_range), 2
+            )
+
+        # Draw prey
+        color = c.BLUE if not self.can_reproduce else c.PURPLE
+        pygame.draw.circle(
+            screen, color, (screen_x, screen_y), camera.scale(self.config.entity_radius)
+        )
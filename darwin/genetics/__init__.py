@@ -5,7 +5,14 @@ from .genomes import Genome, PredatorGenome, PreyGenome, GenomeFactory
 # Genetic operations
 from .operations import GeneticOperations
 
+# Declarative species and the shared gene array
+from .species import SpeciesRegistry
+
+# Evolvable neural controllers
+from .brains import BrainLayout
+
 __all__ = [
     'Genome', 'PredatorGenome', 'PreyGenome',
-    'GenomeFactory', 'GeneticOperations'
+    'GenomeFactory', 'GeneticOperations', 'SpeciesRegistry',
+    'BrainLayout'
 ]
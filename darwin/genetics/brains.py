@@ -0,0 +1,61 @@
+import numpy as np
+from typing import Tuple
+
+from darwin import config as c
+
+
+class BrainLayout:
+    # Shape of the small feed-forward network every agent carries in neural
+    # behavior mode: inputs -> tanh hidden layer -> tanh outputs. One agent's
+    # weights are a flat row; the rows of all agents stack into one
+    # (agents, size) array, so a whole population is evaluated with two
+    # batched matrix products and bred with array operations.
+
+    def __init__(self, inputs: int, hidden: int, outputs: int):
+        self.inputs = inputs
+        self.hidden = hidden
+        self.outputs = outputs
+        self.shapes = ((inputs, hidden), (hidden,), (hidden, outputs), (outputs,))
+        self.sizes = [int(np.prod(shape)) for shape in self.shapes]
+        self.size = sum(self.sizes)
+
+    def random(
+        self,
+        count: int,
+        generator: np.random.Generator,
+        scale: float = c.NEURAL_WEIGHT_SCALE,
+    ) -> np.ndarray:
+        return generator.normal(0, scale, (count, self.size))
+
+    def unpack(self, weights: np.ndarray) -> Tuple[np.ndarray, ...]:
+        # Views of the stacked rows as (agents, *shape) tensors per layer
+        count = len(weights)
+        bounds = np.cumsum([0] + self.sizes)
+        return tuple(
+            weights[:, start:end].reshape((count,) + shape)
+            for start, end, shape in zip(bounds[:-1], bounds[1:], self.shapes)
+        )
+
+    def evaluate(self, weights: np.ndarray, inputs: np.ndarray) -> np.ndarray:
+        # Outputs in [-1, 1] for every agent, shape (agents, outputs)
+        input_weights, hidden_bias, output_weights, output_bias = self.unpack(weights)
+        hidden = np.tanh(
+            np.matmul(inputs[:, None, :], input_weights)[:, 0] + hidden_bias
+        )
+        return np.tanh(
+            np.matmul(hidden[:, None, :], output_weights)[:, 0] + output_bias
+        )
+
+    def crossover(
+        self,
+        first: np.ndarray,
+        second: np.ndarray,
+        mutation_rate: float,
+        mutation_scale: float,
+        generator: np.random.Generator,
+    ) -> np.ndarray:
+        # Each weight from either parent, then Gaussian mutation of a
+        # mutation_rate fraction of the weights
+        weights = np.where(generator.random(first.shape) < 0.5, first, second)
+        mutated = generator.random(weights.shape) < mutation_rate
+        return weights + mutated * generator.normal(0, mutation_scale, weights.shape)
@@ -39,19 +39,19 @@ class PreyGenome(Genome):
 class GenomeFactory:
 
     @staticmethod
-    def create_random_predator_genome() -> PredatorGenome:
+    def create_random_predator_genome(rng=random) -> PredatorGenome:
         return PredatorGenome(
-            speed=random.uniform(c.MIN_GENE, c.MAX_GENE),
-            vision=random.uniform(c.MIN_GENE, c.MAX_GENE),
-            stamina=random.uniform(c.MIN_GENE, c.MAX_GENE),
-            attack_strength=random.uniform(c.MIN_GENE, c.MAX_GENE),
+            speed=rng.uniform(c.MIN_GENE, c.MAX_GENE),
+            vision=rng.uniform(c.MIN_GENE, c.MAX_GENE),
+            stamina=rng.uniform(c.MIN_GENE, c.MAX_GENE),
+            attack_strength=rng.uniform(c.MIN_GENE, c.MAX_GENE),
         )
 
     @staticmethod
-    def create_random_prey_genome() -> PreyGenome:
+    def create_random_prey_genome(rng=random) -> PreyGenome:
         return PreyGenome(
-            speed=random.uniform(c.MIN_GENE, c.MAX_GENE),
-            vision=random.uniform(c.MIN_GENE, c.MAX_GENE),
-            stamina=random.uniform(c.MIN_GENE, c.MAX_GENE),
-            attack_resistance=random.uniform(c.MIN_GENE, c.MAX_GENE),
+            speed=rng.uniform(c.MIN_GENE, c.MAX_GENE),
+            vision=rng.uniform(c.MIN_GENE, c.MAX_GENE),
+            stamina=rng.uniform(c.MIN_GENE, c.MAX_GENE),
+            attack_resistance=rng.uniform(c.MIN_GENE, c.MAX_GENE),
         )
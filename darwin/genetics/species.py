@@ -0,0 +1,121 @@
+import math
+import numpy as np
+from typing import Dict, Sequence, Tuple
+
+from darwin import config as c
+
+
+class SpeciesRegistry:
+    # Lookup tables derived from the declarative species and gene lists, so
+    # per-species rules become array indexing by species index. Also holds the
+    # vectorized genetics shared by every species.
+
+    def __init__(
+        self,
+        species: Sequence[c.Species] = c.DEFAULT_SPECIES,
+        genes: Sequence[c.Gene] = c.GENES,
+    ):
+        self.species = tuple(species)
+        self.genes = tuple(genes)
+        self.names = [s.name for s in self.species]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.gene_index = {gene.name: i for i, gene in enumerate(self.genes)}
+
+        for spec in self.species:
+            for gene in spec.genes:
+                if gene not in self.gene_index:
+                    raise ValueError(f"Unknown gene {gene} in species {spec.name}")
+            for item in spec.diet:
+                if item != "food" and item not in self.index:
+                    raise ValueError(f"Unknown prey {item} in species {spec.name}")
+
+        count = len(self.species)
+        self.low = np.array([gene.low for gene in self.genes])
+        self.high = np.array([gene.high for gene in self.genes])
+
+        # active[s, g]: gene g evolves in species s
+        self.active = np.zeros((count, len(self.genes)), dtype=bool)
+        for s, spec in enumerate(self.species):
+            self.active[s, [self.gene_index[g] for g in spec.genes]] = True
+
+        # hunts[a, b]: species a eats species b
+        self.hunts = np.zeros((count, count), dtype=bool)
+        for a, spec in enumerate(self.species):
+            for item in spec.diet:
+                if item != "food":
+                    self.hunts[a, self.index[item]] = True
+
+        self.eats_food = np.array(["food" in spec.diet for spec in self.species])
+        self.vision_multiplier = np.array(
+            [spec.vision_multiplier for spec in self.species]
+        )
+        self.cos_half_cone = np.array(
+            [math.cos(math.radians(spec.vision_angle / 2)) for spec in self.species]
+        )
+        self.reproduction_gain = np.array(
+            [spec.reproduction_gain for spec in self.species], dtype=float
+        )
+        self.birth_spread = np.array([spec.birth_spread for spec in self.species])
+
+    def __len__(self) -> int:
+        return len(self.species)
+
+    def column(self, gene: str) -> int:
+        return self.gene_index[gene]
+
+    def random_genes(
+        self, kinds: np.ndarray, generator: np.random.Generator
+    ) -> np.ndarray:
+        # Uniform genes within range for the active columns, lower bound elsewhere
+        genes = generator.uniform(self.low, self.high, (len(kinds), len(self.genes)))
+        return np.where(self.active[kinds], genes, self.low)
+
+    def crossover(
+        self,
+        kinds: np.ndarray,
+        first: np.ndarray,
+        second: np.ndarray,
+        mutation_rate: float,
+        generator: np.random.Generator,
+    ) -> np.ndarray:
+        # Per-gene crossover (each gene from either parent with equal chance)
+        # and Gaussian mutation, for any number of pairs of any species
+        genes = np.where(generator.random(first.shape) < 0.5, first, second)
+        mutated = generator.random(genes.shape) < mutation_rate
+        genes = genes + mutated * generator.normal(0, 5, genes.shape)
+        genes = np.clip(genes, self.low, self.high)
+        return np.where(self.active[kinds], genes, self.low)
+
+    def gene_statistics(
+        self, kinds: np.ndarray, genes: np.ndarray
+    ) -> Dict[str, Dict[str, float]]:
+        # Mean of each active gene per species, zero for an extinct species
+        statistics = {}
+        for s, spec in enumerate(self.species):
+            members = genes[kinds == s]
+            statistics[spec.name] = {
+                gene: (
+                    float(members[:, self.gene_index[gene]].mean())
+                    if len(members)
+                    else 0
+                )
+                for gene in spec.genes
+            }
+        return statistics
+
+    def gene_moments(
+        self, kinds: np.ndarray, genes: np.ndarray
+    ) -> Dict[str, Dict[str, Tuple[float, float]]]:
+        # Mean and standard deviation of each active gene per species, zeros
+        # for an extinct species
+        moments = {}
+        for s, spec in enumerate(self.species):
+            members = genes[kinds == s]
+            columns = [self.gene_index[gene] for gene in spec.genes]
+            if len(members):
+                means = members[:, columns].mean(axis=0).tolist()
+                stds = members[:, columns].std(axis=0).tolist()
+            else:
+                means = stds = [0.0] * len(columns)
+            moments[spec.name] = dict(zip(spec.genes, zip(means, stds)))
+        return moments
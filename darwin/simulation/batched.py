@@ -0,0 +1,307 @@
+import numpy as np
+from typing import List, Optional
+
+from ..entities import Entity, Perception, Predator, is_present
+from .collision import resolve_collisions
+from .mating import match_mates
+from .perception import nearest_among, perceive
+from .simulation import Simulation
+
+
+class BatchedSimulation(Simulation):
+    # Same entities and rules as Simulation, but each tick runs in stages:
+    # energy for every agent, one mating stage, one batched perception pass,
+    # actions and movement, then one symmetric collision pass. Perception
+    # sees the world as it was at the start of the tick. With a perception
+    # interval only the agents due this tick (or whose cached targets became
+    # invalid) are included in the perception pass.
+
+    mating_stage = True
+
+    def _update_entities(self, dt: float):
+        agents = [e for e in self.entities if e.alive]
+
+        # Stage 0: terrain modifiers for every agent in one lookup
+        self._sense_terrain(agents)
+
+        # Stage 1: energy and reproduction status
+        for agent in agents:
+            agent.update_energy(dt)
+            if agent.alive:
+                agent.check_reproduction_status()
+        agents = [agent for agent in agents if agent.alive]
+
+        # Stage 2: pair up reproductive agents in contact and breed them
+        self._mate(agents)
+
+        # Stage 3: perception for the agents that need it, all at once
+        due = np.fromiter(
+            (self._needs_perception(agent) for agent in agents),
+            dtype=bool,
+            count=len(agents),
+        )
+        for agent, perception in zip(agents, self._perceive(agents, due)):
+            if perception is not None:
+                agent.remember(perception)
+
+        # Stage 4: act and move in list order
+        for agent in agents:
+            if not agent.alive:
+                continue
+            agent.act(dt, self.entities, self._validated(agent, agent.perception))
+            agent.move(dt)
+
+        # Stage 5: separate overlapping agents of the same species
+        self._resolve_collisions()
+
+    def _mate(self, agents: List[Entity]):
+        # Mutually visible same-species pairs within contact distance, matched
+        # greedily from the closest pair so nobody mates twice in a tick, then
+        # bred with one batched crossover
+        config = self.config
+        reproductive = [a for a in agents if a.can_reproduce]
+        count = len(reproductive)
+        if count < 2:
+            return
+
+        xs = np.fromiter((a.x for a in reproductive), dtype=float, count=count)
+        ys = np.fromiter((a.y for a in reproductive), dtype=float, count=count)
+        directions = np.fromiter(
+            (a.direction for a in reproductive), dtype=float, count=count
+        )
+        vision = np.fromiter(
+            (a.genome.vision * a.vision_modifier for a in reproductive),
+            dtype=float,
+            count=count,
+        )
+        is_predator = np.fromiter(
+            (isinstance(a, Predator) for a in reproductive), dtype=bool, count=count
+        )
+        ranges = np.where(
+            is_predator, vision * config.predator_vision_multiplier, vision
+        )
+        cones = np.where(
+            is_predator, config.predator_cos_half_cone, config.prey_cos_half_cone
+        )
+
+        first, second = match_mates(
+            xs,
+            ys,
+            directions,
+            ranges,
+            cones,
+            is_predator,
+            config.contact_distance,
+            config.world_width,
+            config.world_height,
+        )
+        if len(first) == 0:
+            return
+        # Predators' pairs first, all bred by the registry's crossover
+        pairs = sorted(
+            zip(first.tolist(), second.tolist()), key=lambda p: not is_predator[p[0]]
+        )
+        parents = [reproductive[i] for i, _ in pairs]
+        mates = [reproductive[j] for _, j in pairs]
+        registry = self.species_registry
+        kinds = np.array([registry.index[a.species] for a in parents], dtype=np.intp)
+        genes = registry.crossover(
+            kinds,
+            self._gene_rows(parents),
+            self._gene_rows(mates),
+            config.mutation_rate,
+            self.rng.genetics.generator,
+        )
+        for parent, mate, kind, row in zip(parents, mates, kinds.tolist(), genes):
+            genome = type(parent.genome)(
+                **{
+                    gene: float(row[registry.column(gene)])
+                    for gene in registry.species[kind].genes
+                }
+            )
+            child = parent.offspring(mate, genome)
+            self.entities.append(child)
+            parent.record_birth(child, mate)
+            parent.finish_mating(mate)
+
+    def _needs_perception(self, agent: Entity) -> bool:
+        return self.perception_due(agent) or agent.revalidate() is None
+
+    def _sense_terrain(self, agents: List[Entity]):
+        if self.terrain is None or not agents:
+            return
+
+        count = len(agents)
+        xs = np.fromiter((a.x for a in agents), dtype=float, count=count)
+        ys = np.fromiter((a.y for a in agents), dtype=float, count=count)
+        speed, decay, vision = self.terrain.modifiers(xs, ys)
+
+        for agent, s, d, v in zip(
+            agents, speed.tolist(), decay.tolist(), vision.tolist()
+        ):
+            agent.speed_modifier = s
+            agent.decay_modifier = d
+            agent.vision_modifier = v
+
+    def _resolve_collisions(self):
+        agents = [e for e in self.entities if e.alive]
+        count = len(agents)
+
+        xs = np.fromiter((a.x for a in agents), dtype=float, count=count)
+        ys = np.fromiter((a.y for a in agents), dtype=float, count=count)
+        species = np.fromiter(
+            (isinstance(a, Predator) for a in agents), dtype=bool, count=count
+        )
+
+        xs, ys, contacts = resolve_collisions(
+            xs,
+            ys,
+            species,
+            self.config.contact_distance,
+            self.config.world_width,
+            self.config.world_height,
+            self.rng.collision.generator,
+        )
+        if contacts == 0:
+            return
+
+        for agent, x, y in zip(agents, xs.tolist(), ys.tolist()):
+            agent.x = x
+            agent.y = y
+
+    def _validated(self, agent: Entity, perception: Perception) -> Perception:
+        # Drop targets consumed earlier in this tick, or perceived for a
+        # behavior the agent no longer follows (it was just used as a mate)
+        target = perception.target
+        if target is not None:
+            mating = type(target) is type(agent)
+            if (
+                not is_present(target)
+                or mating != agent.can_reproduce
+                or (mating and not target.can_reproduce)
+            ):
+                target = None
+
+        threat = perception.threat if is_present(perception.threat) else None
+        return Perception(target=target, threat=threat)
+
+    def _perceive(
+        self, agents: List[Entity], due: np.ndarray
+    ) -> List[Optional[Perception]]:
+        # Perceptions for the agents flagged in `due` (None for the others);
+        # every agent can still be seen as a target
+        config = self.config
+        count = len(agents)
+
+        xs = np.fromiter((a.x for a in agents), dtype=float, count=count)
+        ys = np.fromiter((a.y for a in agents), dtype=float, count=count)
+        directions = np.fromiter(
+            (a.direction for a in agents), dtype=float, count=count
+        )
+        vision = np.fromiter(
+            (a.genome.vision * a.vision_modifier for a in agents),
+            dtype=float,
+            count=count,
+        )
+        reproducing = np.fromiter(
+            (a.can_reproduce for a in agents), dtype=bool, count=count
+        )
+        is_predator = np.fromiter(
+            (isinstance(a, Predator) for a in agents), dtype=bool, count=count
+        )
+
+        # Vision range and cone per agent, by species
+        ranges = np.where(
+            is_predator, vision * config.predator_vision_multiplier, vision
+        )
+        cones = {True: config.predator_cos_half_cone, False: config.prey_cos_half_cone}
+
+        targets = np.full(count, -1, dtype=np.intp)
+        threats = np.full(count, -1, dtype=np.intp)
+
+        # Predators hunt the closest visible prey
+        hunters = np.flatnonzero(is_predator & ~reproducing & due)
+        prey = np.flatnonzero(~is_predator)
+        targets[hunters] = self._nearest(
+            hunters, prey, xs, ys, directions, ranges, cones[True]
+        )
+
+        # Reproductive agents look for the closest visible reproductive mate
+        for predator_species in (True, False):
+            mates = np.flatnonzero((is_predator == predator_species) & reproducing)
+            seekers = mates[due[mates]]
+            targets[seekers] = self._nearest(
+                seekers,
+                mates,
+                xs,
+                ys,
+                directions,
+                ranges,
+                cones[predator_species],
+                True,
+            )
+
+        # Prey watch for predators and look for food
+        foragers = np.flatnonzero(~is_predator & ~reproducing & due)
+        predators = np.flatnonzero(is_predator)
+        threats[foragers] = self._nearest(
+            foragers, predators, xs, ys, directions, ranges, cones[False]
+        )
+
+        # Food is answered from the store's own index, skipping eaten slots
+        store = self.food
+        slot_count = len(store.slots)
+        food_targets, _ = perceive(
+            xs[foragers],
+            ys[foragers],
+            None,
+            ranges[foragers],
+            cones[False],
+            store.xs[:slot_count],
+            store.ys[:slot_count],
+            config.world_width,
+            config.world_height,
+            grid=store.index(),
+            target_mask=store.available[:slot_count],
+        )
+
+        perceptions = []
+        for i in range(count):
+            if not due[i]:
+                perceptions.append(None)
+                continue
+            target = agents[targets[i]] if targets[i] >= 0 else None
+            threat = agents[threats[i]] if threats[i] >= 0 else None
+            perceptions.append(Perception(target=target, threat=threat))
+
+        for forager, slot in zip(foragers, food_targets):
+            if slot >= 0:
+                perceptions[forager] = perceptions[forager]._replace(
+                    target=store.slots[slot]
+                )
+
+        return perceptions
+
+    def _nearest(
+        self,
+        observers: np.ndarray,
+        candidates: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+        directions: np.ndarray,
+        ranges: np.ndarray,
+        cos_half_cone: float,
+        exclude_self: bool = False,
+    ) -> np.ndarray:
+        return nearest_among(
+            observers,
+            candidates,
+            xs,
+            ys,
+            directions,
+            ranges,
+            cos_half_cone,
+            self.config.world_width,
+            self.config.world_height,
+            exclude_self,
+        )
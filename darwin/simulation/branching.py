@@ -0,0 +1,113 @@
+import os
+import pickle
+import traceback
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .environment import DEFAULT_DT
+from .simulation import Simulation
+
+# What a branch sends back when no collect function is given
+Collector = Callable[[Simulation], Any]
+
+
+@dataclass
+class Branch:
+    # One "what if" variant of a running simulation: config and params
+    # overrides (e.g. mutation_rate, food_count), extra founders per species
+    # and the seed of its own random streams (fresh entropy when None)
+    seed: Optional[int] = None
+    config: Dict[str, Any] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+    introduce: Dict[str, int] = field(default_factory=dict)
+
+    def apply(self, simulation: Simulation):
+        if self.config:
+            simulation.reconfigure(**self.config)
+        if self.params:
+            if "duration" in self.params:
+                simulation.time_remaining += (
+                    self.params["duration"] - simulation.params["duration"]
+                )
+            simulation.params = dict(simulation.params, **self.params)
+            simulation.speed = simulation.params["speed"]
+        simulation.reseed(self.seed)
+        for species, count in self.introduce.items():
+            simulation.introduce(species, count)
+
+
+def _statistics(simulation: Simulation) -> Dict[str, Any]:
+    return simulation.get_statistics()
+
+
+def run_ticks(simulation: Simulation, ticks: int, dt: float = DEFAULT_DT):
+    for _ in range(ticks):
+        if simulation.is_finished():
+            break
+        simulation.update(dt)
+
+
+def branch(
+    simulation: Simulation,
+    branches: Sequence[Branch],
+    ticks: int,
+    dt: float = DEFAULT_DT,
+    collect: Optional[Collector] = None,
+) -> List[Any]:
+    # Forks one worker per branch from the simulation as it stands. Workers
+    # share the parent's memory copy-on-write, so branching copies nothing
+    # up front; each applies its branch, runs `ticks` more ticks and sends
+    # back collect(simulation) (get_statistics() by default), pickled over a
+    # pipe. The parent's simulation is left untouched. POSIX only.
+    if not hasattr(os, "fork"):
+        raise RuntimeError("Branching needs os.fork, which this platform lacks")
+    if collect is None:
+        collect = _statistics
+
+    # Buffered events would otherwise be written once per worker
+    if simulation.events is not None:
+        simulation.events.flush()
+
+    workers = []
+    for spec in branches:
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Earlier siblings' read ends would otherwise stay open here
+            os.close(read_end)
+            for _, sibling in workers:
+                os.close(sibling)
+            status = 0
+            try:
+                simulation.events = None
+                spec.apply(simulation)
+                run_ticks(simulation, ticks, dt)
+                payload = pickle.dumps((True, collect(simulation)))
+            except BaseException:
+                payload = pickle.dumps((False, traceback.format_exc()))
+                status = 1
+            with os.fdopen(write_end, "wb") as stream:
+                stream.write(payload)
+            os._exit(status)
+        os.close(write_end)
+        workers.append((pid, read_end))
+
+    results = []
+    failures = []
+    for number, (pid, read_end) in enumerate(workers):
+        with os.fdopen(read_end, "rb") as stream:
+            payload = stream.read()
+        os.waitpid(pid, 0)
+        if not payload:
+            failures.append(f"branch {number} exited without a result")
+            results.append(None)
+            continue
+        ok, value = pickle.loads(payload)
+        if not ok:
+            failures.append(f"branch {number} failed:\n{value}")
+            value = None
+        results.append(value)
+
+    if failures:
+        raise RuntimeError("\n".join(failures))
+    return results
@@ -0,0 +1,124 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from .perception import wrapped_delta
+from .spatial import SpatialGrid
+
+
+def contact_pairs(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    groups: np.ndarray,
+    contact_distance: float,
+    world_width: float,
+    world_height: float,
+    layers: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Overlapping pairs (i < j) within the same group (and layer, for
+    # stacked worlds), each reported once. The grid broad phase keeps the
+    # cost proportional to nearby pairs.
+    if len(xs) < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+
+    layer_count = 1 if layers is None else int(layers.max()) + 1
+    grid = SpatialGrid(world_width, world_height, contact_distance, layer_count)
+    grid.build(xs, ys, layers)
+    first, second = grid.query_pairs(xs, ys, contact_distance, layers)
+
+    candidates = (first < second) & (groups[first] == groups[second])
+    first = first[candidates]
+    second = second[candidates]
+
+    dx = wrapped_delta(xs[first] - xs[second], world_width)
+    dy = wrapped_delta(ys[first] - ys[second], world_height)
+    overlapping = dx * dx + dy * dy < contact_distance * contact_distance
+    return first[overlapping], second[overlapping]
+
+
+def resolve_collisions(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    groups: np.ndarray,
+    contact_distance: float,
+    world_width: float,
+    world_height: float,
+    generator,
+    layers: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    # One symmetric separation pass: every overlapping pair is pushed apart
+    # along the line joining it, each side by half the overlap, and all
+    # pushes are applied at once so the result does not depend on order.
+    # Returns the new positions and the number of contacts. With layers,
+    # `generator` is indexed by layer so each world draws its own jitter.
+    first, second = contact_pairs(
+        xs, ys, groups, contact_distance, world_width, world_height, layers
+    )
+    if len(first) == 0:
+        return xs, ys, 0
+
+    dx = wrapped_delta(xs[first] - xs[second], world_width)
+    dy = wrapped_delta(ys[first] - ys[second], world_height)
+
+    distance = np.sqrt(dx * dx + dy * dy)
+
+    # Coincident pairs get a random separation direction
+    coincident = distance == 0
+    if coincident.any():
+        if layers is None:
+            jitter = generator.uniform(-1, 1, size=(2, int(coincident.sum())))
+        else:
+            owners = layers[first[coincident]]
+            jitter = np.empty((2, len(owners)))
+            for layer in np.unique(owners).tolist():
+                mine = owners == layer
+                jitter[:, mine] = generator[layer].uniform(
+                    -1, 1, size=(2, int(mine.sum()))
+                )
+        dx[coincident] = jitter[0]
+        dy[coincident] = jitter[1]
+
+    # Each side moves half the overlap along the unit separation vector
+    norm = np.maximum(np.sqrt(dx * dx + dy * dy), 1e-12)
+    push = (contact_distance - distance) / 2 / norm
+    push_x = dx * push
+    push_y = dy * push
+
+    count = len(xs)
+    offset_x = np.bincount(first, push_x, count) - np.bincount(second, push_x, count)
+    offset_y = np.bincount(first, push_y, count) - np.bincount(second, push_y, count)
+
+    new_xs = (xs + offset_x) % world_width
+    new_ys = (ys + offset_y) % world_height
+    return new_xs, new_ys, len(first)
+
+
+def swept_contact(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    directions: np.ndarray,
+    steps: np.ndarray,
+    target_xs: np.ndarray,
+    target_ys: np.ndarray,
+    radius: float,
+    sweep_fraction: float,
+    world_width: float,
+    world_height: float,
+) -> np.ndarray:
+    # Vectorized Entity.reaches: whether each target is within radius now or
+    # anywhere along its mover's straight step this tick. The swept test only
+    # applies to movers whose step exceeds radius * sweep_fraction.
+    dx = wrapped_delta(target_xs - xs, world_width)
+    dy = wrapped_delta(target_ys - ys, world_height)
+    distance_sq = dx * dx + dy * dy
+
+    heading_x = np.cos(directions)
+    heading_y = np.sin(directions)
+    along = np.clip(dx * heading_x + dy * heading_y, 0.0, steps)
+    offset_x = dx - along * heading_x
+    offset_y = dy - along * heading_y
+    swept = offset_x * offset_x + offset_y * offset_y <= radius * radius
+
+    return (distance_sq <= radius * radius) | (
+        (steps > radius * sweep_fraction) & swept
+    )
@@ -0,0 +1,458 @@
+import argparse
+import collections
+import dataclasses
+import json
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import traceback
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from darwin import config as c
+from .engines import ENGINES, create_simulation
+from .environment import DEFAULT_DT, default_params
+from .run_cache import RunCache, run_key, writes_outputs
+from .sweep import expand, grid_entry
+
+# Frames are a 4-byte big-endian length and a zlib-compressed JSON message
+HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+
+def _encode(value: Any) -> Any:
+    # numpy values left in statistics
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot send {type(value).__name__} values")
+
+
+def send_message(connection: socket.socket, message: Dict[str, Any]):
+    payload = zlib.compress(json.dumps(message, default=_encode).encode())
+    connection.sendall(HEADER.pack(len(payload)) + payload)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = connection.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def receive_message(connection: socket.socket) -> Optional[Dict[str, Any]]:
+    # Next message, or None once the peer has closed the connection
+    header = _receive_exactly(connection, HEADER.size)
+    if header is None:
+        return None
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame of {size} bytes exceeds the limit")
+    payload = _receive_exactly(connection, size)
+    if payload is None:
+        return None
+    return json.loads(zlib.decompress(payload))
+
+
+def config_fields(config: c.SimulationConfig) -> Dict[str, Any]:
+    # The config's overrides as JSON values, species as dicts of their fields
+    overrides = config.overrides()
+    if "species" in overrides:
+        overrides["species"] = [
+            dataclasses.asdict(spec) for spec in overrides["species"]
+        ]
+    return overrides
+
+
+def config_from_fields(values: Optional[Dict[str, Any]]) -> c.SimulationConfig:
+    # Inverse of config_fields; JSON turned the species' tuples into lists
+    overrides = dict(values or {})
+    if "species" in overrides:
+        overrides["species"] = tuple(
+            c.Species(
+                **{
+                    name: tuple(value) if isinstance(value, list) else value
+                    for name, value in spec.items()
+                }
+            )
+            for spec in overrides["species"]
+        )
+    return c.SimulationConfig.from_overrides(overrides)
+
+
+def _sent_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    config = c.SimulationConfig.from_overrides(params.get("config"))
+    return dict(params, config=config_fields(config))
+
+
+def _portable(statistics: Dict[str, Any]) -> Dict[str, Any]:
+    # The species and params hold config objects; the coordinator restores
+    # both from the job's spec
+    return {
+        key: value
+        for key, value in statistics.items()
+        if key not in ("species", "simulation_params")
+    }
+
+
+def _restored(statistics: Dict[str, Any], params: Dict[str, Any]) -> Dict[str, Any]:
+    config = c.SimulationConfig.from_overrides(params.get("config"))
+    return dict(statistics, species=config.defined_species, simulation_params=params)
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    # One worker connection; the coordinator holds all job state
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        coordinator._connected(self, 1)
+        try:
+            while True:
+                message = receive_message(self.request)
+                if message is None:
+                    break
+                send_message(self.request, coordinator._reply(self, message))
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            coordinator._release(self)
+            coordinator._connected(self, -1)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class Coordinator:
+    # Serves a queue of headless run specs to workers over TCP. Jobs are
+    # leased to one worker at a time; a lease lapses without heartbeats or
+    # when the worker disconnects, and the job goes back in the queue until
+    # MAX_JOB_ATTEMPTS leases were used. The first result of a job wins and
+    # later copies are dropped. Specs with the same run key run once, and
+    # with a cache, previously computed runs are not handed out at all.
+
+    def __init__(
+        self,
+        specs: Sequence[Dict[str, Any]],
+        host: str = c.COORDINATOR_HOST,
+        port: int = c.COORDINATOR_PORT,
+        cache: Optional[RunCache] = None,
+        timeout: float = c.HEARTBEAT_TIMEOUT,
+    ):
+        self.specs = list(specs)
+        self.cache = cache
+        self.timeout = timeout
+
+        # Job per distinct run; unseeded runs are random and always distinct,
+        # and runs writing output files run for each of their specs
+        self.jobs: List[Dict[str, Any]] = []
+        self.keys: List[Optional[str]] = []
+        self.job_of: List[int] = []
+        seen: Dict[str, int] = {}
+        for index, params in enumerate(self.specs):
+            key = run_key(params)
+            shared = key is not None and not writes_outputs(params)
+            if shared and key in seen:
+                self.job_of.append(seen[key])
+                continue
+            if shared:
+                seen[key] = len(self.jobs)
+            self.job_of.append(len(self.jobs))
+            self.jobs.append(params)
+            self.keys.append(key)
+
+        self.lock = threading.Lock()
+        self.results: Dict[int, Dict[str, Any]] = {}
+        self.failures: Dict[int, str] = {}
+        self.attempts = collections.Counter()
+        self.leases: Dict[int, Tuple[float, Any]] = {}
+        self.pending = collections.deque()
+        self.duplicates = 0
+        self.connections = 0
+        for job, key in enumerate(self.keys):
+            cached = None
+            if cache is not None and not writes_outputs(self.jobs[job]):
+                cached = cache.get(key)
+            if cached is not None:
+                self.results[job] = cached
+            else:
+                self.pending.append(job)
+
+        self.server = _Server((host, port), _Handler)
+        self.server.coordinator = self
+        self.address = self.server.server_address
+
+    def finished(self) -> bool:
+        with self.lock:
+            return len(self.results) + len(self.failures) == len(self.jobs)
+
+    def _connected(self, handler, change: int):
+        with self.lock:
+            self.connections += change
+
+    def _reply(self, handler, message: Dict[str, Any]) -> Dict[str, Any]:
+        # Malformed messages get an error reply, the connection stays open
+        if not isinstance(message, dict):
+            return {"type": "error", "error": "Messages must be JSON objects"}
+        kind = message.get("type")
+        if kind in ("heartbeat", "result", "failed"):
+            job = message.get("job")
+            if type(job) is not int or not 0 <= job < len(self.jobs):
+                return {"type": "error", "error": f"Unknown job {job!r}"}
+        if kind == "result" and not isinstance(message.get("statistics"), dict):
+            return {"type": "error", "error": "Result without statistics"}
+        with self.lock:
+            self._expire()
+            if kind == "request":
+                return self._lease(handler)
+            if kind == "heartbeat":
+                if job in self.leases and self.leases[job][1] is handler:
+                    self.leases[job] = (time.monotonic() + self.timeout, handler)
+                    return {"type": "ok"}
+                # Lapsed or already done elsewhere: the worker may stop
+                return {"type": "cancel"}
+            if kind == "result":
+                self._complete(job, _restored(message["statistics"], self.jobs[job]))
+                return {"type": "ok"}
+            if kind == "failed":
+                # A lapsed lease was already retried; only its holder's
+                # failure counts
+                if job in self.leases and self.leases[job][1] is handler:
+                    del self.leases[job]
+                    self._retry(job, message.get("error", ""))
+                return {"type": "ok"}
+        return {"type": "error", "error": f"Unknown message type {kind!r}"}
+
+    def _lease(self, handler) -> Dict[str, Any]:
+        if self.pending:
+            job = self.pending.popleft()
+            self.attempts[job] += 1
+            self.leases[job] = (time.monotonic() + self.timeout, handler)
+            return {"type": "job", "job": job, "params": _sent_params(self.jobs[job])}
+        if self.leases:
+            return {"type": "wait", "seconds": c.HEARTBEAT_INTERVAL}
+        return {"type": "done"}
+
+    def _complete(self, job: int, statistics: Dict[str, Any]):
+        # A late copy leaves the lease alone, which may belong to the worker
+        # the job was handed to since. A first result ends the job whoever
+        # sent it, and other holders get "cancel" on their next heartbeat.
+        if job in self.results:
+            self.duplicates += 1
+            return
+        self.leases.pop(job, None)
+        self.failures.pop(job, None)
+        if job in self.pending:
+            self.pending.remove(job)
+        self.results[job] = statistics
+        if self.cache is not None:
+            self.cache.put(self.keys[job], statistics)
+
+    def _retry(self, job: int, error: str):
+        # Lost or failed leases go back in the queue while attempts remain
+        if job in self.results or job in self.pending:
+            return
+        if self.attempts[job] >= c.MAX_JOB_ATTEMPTS:
+            self.failures[job] = error
+        else:
+            self.pending.append(job)
+
+    def _expire(self):
+        now = time.monotonic()
+        for job, (deadline, _) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[job]
+                self._retry(job, "no heartbeat")
+
+    def _release(self, handler):
+        with self.lock:
+            for job, (_, holder) in list(self.leases.items()):
+                if holder is handler:
+                    del self.leases[job]
+                    self._retry(job, "worker disconnected")
+
+    def serve(self, poll: float = 0.2) -> List[Optional[Dict[str, Any]]]:
+        # Serves until every job has a result or used up its attempts, lets
+        # connected workers hear that there is nothing left, then returns
+        # the statistics per spec (None for failed jobs)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            while not self.finished():
+                with self.lock:
+                    self._expire()
+                time.sleep(poll)
+            deadline = time.monotonic() + 2 * c.HEARTBEAT_INTERVAL
+            while self.connections and time.monotonic() < deadline:
+                time.sleep(poll)
+        finally:
+            self.server.shutdown()
+            self.server.server_close()
+        return [self.results.get(job) for job in self.job_of]
+
+
+class _Heartbeat(threading.Thread):
+    # Keeps a worker's lease alive while it runs a job, and flags the job as
+    # cancelled once the coordinator says the lease is gone
+
+    def __init__(self, worker: "Worker", job: int):
+        super().__init__(daemon=True)
+        self.worker = worker
+        self.job = job
+        self.stopped = threading.Event()
+        self.cancelled = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(c.HEARTBEAT_INTERVAL):
+            try:
+                reply = self.worker.call({"type": "heartbeat", "job": self.job})
+            except OSError:
+                return
+            if reply is not None and reply["type"] == "cancel":
+                self.cancelled.set()
+                return
+
+
+def _run(
+    params: Dict[str, Any], cancelled: threading.Event, dt: float = DEFAULT_DT
+) -> Optional[Dict[str, Any]]:
+    # run_headless without a cache on params as sent by the coordinator,
+    # giving up (None) once cancelled
+    config = config_from_fields(params.get("config"))
+    params = dict(params, config=config.overrides())
+    simulation = create_simulation(params, config)
+    try:
+        while not simulation.is_finished():
+            if cancelled.is_set():
+                return None
+            simulation.update(dt)
+    finally:
+        simulation.close()
+    return simulation.get_statistics()
+
+
+class Worker:
+    # Pulls run specs from a coordinator, runs them headless and pushes the
+    # statistics back, until the coordinator has nothing left
+
+    def __init__(self, host: str = c.COORDINATOR_HOST, port: int = c.COORDINATOR_PORT):
+        self.connection = socket.create_connection((host, port))
+        self.lock = threading.Lock()
+
+    def call(self, message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # One request and its reply; heartbeats share the connection
+        with self.lock:
+            send_message(self.connection, message)
+            return receive_message(self.connection)
+
+    def run(self) -> int:
+        # Returns the number of jobs this worker completed
+        completed = 0
+        try:
+            while True:
+                reply = self.call({"type": "request"})
+                if reply is None or reply["type"] == "done":
+                    return completed
+                if reply["type"] == "wait":
+                    time.sleep(reply["seconds"])
+                    continue
+
+                heartbeat = _Heartbeat(self, reply["job"])
+                heartbeat.start()
+                try:
+                    statistics = _run(reply["params"], heartbeat.cancelled)
+                    if statistics is None:
+                        # Reassigned or done elsewhere: the result is dropped
+                        continue
+                    message = {
+                        "type": "result",
+                        "job": reply["job"],
+                        "statistics": _portable(statistics),
+                    }
+                    completed += 1
+                except Exception:
+                    message = {
+                        "type": "failed",
+                        "job": reply["job"],
+                        "error": traceback.format_exc(),
+                    }
+                finally:
+                    heartbeat.stopped.set()
+                if self.call(message) is None:
+                    return completed
+        except ConnectionError:
+            # The coordinator shut down
+            return completed
+        finally:
+            self.connection.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Distribute headless runs to workers over TCP"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinate = commands.add_parser("coordinate", help="serve a grid of runs")
+    coordinate.add_argument("--engine", choices=list(ENGINES), default="vectorized")
+    coordinate.add_argument("--seeds", type=int, nargs="+", default=[0])
+    coordinate.add_argument("--duration", type=int, default=c.MIN_SIMULATION_DURATION)
+    coordinate.add_argument(
+        "--set",
+        type=grid_entry,
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="param values to sweep over",
+    )
+    coordinate.add_argument("--cache-dir", default=c.RUN_CACHE_DIR)
+    coordinate.add_argument("--no-cache", action="store_true")
+    coordinate.add_argument(
+        "--reports", help="write a report per run under this folder"
+    )
+
+    work = commands.add_parser("work", help="run jobs from a coordinator")
+    for command in (coordinate, work):
+        command.add_argument("--host", default=c.COORDINATOR_HOST)
+        command.add_argument("--port", type=int, default=c.COORDINATOR_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "work":
+        completed = Worker(args.host, args.port).run()
+        print(f"{completed} runs completed")
+        return 0
+
+    base = dict(default_params(), engine=args.engine, duration=args.duration)
+    specs = list(expand(base, dict(args.set), args.seeds))
+    cache = None if args.no_cache else RunCache(args.cache_dir)
+    coordinator = Coordinator(specs, args.host, args.port, cache)
+    print(f"Serving {len(coordinator.jobs)} runs on {args.host}:{args.port}")
+    results = coordinator.serve()
+    for index, (params, statistics) in enumerate(zip(specs, results)):
+        swept = {name: params[name] for name, _ in args.set}
+        outcome = "failed" if statistics is None else statistics["final_populations"]
+        print(f"seed={params['seed']} {swept}", outcome)
+
+        if args.reports and statistics is not None:
+            from ..analysis import Plotter
+
+            # Specs with a terrain image missing here have no key
+            name = (run_key(params) or f"spec-{index}")[:12]
+            Plotter.generate_report(statistics, os.path.join(args.reports, name))
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+
+from darwin import config as c
+from .batched import BatchedSimulation
+from .simulation import Simulation
+from .vectorized import VectorizedSimulation
+
+# Engines selectable through params["engine"]; "reference" is the
+# object-by-object Simulation every other engine is validated against
+ENGINES = {
+    "reference": Simulation,
+    "batched": BatchedSimulation,
+    "vectorized": VectorizedSimulation,
+}
+
+DEFAULT_ENGINE = "reference"
+
+
+def create_simulation(
+    params: Dict[str, Any], config: Optional[c.SimulationConfig] = None
+) -> Simulation:
+    engine = params.get("engine", DEFAULT_ENGINE)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    return ENGINES[engine](params, config)
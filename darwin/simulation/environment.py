@@ -0,0 +1,113 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from darwin import config as c
+from .engines import create_simulation
+from .simulation import Simulation
+
+# Ticks advance the clock by this many seconds (times params["speed"]), the
+# frame time of the interactive app at 60 fps
+DEFAULT_DT = 1 / 60
+
+
+def default_params() -> Dict[str, Any]:
+    # Menu defaults, without vision cones
+    return {
+        "prey_count": c.DEFAULT_PREY_COUNT,
+        "predator_count": c.DEFAULT_PREDATOR_COUNT,
+        "food_count": c.DEFAULT_FOOD_COUNT,
+        "duration": c.DEFAULT_SIMULATION_DURATION,
+        "speed": c.DEFAULT_SIMULATION_SPEED,
+        "show_vision": False,
+    }
+
+
+@dataclass
+class Observation:
+    # Lightweight snapshot of a run. `state` holds the per-agent arrays when
+    # requested; on the array engines they are read-only views of the live
+    # state, only valid until the next step.
+    tick: int
+    time: float  # simulated seconds since the start
+    populations: Dict[str, int]
+    gene_moments: Dict[str, Dict[str, Tuple[float, float]]]  # (mean, std)
+    births: int
+    kills: int
+    finished: bool
+    state: Optional[Dict[str, np.ndarray]] = None
+
+
+class SimulationEnv:
+    # Drives a simulation without the pygame loop: reset() starts a run,
+    # step() advances it by whole ticks and stream() yields observations
+    # every few ticks, for notebooks, external analysis and RL experiments.
+
+    def __init__(self, dt: float = DEFAULT_DT):
+        self.dt = dt
+        self.simulation: Optional[Simulation] = None
+
+    def reset(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
+        config: Optional[c.SimulationConfig] = None,
+    ) -> Observation:
+        # New run from params (menu defaults when omitted; params["engine"]
+        # picks the engine) and an optional seed overriding params["seed"]
+        params = dict(default_params() if params is None else params)
+        if seed is not None:
+            params["seed"] = seed
+        self.close()
+        self.simulation = create_simulation(params, config)
+        return self.observe()
+
+    def close(self):
+        # Flushes the current run's event log, if any
+        if self.simulation is not None:
+            self.simulation.close()
+
+    def _running(self) -> Simulation:
+        if self.simulation is None:
+            raise RuntimeError("Call reset() before stepping the environment")
+        return self.simulation
+
+    def step(self, ticks: int = 1, views: bool = False) -> Observation:
+        # Advances up to `ticks` ticks, stopping early when the run finishes
+        simulation = self._running()
+        for _ in range(ticks):
+            if simulation.is_finished():
+                break
+            simulation.update(self.dt)
+        return self.observe(views)
+
+    def observe(self, views: bool = False) -> Observation:
+        simulation = self._running()
+        return Observation(
+            tick=simulation.tick,
+            time=simulation.params["duration"] - simulation.time_remaining,
+            populations=simulation.population_counts(),
+            gene_moments=simulation.species_registry.gene_moments(
+                simulation.agent_species(), simulation.agent_genes()
+            ),
+            births=simulation.total_reproductions,
+            kills=simulation.total_kills,
+            finished=simulation.is_finished(),
+            state=simulation.agent_state() if views else None,
+        )
+
+    def stream(
+        self, every: int = 1, ticks: Optional[int] = None, views: bool = False
+    ) -> Iterator[Observation]:
+        # Yields the current observation, then one every `every` ticks until
+        # the run finishes or `ticks` ticks have passed
+        if every < 1:
+            raise ValueError("Observations need at least one tick in between")
+        simulation = self._running()
+        end = None if ticks is None else simulation.tick + ticks
+        observation = self.observe(views)
+        yield observation
+        while not observation.finished and (end is None or simulation.tick < end):
+            count = every if end is None else min(every, end - simulation.tick)
+            observation = self.step(count, views)
+            yield observation
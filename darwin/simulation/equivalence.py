@@ -0,0 +1,271 @@
+import argparse
+import random
+import sys
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from darwin import config as c
+
+# An engine factory builds a fresh engine (Simulation or a compatible rewrite)
+# from params; the run seed is passed as params["seed"]
+EngineFactory = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class TickSnapshot:
+    tick: int
+    populations: Dict[str, int]
+    positions: Dict[str, np.ndarray]
+    births: int
+    kills: int
+    genome_statistics: Dict[str, Dict[str, float]]
+    food_slots: np.ndarray  # slots holding available food, in slot order
+
+    @staticmethod
+    def capture(engine, tick: int) -> "TickSnapshot":
+        # Every species of the engine's registry, plus food under "food"
+        names = list(engine.species_registry.names) + ["food"]
+        return TickSnapshot(
+            tick=tick,
+            populations=engine.population_counts(),
+            positions={name: engine.positions(name) for name in names},
+            births=engine.total_reproductions,
+            kills=engine.total_kills,
+            genome_statistics=engine.genome_statistics(),
+            food_slots=engine.food.available_slots(),
+        )
+
+
+@dataclass
+class Divergence:
+    tick: int
+    # "species", "population", "births", "kills", "food", "position" or "genome"
+    quantity: str
+    species: Optional[str] = None
+    entity: Optional[int] = None  # index among living entities of the species
+    reference: Any = None
+    candidate: Any = None
+
+    def describe(self) -> str:
+        where = f"tick {self.tick}: {self.quantity}"
+        if self.species is not None:
+            where += f" of {self.species}"
+        if self.entity is not None:
+            where += f" #{self.entity}"
+        return (
+            f"{where} differs (reference={self.reference}, candidate={self.candidate})"
+        )
+
+
+@dataclass
+class EquivalenceReport:
+    ticks: int
+    divergence: Optional[Divergence] = None
+    max_position_error: float = 0.0
+    max_statistic_error: float = 0.0
+    history: List[Dict[str, int]] = field(default_factory=list)
+
+    @property
+    def equivalent(self) -> bool:
+        return self.divergence is None
+
+    def summary(self) -> str:
+        if self.equivalent:
+            return (
+                f"Equivalent over {self.ticks} ticks "
+                f"(max position error {self.max_position_error:.3g}, "
+                f"max statistic error {self.max_statistic_error:.3g})"
+            )
+        return "Diverged at " + self.divergence.describe()
+
+
+class _SeededRun:
+    # Steps one engine while keeping its own copy of the global random state, so
+    # engines that still draw from the `random` module can advance in lockstep
+
+    def __init__(self, factory: EngineFactory, params: Dict[str, Any], seed: int):
+        saved_state = random.getstate()
+        random.seed(seed)
+        self.engine = factory(dict(params, seed=seed))
+        self.random_state = random.getstate()
+        random.setstate(saved_state)
+
+    def step(self, dt: float):
+        saved_state = random.getstate()
+        random.setstate(self.random_state)
+        self.engine.update(dt)
+        self.random_state = random.getstate()
+        random.setstate(saved_state)
+
+
+def _wrapped_errors(
+    reference: np.ndarray, candidate: np.ndarray, world_size: np.ndarray
+) -> np.ndarray:
+    delta = np.abs(reference - candidate)
+    size = np.asarray(world_size, dtype=float)
+    delta = np.minimum(delta, size - delta)
+    return np.sqrt((delta * delta).sum(axis=1))
+
+
+def compare_snapshots(
+    reference: TickSnapshot,
+    candidate: TickSnapshot,
+    report: EquivalenceReport,
+    position_tolerance: float,
+    statistic_tolerance: float,
+    world_size: np.ndarray,
+) -> Optional[Divergence]:
+    tick = reference.tick
+
+    if list(reference.positions) != list(candidate.positions):
+        return Divergence(
+            tick,
+            "species",
+            reference=list(reference.positions),
+            candidate=list(candidate.positions),
+        )
+
+    for species in reference.positions:
+        if reference.populations[species] != candidate.populations[species]:
+            return Divergence(
+                tick,
+                "population",
+                species,
+                reference=reference.populations[species],
+                candidate=candidate.populations[species],
+            )
+
+    if reference.births != candidate.births:
+        return Divergence(
+            tick, "births", None, None, reference.births, candidate.births
+        )
+    if reference.kills != candidate.kills:
+        return Divergence(tick, "kills", None, None, reference.kills, candidate.kills)
+
+    # Food must sit in the same slots, so later spawns reuse the same ones
+    if not np.array_equal(reference.food_slots, candidate.food_slots):
+        return Divergence(
+            tick,
+            "food",
+            "food",
+            reference=reference.food_slots.tolist(),
+            candidate=candidate.food_slots.tolist(),
+        )
+
+    for species in reference.positions:
+        ref_positions = reference.positions[species]
+        cand_positions = candidate.positions[species]
+        if len(ref_positions) == 0:
+            continue
+
+        errors = _wrapped_errors(ref_positions, cand_positions, world_size)
+        report.max_position_error = max(report.max_position_error, float(errors.max()))
+
+        diverging = np.flatnonzero(errors > position_tolerance)
+        if len(diverging):
+            index = int(diverging[0])
+            return Divergence(
+                tick,
+                "position",
+                species,
+                index,
+                tuple(ref_positions[index].tolist()),
+                tuple(cand_positions[index].tolist()),
+            )
+
+    for species in reference.genome_statistics:
+        ref_stats = reference.genome_statistics[species]
+        cand_stats = candidate.genome_statistics[species]
+        for gene, ref_value in ref_stats.items():
+            cand_value = cand_stats.get(gene, float("nan"))
+            error = abs(ref_value - cand_value)
+            if not error <= statistic_tolerance:
+                return Divergence(tick, "genome", species, None, ref_value, cand_value)
+            report.max_statistic_error = max(report.max_statistic_error, error)
+
+    return None
+
+
+def compare_engines(
+    reference: EngineFactory,
+    candidate: EngineFactory,
+    params: Dict[str, Any],
+    seed: int = 0,
+    ticks: int = 600,
+    dt: float = 1 / 60,
+    position_tolerance: float = 1e-6,
+    statistic_tolerance: float = 1e-6,
+) -> EquivalenceReport:
+    reference_run = _SeededRun(reference, params, seed)
+    candidate_run = _SeededRun(candidate, params, seed)
+    report = EquivalenceReport(ticks=0)
+    config = reference_run.engine.config
+    world_size = np.array([config.world_width, config.world_height])
+
+    for tick in range(ticks + 1):
+        if tick > 0:
+            reference_run.step(dt)
+            candidate_run.step(dt)
+
+        ref_snapshot = TickSnapshot.capture(reference_run.engine, tick)
+        cand_snapshot = TickSnapshot.capture(candidate_run.engine, tick)
+        report.ticks = tick
+        report.history.append(ref_snapshot.populations)
+
+        divergence = compare_snapshots(
+            ref_snapshot,
+            cand_snapshot,
+            report,
+            position_tolerance,
+            statistic_tolerance,
+            world_size,
+        )
+        if divergence is not None:
+            report.divergence = divergence
+            break
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .engines import ENGINES
+
+    parser = argparse.ArgumentParser(
+        description="Compare an engine against the reference trajectory"
+    )
+    parser.add_argument("--reference", choices=list(ENGINES), default="reference")
+    parser.add_argument("--candidate", choices=list(ENGINES), default="batched")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--prey", type=int, default=c.DEFAULT_PREY_COUNT)
+    parser.add_argument("--predators", type=int, default=c.DEFAULT_PREDATOR_COUNT)
+    parser.add_argument("--food", type=int, default=c.DEFAULT_FOOD_COUNT)
+    parser.add_argument("--speed", type=int, default=c.DEFAULT_SIMULATION_SPEED)
+    parser.add_argument("--position-tolerance", type=float, default=1e-6)
+    parser.add_argument("--statistic-tolerance", type=float, default=1e-6)
+    args = parser.parse_args(argv)
+
+    params = {
+        "prey_count": args.prey,
+        "predator_count": args.predators,
+        "food_count": args.food,
+        "duration": c.MAX_SIMULATION_DURATION,
+        "speed": args.speed,
+        "show_vision": False,
+    }
+    report = compare_engines(
+        ENGINES[args.reference],
+        ENGINES[args.candidate],
+        params,
+        seed=args.seed,
+        ticks=args.ticks,
+        position_tolerance=args.position_tolerance,
+        statistic_tolerance=args.statistic_tolerance,
+    )
+    print(report.summary())
+    return 0 if report.equivalent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
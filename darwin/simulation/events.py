@@ -0,0 +1,148 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+from darwin import config as c
+
+# Event types. Births: actor is a parent, target the child. Kills: actor is
+# the hunter, target the victim. Meals: actor is the eater, target the food
+# slot. Starvation: actor is the agent that ran out of energy, no target.
+BIRTH = 0
+KILL = 1
+MEAL = 2
+STARVATION = 3
+EVENT_NAMES = ("birth", "kill", "meal", "starvation")
+
+# One fixed-size little-endian record per event, positions where it happened
+EVENT_DTYPE = np.dtype(
+    [
+        ("tick", "<u4"),
+        ("event", "u1"),
+        ("actor", "<i4"),
+        ("target", "<i4"),
+        ("x", "<f4"),
+        ("y", "<f4"),
+    ]
+)
+MAGIC = b"DRWNEV01"
+
+
+class EventLog:
+    # Append-only event stream. Single events are queued as tuples and packed
+    # into record arrays in batches, engines with arrays append whole batches;
+    # full buffers go to the file (or stay in memory without a path).
+
+    def __init__(
+        self, path: Optional[str] = None, buffer_size: int = c.EVENT_BUFFER_SIZE
+    ):
+        self.path = path
+        self.buffer_size = buffer_size
+        self._rows: List[tuple] = []
+        self._chunks: List[np.ndarray] = []
+        self._pending = 0
+        self._kept: List[np.ndarray] = []
+        self._file = None
+        if path is not None:
+            self._file = open(path, "wb")
+            self._file.write(MAGIC)
+
+    def record(self, tick: int, event: int, actor, target, x: float, y: float):
+        self._rows.append((tick, event, actor, target, x, y))
+        if len(self._rows) >= self.buffer_size:
+            self.flush()
+
+    def record_many(
+        self,
+        tick: int,
+        event: int,
+        actors: np.ndarray,
+        targets: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+    ):
+        count = len(actors)
+        if count == 0:
+            return
+        chunk = np.empty(count, dtype=EVENT_DTYPE)
+        chunk["tick"] = tick
+        chunk["event"] = event
+        chunk["actor"] = actors
+        chunk["target"] = targets
+        chunk["x"] = xs
+        chunk["y"] = ys
+        # Queued single events come first, keeping the stream in order
+        self._pack_rows()
+        self._chunks.append(chunk)
+        self._pending += count
+        if self._pending >= self.buffer_size:
+            self.flush()
+
+    def _pack_rows(self):
+        if self._rows:
+            self._chunks.append(np.array(self._rows, dtype=EVENT_DTYPE))
+            self._pending += len(self._rows)
+            self._rows = []
+
+    def flush(self):
+        self._pack_rows()
+        if self._file is not None:
+            for chunk in self._chunks:
+                self._file.write(chunk.tobytes())
+            self._file.flush()
+        else:
+            self._kept.extend(self._chunks)
+        self._chunks = []
+        self._pending = 0
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def events(self) -> np.ndarray:
+        # Everything recorded so far, as one record array
+        self.flush()
+        if self.path is not None:
+            return read_events(self.path)
+        if not self._kept:
+            return np.zeros(0, dtype=EVENT_DTYPE)
+        self._kept = [np.concatenate(self._kept)]
+        return self._kept[0]
+
+
+def read_events(path: str) -> np.ndarray:
+    # Memory-mapped record array of an event file
+    with open(path, "rb") as stream:
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an event log: {path}")
+        stream.seek(0, 2)
+        size = stream.tell() - len(MAGIC)
+    if size < EVENT_DTYPE.itemsize:
+        return np.zeros(0, dtype=EVENT_DTYPE)
+    return np.memmap(path, dtype=EVENT_DTYPE, mode="r", offset=len(MAGIC))
+
+
+def select(
+    events: np.ndarray,
+    event: Optional[int] = None,
+    first_tick: Optional[int] = None,
+    last_tick: Optional[int] = None,
+) -> np.ndarray:
+    # Events of one type within a tick range (both ends included)
+    mask = np.ones(len(events), dtype=bool)
+    if event is not None:
+        mask &= events["event"] == event
+    if first_tick is not None:
+        mask &= events["tick"] >= first_tick
+    if last_tick is not None:
+        mask &= events["tick"] <= last_tick
+    return events[mask]
+
+
+def counts_by_actor(
+    events: np.ndarray, event: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Ids of the actors and how many events of the type each one caused, to
+    # join with per-agent genes (e.g. kills per predator genotype)
+    actors = select(events, event)["actor"]
+    return np.unique(actors, return_counts=True)
@@ -0,0 +1,131 @@
+import numpy as np
+from typing import Iterator, List, Optional
+
+from darwin import config as c
+from ..entities import Food
+from .perception import wrapped_delta
+from .spatial import SpatialGrid
+
+
+class FoodStore:
+    # Food lives in fixed slots with parallel position/availability arrays.
+    # Consumed slots go to a free list and their Food objects are reused on
+    # the next spawn. The grid index only changes when food spawns; consumed
+    # slots are filtered out through the availability mask. With several
+    # layers one store holds the food of independent worlds, each slot tagged
+    # with its layer.
+
+    def __init__(self, config: c.SimulationConfig, capacity: int = 64, layers: int = 1):
+        self.config = config
+        self.slots: List[Food] = []
+        self.xs = np.zeros(capacity)
+        self.ys = np.zeros(capacity)
+        self.available = np.zeros(capacity, dtype=bool)
+        self.layer = np.zeros(capacity, dtype=np.intp)
+        self.free: List[int] = []
+        self.count = 0
+        self.layers = layers
+        self.counts = np.zeros(layers, dtype=np.intp)
+
+        self.grid = SpatialGrid(
+            config.world_width, config.world_height, config.spatial_cell_size, layers
+        )
+        self._grid_dirty = True
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Food]:
+        return (self.slots[slot] for slot in self.available_slots())
+
+    def available_slots(self) -> np.ndarray:
+        return np.flatnonzero(self.available[: len(self.slots)])
+
+    def _grow(self):
+        capacity = 2 * len(self.xs)
+        for name in ("xs", "ys", "available", "layer"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[: len(array)] = array
+            setattr(self, name, grown)
+
+    def spawn(self, x: float, y: float, layer: int = 0) -> Food:
+        if self.free:
+            slot = self.free.pop()
+            food = self.slots[slot]
+            food.x = x
+            food.y = y
+            food.available = True
+        else:
+            slot = len(self.slots)
+            if slot == len(self.xs):
+                self._grow()
+            food = Food(x, y, self.config)
+            food.slot = slot
+            self.slots.append(food)
+
+        self.xs[slot] = x
+        self.ys[slot] = y
+        self.available[slot] = True
+        self.layer[slot] = layer
+        self.count += 1
+        self.counts[layer] += 1
+        self._grid_dirty = True
+        return food
+
+    def consume(self, food: Food):
+        if not food.available:
+            return
+        food.available = False
+        self.available[food.slot] = False
+        self.free.append(food.slot)
+        self.count -= 1
+        self.counts[self.layer[food.slot]] -= 1
+
+    def index(self) -> SpatialGrid:
+        # Grid over all slots, rebuilt only after new food appeared
+        if self._grid_dirty:
+            size = len(self.slots)
+            layers = self.layer[:size] if self.layers > 1 else None
+            self.grid.build(self.xs[:size], self.ys[:size], layers)
+            self._grid_dirty = False
+        return self.grid
+
+    def nearest(
+        self, x: float, y: float, radius: float, layer: int = 0
+    ) -> Optional[Food]:
+        # Closest available food within radius (wrapped), ties to the lowest slot
+        if self.counts[layer] == 0:
+            return None
+
+        layers = np.array([layer]) if self.layers > 1 else None
+        _, candidates = self.index().query_pairs(
+            np.array([x]), np.array([y]), radius, layers
+        )
+        candidates = candidates[self.available[candidates]]
+        if len(candidates) == 0:
+            return None
+
+        dx = wrapped_delta(self.xs[candidates] - x, self.config.world_width)
+        dy = wrapped_delta(self.ys[candidates] - y, self.config.world_height)
+        distance_sq = dx * dx + dy * dy
+        in_range = distance_sq <= radius * radius
+        if not in_range.any():
+            return None
+
+        candidates = candidates[in_range]
+        distance_sq = distance_sq[in_range]
+        best = np.lexsort((candidates, distance_sq))[0]
+        return self.slots[candidates[best]]
+
+    def query_rect(
+        self, x0: float, y0: float, x1: float, y1: float, layer: int = 0
+    ) -> List[Food]:
+        slots = self.index().query_rect(x0, y0, x1, y1, layer)
+        return [self.slots[slot] for slot in slots if self.available[slot]]
+
+    def positions(self, layer: Optional[int] = None) -> np.ndarray:
+        slots = self.available_slots()
+        if layer is not None:
+            slots = slots[self.layer[slots] == layer]
+        return np.column_stack([self.xs[slots], self.ys[slots]]).reshape(-1, 2)
@@ -0,0 +1,276 @@
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import traceback
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from darwin import config as c
+from ..genetics import SpeciesRegistry
+from .engines import ENGINES, create_simulation
+from .environment import DEFAULT_DT, default_params
+
+TOPOLOGIES = ("ring", "random")
+
+
+def destinations(islands: int, topology: str, epoch: int, seed: int) -> np.ndarray:
+    # Island each island sends its migrants to in a given migration. Every
+    # island derives the same map from the shared seed, so no coordinator is
+    # needed; each island also receives from exactly one other.
+    if topology == "ring":
+        return (np.arange(islands) + 1) % islands
+    generator = np.random.default_rng([seed, epoch])
+    # A random cycle through all islands, so no island keeps its own migrants
+    order = generator.permutation(islands)
+    targets = np.empty(islands, dtype=np.intp)
+    targets[order] = np.roll(order, -1)
+    return targets
+
+
+def _receive(
+    inbox: multiprocessing.Queue,
+    sender: int,
+    epoch: int,
+    pending: Dict[Tuple[int, int], Any],
+    stopped: Set[int],
+) -> Any:
+    # Migrants `sender` sent in `epoch`, or None once it has stopped.
+    # Messages are (sender, epoch, migrants), with no epoch for an island
+    # that stopped; those of other senders or epochs are kept for later.
+    while (sender, epoch) not in pending and sender not in stopped:
+        origin, sent, migrants = inbox.get()
+        if sent is None:
+            stopped.add(origin)
+        else:
+            pending[(origin, sent)] = migrants
+    return pending.pop((sender, epoch), None)
+
+
+def _island(
+    index: int,
+    params: Dict[str, Any],
+    inboxes: List[multiprocessing.Queue],
+    results: multiprocessing.Queue,
+    settings: Dict[str, Any],
+):
+    # Worker process: runs one island, trading migrants with the others
+    # every interval simulated seconds, then reports its statistics and
+    # final genomes. An island that stopped sends and receives no more
+    # migrants; it keeps draining its inbox until every island stopped, so
+    # no sender is left blocked on a full queue.
+    try:
+        simulation = create_simulation(params)
+        islands = len(inboxes)
+        interval = settings["interval"]
+        epoch = 0
+        pending: Dict[Tuple[int, int], Any] = {}
+        stopped: Set[int] = set()
+        while not simulation.is_finished():
+            simulation.update(settings["dt"])
+            elapsed = params["duration"] - simulation.time_remaining
+            if islands > 1 and elapsed >= (epoch + 1) * interval:
+                targets = destinations(
+                    islands, settings["topology"], epoch, settings["seed"]
+                )
+                target = int(targets[index])
+                if target not in stopped:
+                    migrants = simulation.emigrate(settings["migrants"])
+                    inboxes[target].put((index, epoch, migrants))
+                sender = int(np.flatnonzero(targets == index)[0])
+                migrants = _receive(inboxes[index], sender, epoch, pending, stopped)
+                if migrants is not None:
+                    simulation.immigrate(migrants)
+                epoch += 1
+        simulation.close()
+        results.put(
+            (
+                index,
+                True,
+                (
+                    simulation.get_statistics(),
+                    simulation.agent_species(),
+                    simulation.agent_genes(),
+                ),
+            )
+        )
+
+        for other, inbox in enumerate(inboxes):
+            if other != index:
+                inbox.put((index, None, None))
+        while len(stopped) < islands - 1:
+            origin, sent, _ = inboxes[index].get()
+            if sent is None:
+                stopped.add(origin)
+    except BaseException:
+        results.put((index, False, traceback.format_exc()))
+
+
+def aggregate(
+    statistics: List[Dict[str, Any]], kinds: np.ndarray, genes: np.ndarray
+) -> Dict[str, Any]:
+    # One statistics dict over all islands, shaped like get_statistics() so
+    # reports work unchanged; per-island statistics stay under "islands"
+    first = statistics[0]
+    species = first["species"]
+    finals = {
+        spec.name: sum(s["final_populations"][spec.name] for s in statistics)
+        for spec in species
+    }
+    params = dict(first["simulation_params"])
+    survival = {}
+    for spec in species:
+        key = f"{spec.key}_count"
+        params[key] = sum(s["simulation_params"].get(key, 0) for s in statistics)
+        survival[f"{spec.key}_survival_rate"] = (
+            finals[spec.name] / params[key] * 100 if params[key] > 0 else 0
+        )
+
+    # Islands share a clock, so their samples line up one to one
+    histories = [s["population_history"] for s in statistics]
+    samples = min(len(h["time"]) for h in histories)
+    history = {"time": histories[0]["time"][:samples]}
+    for spec in species:
+        history[spec.name] = [
+            sum(values) for values in zip(*(h[spec.name][:samples] for h in histories))
+        ]
+
+    registry = SpeciesRegistry(species)
+    return {
+        "species": species,
+        "final_populations": finals,
+        "survival_stats": survival,
+        "evolution_info": {
+            name: sum(s["evolution_info"][name] for s in statistics)
+            for name in first["evolution_info"]
+        },
+        "genome_statistics": registry.gene_statistics(kinds, genes),
+        "population_history": history,
+        "simulation_params": params,
+        "seed": first["seed"],
+        "stop_reason": None,
+        "islands": statistics,
+    }
+
+
+def _island_params(params: Dict[str, Any], index: int, seed: int) -> Dict[str, Any]:
+    # Own seed, and own event log and lineage files when asked for. Islands
+    # share one clock, so none stops early.
+    island = dict(params, seed=seed, early_stop=False)
+    for key in ("event_log", "lineage_file"):
+        if params.get(key):
+            root, extension = os.path.splitext(params[key])
+            island[key] = f"{root}-{index}{extension}"
+    return island
+
+
+def run_islands(
+    params: Dict[str, Any],
+    islands: int = c.DEFAULT_ISLANDS,
+    interval: float = c.MIGRATION_INTERVAL,
+    migrants: int = c.MIGRANTS_PER_SPECIES,
+    topology: str = "ring",
+    dt: float = DEFAULT_DT,
+) -> Dict[str, Any]:
+    # Island model: `islands` worlds built from the same params run in
+    # separate processes. Every `interval` simulated seconds each sends up to
+    # `migrants` agents per species (genes and energy) to its neighbour in a
+    # ring or a random cycle. Returns statistics aggregated over all islands.
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+    sequence = np.random.SeedSequence(params.get("seed"))
+    seeds = sequence.generate_state(islands + 1).tolist()
+    settings = {
+        "interval": interval,
+        "migrants": migrants,
+        "topology": topology,
+        "dt": dt,
+        "seed": seeds[-1],
+    }
+
+    inboxes = [multiprocessing.Queue() for _ in range(islands)]
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=_island,
+            args=(i, _island_params(params, i, seeds[i]), inboxes, results, settings),
+            daemon=True,
+        )
+        for i in range(islands)
+    ]
+    for worker in workers:
+        worker.start()
+
+    # Results are drained before joining; a failed island would leave the
+    # others waiting for its migrants, so they are stopped
+    reports: List[Any] = [None] * islands
+    try:
+        for _ in range(islands):
+            while True:
+                try:
+                    index, ok, value = results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    silent = [
+                        i
+                        for i, worker in enumerate(workers)
+                        if not worker.is_alive() and reports[i] is None
+                    ]
+                    if silent and results.empty():
+                        raise RuntimeError(
+                            f"Island {silent[0]} exited without a result"
+                        )
+            if not ok:
+                raise RuntimeError(f"Island {index} failed:\n{value}")
+            reports[index] = value
+    finally:
+        for worker in workers:
+            if worker.is_alive() and any(report is None for report in reports):
+                worker.terminate()
+            worker.join()
+
+    statistics = aggregate(
+        [report[0] for report in reports],
+        np.concatenate([report[1] for report in reports]),
+        np.concatenate([report[2] for report in reports]),
+    )
+    statistics["seed"] = sequence.entropy
+    return statistics
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run islands in parallel processes with periodic migration"
+    )
+    parser.add_argument("--engine", choices=list(ENGINES), default="vectorized")
+    parser.add_argument("--islands", type=int, default=c.DEFAULT_ISLANDS)
+    parser.add_argument("--interval", type=float, default=c.MIGRATION_INTERVAL)
+    parser.add_argument("--migrants", type=int, default=c.MIGRANTS_PER_SPECIES)
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="ring")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--duration", type=int, default=c.DEFAULT_SIMULATION_DURATION)
+    parser.add_argument("--reports", help="write the aggregated report here")
+    args = parser.parse_args(argv)
+
+    params = dict(
+        default_params(), engine=args.engine, duration=args.duration, seed=args.seed
+    )
+    statistics = run_islands(
+        params, args.islands, args.interval, args.migrants, args.topology
+    )
+    for index, island in enumerate(statistics["islands"]):
+        print(f"island {index}: {island['final_populations']}")
+    print(f"all islands: {statistics['final_populations']}")
+    print(f"seed: {statistics['seed']}")
+
+    if args.reports:
+        from ..analysis import Plotter
+
+        Plotter.generate_report(statistics, args.reports)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import numpy as np
+from typing import Optional
+
+# Cause of death column
+ALIVE = 0
+KILLED = 1
+STARVED = 2
+EMIGRATED = 3  # left for another island
+CAUSES = ("alive", "killed", "starved", "emigrated")
+
+# Typed columns, one row per agent id; genes are a separate 2-D column
+COLUMNS = {
+    "kind": (np.int16, -1),
+    "first_parent": (np.int64, -1),
+    "second_parent": (np.int64, -1),
+    "birth_tick": (np.int32, -1),
+    "death_tick": (np.int32, -1),
+    "cause": (np.uint8, ALIVE),
+    "offspring": (np.int32, 0),
+}
+
+
+class LineageStore:
+    # Every agent of a run by id (ids are handed out sequentially, so the id
+    # is the row): species, parents, birth and death tick, cause of death,
+    # genes and number of children. Columns grow by doubling like the food
+    # store, so appends stay cheap for millions of agents.
+
+    def __init__(self, gene_count: int, capacity: int = 1024):
+        self.gene_count = gene_count
+        self.count = 0
+        for name, (dtype, fill) in COLUMNS.items():
+            setattr(self, name, np.full(capacity, fill, dtype=dtype))
+        self.genes = np.zeros((capacity, gene_count), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _reserve(self, size: int):
+        capacity = len(self.kind)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name, (dtype, fill) in COLUMNS.items():
+            grown = np.full(capacity, fill, dtype=dtype)
+            grown[: self.count] = getattr(self, name)[: self.count]
+            setattr(self, name, grown)
+        genes = np.zeros((capacity, self.gene_count), dtype=np.float32)
+        genes[: self.count] = self.genes[: self.count]
+        self.genes = genes
+
+    def add_births(
+        self,
+        ids: np.ndarray,
+        kinds: np.ndarray,
+        first_parents: np.ndarray,
+        second_parents: np.ndarray,
+        tick: int,
+        genes: np.ndarray,
+    ):
+        # Founders have parent -1; parents' offspring counts go up by one
+        # per child
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        self._reserve(int(ids.max()) + 1)
+        self.count = max(self.count, int(ids.max()) + 1)
+        self.kind[ids] = kinds
+        self.first_parent[ids] = first_parents
+        self.second_parent[ids] = second_parents
+        self.birth_tick[ids] = tick
+        self.genes[ids] = genes
+        for parents in (first_parents, second_parents):
+            parents = np.asarray(parents).reshape(-1)
+            np.add.at(self.offspring, parents[parents >= 0], 1)
+
+    def add_deaths(self, ids: np.ndarray, tick: int, causes):
+        ids = np.asarray(ids, dtype=np.int64)
+        self.death_tick[ids] = tick
+        self.cause[ids] = causes
+
+    def parents(self, ids) -> np.ndarray:
+        # (n, 2) parent ids, -1 for founders
+        ids = np.asarray(ids, dtype=np.int64)
+        return np.column_stack([self.first_parent[ids], self.second_parent[ids]])
+
+    def ancestors(self, ids, generations: Optional[int] = None) -> np.ndarray:
+        # Sorted ids of every ancestor up to `generations` back (all by default)
+        frontier = np.unique(np.asarray(ids, dtype=np.int64))
+        found = np.zeros(0, dtype=np.int64)
+        depth = 0
+        while len(frontier) and (generations is None or depth < generations):
+            frontier = self.parents(frontier).ravel()
+            frontier = np.setdiff1d(frontier[frontier >= 0], found)
+            found = np.union1d(found, frontier)
+            depth += 1
+        return found
+
+    def descendants(self, ids, generations: Optional[int] = None) -> np.ndarray:
+        # Sorted ids of every descendant up to `generations` down
+        first = self.first_parent[: self.count]
+        second = self.second_parent[: self.count]
+        frontier = np.unique(np.asarray(ids, dtype=np.int64))
+        found = np.zeros(self.count, dtype=bool)
+        depth = 0
+        while len(frontier) and (generations is None or depth < generations):
+            children = np.isin(first, frontier) | np.isin(second, frontier)
+            children &= ~found
+            found |= children
+            frontier = np.flatnonzero(children)
+            depth += 1
+        return np.flatnonzero(found)
+
+    def generations(self) -> np.ndarray:
+        # Generation of each agent: 0 for founders, else one more than the
+        # older parent's, relaxed level by level
+        first = self.first_parent[: self.count]
+        second = self.second_parent[: self.count]
+        has_first = first >= 0
+        has_second = second >= 0
+        generation = np.zeros(self.count, dtype=np.int32)
+        while True:
+            updated = np.zeros(self.count, dtype=np.int32)
+            updated[has_first] = generation[first[has_first]] + 1
+            later = np.zeros(self.count, dtype=np.int32)
+            later[has_second] = generation[second[has_second]] + 1
+            np.maximum(updated, later, out=updated)
+            if np.array_equal(updated, generation):
+                return generation
+            generation = updated
+
+    def lifespans(self, tick: int) -> np.ndarray:
+        # Ticks lived, up to `tick` for agents still alive
+        death = self.death_tick[: self.count]
+        end = np.where(death >= 0, death, tick)
+        return end - self.birth_tick[: self.count]
+
+    def save(self, path: str):
+        # Compressed columns trimmed to the recorded agents
+        columns = {name: getattr(self, name)[: self.count] for name in COLUMNS}
+        np.savez_compressed(path, genes=self.genes[: self.count], **columns)
+
+    @staticmethod
+    def load(path: str) -> "LineageStore":
+        with np.load(path) as data:
+            genes = data["genes"]
+            store = LineageStore(genes.shape[1], max(1, len(genes)))
+            store.count = len(genes)
+            store.genes[: store.count] = genes
+            for name in COLUMNS:
+                getattr(store, name)[: store.count] = data[name]
+        return store
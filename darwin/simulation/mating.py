@@ -0,0 +1,70 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from .perception import wrapped_delta
+from .spatial import SpatialGrid
+
+
+def match_mates(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    directions: np.ndarray,
+    ranges: np.ndarray,
+    cos_half_cones: np.ndarray,
+    groups: np.ndarray,
+    contact_distance: float,
+    world_width: float,
+    world_height: float,
+    layers: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Mating pairs among reproductive agents: same group, within contact
+    # distance and each seeing the other (range and cone). Matched greedily
+    # from the closest pair so nobody mates twice; returns the pairs (i < j)
+    # sorted by first index. Layers keep stacked worlds apart.
+    empty = np.empty(0, dtype=np.intp)
+    if len(xs) < 2:
+        return empty, empty
+
+    # Candidate pairs (i < j) of one group in contact
+    layer_count = 1 if layers is None else int(layers.max()) + 1
+    grid = SpatialGrid(world_width, world_height, contact_distance, layer_count)
+    grid.build(xs, ys, layers)
+    first, second = grid.query_pairs(xs, ys, contact_distance, layers)
+    keep = (first < second) & (groups[first] == groups[second])
+    first = first[keep]
+    second = second[keep]
+
+    dx = wrapped_delta(xs[second] - xs[first], world_width)
+    dy = wrapped_delta(ys[second] - ys[first], world_height)
+    distance = np.sqrt(dx * dx + dy * dy)
+
+    # Each partner must see the other
+    heading_x = np.cos(directions)
+    heading_y = np.sin(directions)
+    sees_second = (distance <= ranges[first]) & (
+        dx * heading_x[first] + dy * heading_y[first]
+        >= cos_half_cones[first] * distance
+    )
+    sees_first = (distance <= ranges[second]) & (
+        -dx * heading_x[second] - dy * heading_y[second]
+        >= cos_half_cones[second] * distance
+    )
+    keep = (distance <= contact_distance) & sees_second & sees_first
+    first = first[keep]
+    second = second[keep]
+    distance = distance[keep]
+    if len(first) == 0:
+        return empty, empty
+
+    # Greedy matching from the closest pair
+    order = np.lexsort((second, first, distance))
+    matched = np.zeros(len(xs), dtype=bool)
+    pairs = []
+    for i, j in zip(first[order].tolist(), second[order].tolist()):
+        if not matched[i] and not matched[j]:
+            matched[i] = matched[j] = True
+            pairs.append((i, j))
+    pairs.sort()
+
+    pairs = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+    return pairs[:, 0], pairs[:, 1]
@@ -0,0 +1,256 @@
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence
+
+from darwin import config as c
+from ..genetics import SpeciesRegistry
+from .food_store import FoodStore
+from .lineage import LineageStore
+from .rng import RandomStreams
+from .simulation import Simulation
+from .vectorized import AGENT_FIELDS, VectorizedSimulation
+
+# Params that must match across the worlds of one run: they share the clock
+SHARED_PARAMS = ("duration", "speed", "config")
+
+
+class WorldDraws:
+    # Generator stand-in for rows that belong to different worlds: each call
+    # draws every world's rows from that world's own generator, in row order,
+    # so a world's numbers never depend on the other worlds. Indexing by
+    # world gives the generator itself.
+
+    def __init__(self, generators: Sequence[np.random.Generator], owners):
+        self.generators = generators
+        self.owners = np.asarray(owners)
+
+    def __getitem__(self, world: int) -> np.random.Generator:
+        return self.generators[world]
+
+    def _draw(self, method: str, size, *args) -> np.ndarray:
+        shape = (size,) if np.isscalar(size) else tuple(size)
+        values = np.empty(shape)
+        for world in np.unique(self.owners).tolist():
+            rows = self.owners == world
+            draw = getattr(self.generators[world], method)
+            values[rows] = draw(*args, size=(int(rows.sum()),) + shape[1:])
+        return values
+
+    def random(self, size) -> np.ndarray:
+        return self._draw("random", size)
+
+    def uniform(self, low, high, size) -> np.ndarray:
+        return self._draw("uniform", size, low, high)
+
+    def normal(self, loc, scale, size) -> np.ndarray:
+        return self._draw("normal", size, loc, scale)
+
+
+class WorldFood:
+    # One world's share of the layered food store
+    def __init__(self, store: FoodStore, world: int):
+        self.store = store
+        self.world = world
+
+    def __len__(self) -> int:
+        return int(self.store.counts[self.world])
+
+    def positions(self) -> np.ndarray:
+        return self.store.positions(self.world)
+
+
+class World:
+    # Per-world view of a MultiWorldSimulation: own params, random streams,
+    # counters and population history. The statistics methods are the
+    # Simulation ones, reading this world's slice of the shared arrays.
+
+    def __init__(self, owner: "MultiWorldSimulation", index: int, params: Dict):
+        self.owner = owner
+        self.index = index
+        self.params = params
+        self.config = owner.config
+        self.species_registry = owner.species_registry
+        self.rng = RandomStreams(params.get("seed"))
+        self.seed = self.rng.seed
+        self.food = WorldFood(owner.food, index)
+        self.resources = None
+        self.total_reproductions = 0
+        self.total_kills = 0
+        self.population_history = {name: [] for name in self.species_registry.names}
+        self.population_history["time"] = []
+        self.stop_reason = None
+
+    def _members(self) -> np.ndarray:
+        return self.owner.world == self.index
+
+    def agent_species(self) -> np.ndarray:
+        return self.owner.kind[self._members()]
+
+    def agent_positions(self) -> np.ndarray:
+        members = self._members()
+        return np.column_stack([self.owner.x[members], self.owner.y[members]])
+
+    def agent_genes(self) -> np.ndarray:
+        return self.owner.genes[self._members()]
+
+    _species_counts = Simulation._species_counts
+    population_counts = Simulation.population_counts
+    positions = Simulation.positions
+    genome_statistics = Simulation.genome_statistics
+    get_statistics = Simulation.get_statistics
+
+
+class MultiWorldSimulation(VectorizedSimulation):
+    # Many independent worlds advanced together by the vectorized kernels.
+    # The agents of every world share one set of arrays with a world index
+    # per agent; the spatial grids, the food store and mate matching are
+    # layered by world so nothing interacts across worlds, and every random
+    # draw comes from the streams of the world it belongs to. Each world
+    # therefore evolves exactly as a VectorizedSimulation with its params
+    # would, at the per-tick Python cost of a single world.
+    #
+    # Worlds differ in population counts, food count and seed; they share
+    # the config, duration and speed. Headless only (it takes a list of
+    # params, so it is not among the ENGINES the UI can pick), items food
+    # without terrain.
+
+    agent_fields = AGENT_FIELDS + ("world",)
+
+    def __init__(
+        self,
+        params_list: Sequence[Dict[str, Any]],
+        config: Optional[c.SimulationConfig] = None,
+    ):
+        if not params_list:
+            raise ValueError("A multi-world run needs at least one world")
+        first = params_list[0]
+        for name in SHARED_PARAMS:
+            if any(p.get(name) != first.get(name) for p in params_list):
+                raise ValueError(f"All worlds must share the same {name}")
+        # Stop detection reads one population history, not one per world
+        if any(p.get("early_stop") for p in params_list):
+            raise ValueError("Multi-world runs share one clock and cannot stop early")
+
+        if config is None:
+            config = c.SimulationConfig.from_overrides(first.get("config"))
+        if config.food_mode != "items" or config.terrain != "none":
+            raise ValueError("Multi-world runs support items food without terrain")
+        self.check_support(config)
+        self.params = first
+        self.config = config
+        self.species_registry = SpeciesRegistry(config.defined_species)
+
+        capacity = sum(max(1, p["food_count"]) for p in params_list)
+        self.food = FoodStore(config, capacity, layers=len(params_list))
+        self.terrain = None
+        self.resources = None
+        self.worlds = [World(self, i, params) for i, params in enumerate(params_list)]
+        self._generators = {
+            name: [getattr(world.rng, name).generator for world in self.worlds]
+            for name in RandomStreams.SUBSYSTEMS
+        }
+
+        self.entities = []
+        self.events = None
+        self.lineage = LineageStore(len(self.species_registry.genes))
+        self.tick = 0
+        self._entity_count = 0
+        self.time_remaining = first["duration"]
+        # Worlds share one clock; early_stop was rejected above
+        self.stop_reason = None
+        self.speed = first["speed"]
+        self.show_vision = False
+        self.start_time = time.time()
+
+        self._initialize_populations()
+        self._register_founders()
+        self._spawn_food()
+        self._record_population_data()
+
+    def _initialize_populations(self):
+        self._reset_agents()
+        registry = self.species_registry
+        kinds = []
+        for world in self.worlds:
+            counts = [
+                world.params.get(f"{spec.key}_count", 0) for spec in registry.species
+            ]
+            kinds.append(np.repeat(np.arange(len(registry)), counts))
+        worlds = np.repeat(np.arange(len(self.worlds)), [len(k) for k in kinds])
+        kinds = np.concatenate(kinds)
+        self._spawn_agents(
+            kinds, WorldDraws(self._generators["spawn"], worlds), world=worlds
+        )
+
+    def _reset_agents(self):
+        super()._reset_agents()
+        self.world = np.zeros(0, dtype=np.intp)
+
+    def _draws(self, stream: str, agents) -> WorldDraws:
+        return WorldDraws(self._generators[stream], self.world[agents])
+
+    def _layers(self) -> np.ndarray:
+        return self.world
+
+    def _inherited(self, parents: np.ndarray) -> Dict[str, np.ndarray]:
+        return {"world": self.world[parents]}
+
+    def _tally(self, children: Optional[Dict[str, np.ndarray]], victims: np.ndarray):
+        count = len(self.worlds)
+        births = np.zeros(count, dtype=np.intp)
+        if children is not None:
+            births = np.bincount(children["world"], minlength=count)
+        kills = np.bincount(self.world[victims], minlength=count)
+        for world, born, killed in zip(self.worlds, births.tolist(), kills.tolist()):
+            world.total_reproductions += born
+            world.total_kills += killed
+
+    def _spawn_food(self):
+        # Same draws as a single world's _spawn_food, from each world's stream
+        width = self.config.world_width
+        height = self.config.world_height
+        for world in self.worlds:
+            needed = world.params["food_count"] - int(self.food.counts[world.index])
+            for _ in range(needed):
+                x = world.rng.spawn.uniform(20, width - 20)
+                y = world.rng.spawn.uniform(20, height - 20)
+                self.food.spawn(x, y, world.index)
+
+    def _rebuild_spatial_index(self):
+        # Nothing is drawn, so there is no viewport index to maintain
+        pass
+
+    def _record_population_data(self):
+        registry = self.species_registry
+        species = len(registry)
+        counts = np.bincount(
+            self.world * species + self.kind, minlength=len(self.worlds) * species
+        ).reshape(len(self.worlds), species)
+        elapsed = self.params["duration"] - self.time_remaining
+        for world, row in zip(self.worlds, counts.tolist()):
+            for name, count in zip(registry.names, row):
+                world.population_history[name].append(count)
+            world.population_history["time"].append(elapsed)
+
+    def population_counts(self) -> Dict[str, int]:
+        # Totals over all worlds
+        totals: Dict[str, int] = {}
+        for world in self.worlds:
+            for name, count in world.population_counts().items():
+                totals[name] = totals.get(name, 0) + count
+        return totals
+
+    def get_statistics(self) -> List[Dict[str, Any]]:
+        return [world.get_statistics() for world in self.worlds]
+
+    def ensemble_statistics(self) -> Dict[str, Dict[str, float]]:
+        # Mean and standard deviation across worlds of the final population
+        # of each species and of the food
+        counts = [world.population_counts() for world in self.worlds]
+        return {
+            name: {
+                "mean": float(np.mean([row[name] for row in counts])),
+                "std": float(np.std([row[name] for row in counts])),
+            }
+            for name in counts[0]
+        }
@@ -0,0 +1,184 @@
+import numpy as np
+from typing import Optional, Tuple
+
+from .spatial import SpatialGrid
+
+
+def wrapped_delta(delta: np.ndarray, size: float) -> np.ndarray:
+    # Shortest signed offset on a ring of length `size`
+    return (delta + size / 2) % size - size / 2
+
+
+def heading_vectors(directions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return np.cos(directions), np.sin(directions)
+
+
+def nearest_visible(
+    observer_x: np.ndarray,
+    observer_y: np.ndarray,
+    heading_x: np.ndarray,
+    heading_y: np.ndarray,
+    ranges: np.ndarray,
+    cos_half_cone: float,
+    target_x: np.ndarray,
+    target_y: np.ndarray,
+    pair_observers: np.ndarray,
+    pair_targets: np.ndarray,
+    world_width: float,
+    world_height: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Evaluates candidate (observer, target) pairs in one pass: wrapped
+    # distance, range check and, when cos_half_cone > -1, the vision cone as a
+    # dot product against the heading. Returns per observer the index of the
+    # nearest visible target (-1 if none) and its distance. Ties go to the
+    # lowest target index, like min() over the entity list.
+    nearest = np.full(len(observer_x), -1, dtype=np.intp)
+    distance = np.full(len(observer_x), np.inf)
+    if len(pair_observers) == 0:
+        return nearest, distance
+
+    dx = wrapped_delta(target_x[pair_targets] - observer_x[pair_observers], world_width)
+    dy = wrapped_delta(
+        target_y[pair_targets] - observer_y[pair_observers], world_height
+    )
+    distance_sq = dx * dx + dy * dy
+
+    pair_ranges = ranges[pair_observers]
+    visible = distance_sq <= pair_ranges * pair_ranges
+
+    if cos_half_cone > -1.0:
+        dot = dx * heading_x[pair_observers] + dy * heading_y[pair_observers]
+        visible &= dot >= cos_half_cone * np.sqrt(distance_sq)
+
+    observers = pair_observers[visible]
+    targets = pair_targets[visible]
+    distance_sq = distance_sq[visible]
+    if len(observers) == 0:
+        return nearest, distance
+
+    # Sort by observer, then distance, then target index; keep the first per observer
+    order = np.lexsort((targets, distance_sq, observers))
+    observers = observers[order]
+    first = np.ones(len(observers), dtype=bool)
+    first[1:] = observers[1:] != observers[:-1]
+
+    nearest[observers[first]] = targets[order][first]
+    distance[observers[first]] = np.sqrt(distance_sq[order][first])
+    return nearest, distance
+
+
+def perceive(
+    observer_x: np.ndarray,
+    observer_y: np.ndarray,
+    directions: Optional[np.ndarray],
+    ranges: np.ndarray,
+    cos_half_cone: float,
+    target_x: np.ndarray,
+    target_y: np.ndarray,
+    world_width: float,
+    world_height: float,
+    same_population: bool = False,
+    grid: Optional[SpatialGrid] = None,
+    target_mask: Optional[np.ndarray] = None,
+    excluded_targets: Optional[np.ndarray] = None,
+    observer_layers: Optional[np.ndarray] = None,
+    target_layers: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Nearest visible target per observer. Candidate pairs come from a grid
+    # over the targets sized to the largest range, so the cost grows with the
+    # number of nearby pairs instead of observers x targets. With
+    # same_population the observers are the targets and never see themselves.
+    # A prebuilt grid over the targets can be passed in, and target_mask
+    # excludes targets that are indexed but currently unavailable.
+    # excluded_targets gives per observer one target index it must not see
+    # (-1 for none), for observers that are a subset of the targets.
+    # Observer and target layers keep independent worlds apart (a prebuilt
+    # grid must then be layered the same way).
+    count = len(observer_x)
+    if count == 0 or len(target_x) == 0:
+        return np.full(count, -1, dtype=np.intp), np.full(count, np.inf)
+
+    max_range = max(float(ranges.max()), 1.0)
+    if grid is None:
+        layers = 1
+        if target_layers is not None:
+            layers = int(max(target_layers.max(), observer_layers.max())) + 1
+        grid = SpatialGrid(world_width, world_height, max_range, layers)
+        grid.build(target_x, target_y, target_layers)
+    pair_observers, pair_targets = grid.query_pairs(
+        observer_x, observer_y, max_range, observer_layers
+    )
+
+    if target_mask is not None:
+        kept = target_mask[pair_targets]
+        pair_observers = pair_observers[kept]
+        pair_targets = pair_targets[kept]
+
+    if same_population:
+        distinct = pair_observers != pair_targets
+        pair_observers = pair_observers[distinct]
+        pair_targets = pair_targets[distinct]
+
+    if excluded_targets is not None:
+        distinct = pair_targets != excluded_targets[pair_observers]
+        pair_observers = pair_observers[distinct]
+        pair_targets = pair_targets[distinct]
+
+    if directions is None:
+        heading_x = heading_y = np.zeros(count)
+    else:
+        heading_x, heading_y = heading_vectors(directions)
+
+    return nearest_visible(
+        observer_x,
+        observer_y,
+        heading_x,
+        heading_y,
+        ranges,
+        cos_half_cone,
+        target_x,
+        target_y,
+        pair_observers,
+        pair_targets,
+        world_width,
+        world_height,
+    )
+
+
+def nearest_among(
+    observers: np.ndarray,
+    candidates: np.ndarray,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    directions: np.ndarray,
+    ranges: np.ndarray,
+    cos_half_cone: float,
+    world_width: float,
+    world_height: float,
+    exclude_self: bool = False,
+    layers: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    # Nearest visible candidate per observer, where both are index arrays
+    # into one population's xs/ys; returns population indices (-1 if none).
+    # With exclude_self the observers are among the candidates (both sorted)
+    # and never see themselves. Per-member layers separate stacked worlds.
+    if len(observers) == 0 or len(candidates) == 0:
+        return np.full(len(observers), -1, dtype=np.intp)
+
+    excluded = np.searchsorted(candidates, observers) if exclude_self else None
+
+    nearest, _ = perceive(
+        xs[observers],
+        ys[observers],
+        directions[observers],
+        ranges[observers],
+        cos_half_cone,
+        xs[candidates],
+        ys[candidates],
+        world_width,
+        world_height,
+        excluded_targets=excluded,
+        observer_layers=None if layers is None else layers[observers],
+        target_layers=None if layers is None else layers[candidates],
+    )
+    return np.where(nearest >= 0, candidates[nearest], -1)
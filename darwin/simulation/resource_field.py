@@ -0,0 +1,106 @@
+import math
+import numpy as np
+from typing import Tuple
+
+from darwin import config as c
+
+
+class ResourceField:
+    # Food as a density grid over the toroidal world instead of discrete items.
+    # Each tick every cell regrows towards capacity (and optionally diffuses
+    # into its neighbours) in one vectorized step, so the cost depends on the
+    # grid resolution rather than on how much food there is.
+
+    def __init__(self, config: c.SimulationConfig, terrain=None):
+        self.config = config
+        self.cols = max(
+            1, int(math.ceil(config.world_width / config.resource_cell_size))
+        )
+        self.rows = max(
+            1, int(math.ceil(config.world_height / config.resource_cell_size))
+        )
+        self.cell_width = config.world_width / self.cols
+        self.cell_height = config.world_height / self.rows
+
+        # Density per cell, indexed [row, col], starting fully grown
+        self.density = np.full((self.rows, self.cols), config.resource_capacity)
+
+        # Per-cell regrowth multiplier from the terrain under each cell center
+        self.regrowth = 1.0
+        if terrain is not None:
+            centers_y = (np.arange(self.rows) + 0.5) * self.cell_height
+            centers_x = (np.arange(self.cols) + 0.5) * self.cell_width
+            self.regrowth = terrain.regrowth_at(centers_x[None, :], centers_y[:, None])
+
+        # Bumped on every change so renderers can tell when their cached
+        # texture is out of date
+        self.version = 0
+
+    def total(self) -> float:
+        return float(self.density.sum())
+
+    def step(self, dt: float):
+        config = self.config
+        density = self.density
+
+        # Regrowth towards capacity
+        regrowth = np.minimum(1.0, config.resource_regrowth_rate * dt * self.regrowth)
+        density += (config.resource_capacity - density) * regrowth
+
+        # Optional diffusion, explicit step kept stable by capping the rate
+        if config.resource_diffusion_rate > 0:
+            rate = min(0.25, config.resource_diffusion_rate * dt)
+            neighbours = (
+                np.roll(density, 1, axis=0)
+                + np.roll(density, -1, axis=0)
+                + np.roll(density, 1, axis=1)
+                + np.roll(density, -1, axis=1)
+            )
+            density += rate * (neighbours - 4 * density)
+
+        self.version += 1
+
+    def cell_of(self, xs, ys) -> Tuple[np.ndarray, np.ndarray]:
+        row = (np.floor_divide(ys, self.cell_height)).astype(np.intp) % self.rows
+        col = (np.floor_divide(xs, self.cell_width)).astype(np.intp) % self.cols
+        return row, col
+
+    def sample(self, xs, ys) -> np.ndarray:
+        # Density under each point, positions wrap around the world
+        row, col = self.cell_of(
+            np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+        )
+        return self.density[row, col]
+
+    def gradient(self, x: float, y: float, reach: float) -> Tuple[float, float]:
+        # Central difference of the density sampled `reach` away on each axis
+        samples = self.sample(
+            [x + reach, x - reach, x, x], [y, y, y + reach, y - reach]
+        ).tolist()
+        return samples[0] - samples[1], samples[2] - samples[3]
+
+    def graze(self, x: float, y: float, amount: float) -> float:
+        # Remove up to `amount` from the cell under (x, y), returns what was eaten
+        row, col = self.cell_of(x, y)
+        eaten = min(amount, float(self.density[row, col]))
+        self.density[row, col] -= eaten
+        self.version += 1
+        return eaten
+
+    def graze_many(self, xs: np.ndarray, ys: np.ndarray, amount: float) -> np.ndarray:
+        # Vectorized graze for many grazers at once. Grazers sharing a cell
+        # split what it holds in proportion to their demand.
+        if len(xs) == 0:
+            return np.zeros(0)
+
+        row, col = self.cell_of(xs, ys)
+        cells = row * self.cols + col
+        demand = np.bincount(cells, minlength=self.rows * self.cols) * amount
+
+        density = self.density.reshape(-1)
+        share = np.minimum(1.0, density / np.maximum(demand, 1e-12))
+        eaten = amount * share[cells]
+        density -= np.bincount(cells, eaten, minlength=density.size)
+        np.maximum(density, 0.0, out=density)
+        self.version += 1
+        return eaten
@@ -0,0 +1,110 @@
+import random
+import numpy as np
+from typing import List, Tuple, Union
+
+DEFAULT_BLOCK_SIZE = 4096
+
+
+class RandomStream:
+    # Hands out numbers pre-drawn in blocks from a NumPy Generator. Exposes the
+    # subset of the `random` module API used by entities and genetics, so the
+    # module itself can still be passed wherever a stream is expected.
+
+    def __init__(
+        self, generator: np.random.Generator, block_size: int = DEFAULT_BLOCK_SIZE
+    ):
+        self.generator = generator
+        self.block_size = block_size
+        self._uniforms: List[float] = []
+        self._uniform_index = 0
+        self._normals: List[float] = []
+        self._normal_index = 0
+
+    def reserve(self, uniforms: int = 0, normals: int = 0):
+        # Pre-draw enough numbers for the coming tick in one call per kind
+        missing = uniforms - (len(self._uniforms) - self._uniform_index)
+        if missing > 0:
+            self._refill_uniforms(max(missing, self.block_size))
+        missing = normals - (len(self._normals) - self._normal_index)
+        if missing > 0:
+            self._refill_normals(max(missing, self.block_size))
+
+    def _refill_uniforms(self, count: int):
+        remaining = self._uniforms[self._uniform_index :]
+        self._uniforms = remaining + self.generator.random(count).tolist()
+        self._uniform_index = 0
+
+    def _refill_normals(self, count: int):
+        remaining = self._normals[self._normal_index :]
+        self._normals = remaining + self.generator.standard_normal(count).tolist()
+        self._normal_index = 0
+
+    def random(self) -> float:
+        if self._uniform_index >= len(self._uniforms):
+            self._refill_uniforms(self.block_size)
+        value = self._uniforms[self._uniform_index]
+        self._uniform_index += 1
+        return value
+
+    def uniform(self, a: float, b: float) -> float:
+        return a + (b - a) * self.random()
+
+    def gauss(self, mu: float = 0.0, sigma: float = 1.0) -> float:
+        if self._normal_index >= len(self._normals):
+            self._refill_normals(self.block_size)
+        value = self._normals[self._normal_index]
+        self._normal_index += 1
+        return mu + sigma * value
+
+
+# A recorded seed: the root entropy, or (entropy, spawn key) for stream sets
+# spawned from another one
+Seed = Union[int, Tuple[int, Tuple[int, ...]]]
+
+
+class RandomStreams:
+    # Independent per-subsystem streams derived from one seed, so a subsystem
+    # drawing more or fewer numbers never shifts the draws of the others
+    SUBSYSTEMS = ("spawn", "behavior", "collision", "genetics")
+
+    def __init__(
+        self,
+        seed: Union[None, Seed, np.random.SeedSequence] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        elif isinstance(seed, tuple):
+            entropy, spawn_key = seed
+            self.seed_sequence = np.random.SeedSequence(entropy, spawn_key=spawn_key)
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        # Spawned sets share their parent's entropy, so their spawn key is
+        # recorded with it; passing the recorded seed back rebuilds the set
+        spawn_key = tuple(self.seed_sequence.spawn_key)
+        self.seed: Seed = self.seed_sequence.entropy
+        if spawn_key:
+            self.seed = (self.seed, spawn_key)
+        self.block_size = block_size
+
+        children = self.seed_sequence.spawn(len(self.SUBSYSTEMS))
+        for name, child in zip(self.SUBSYSTEMS, children):
+            generator = np.random.Generator(np.random.PCG64(child))
+            setattr(self, name, RandomStream(generator, block_size))
+
+    def spawn_streams(self, count: int) -> List["RandomStreams"]:
+        # Independent stream sets for parallel runs, reproducible from this seed
+        # (not named spawn, which is the spawn subsystem's stream)
+        return [
+            RandomStreams(child, self.block_size)
+            for child in self.seed_sequence.spawn(count)
+        ]
+
+
+class ModuleStreams:
+    # Fallback for entities created outside a Simulation: every subsystem
+    # draws from the global `random` module, as before streams existed
+    spawn = random
+    behavior = random
+    collision = random
+    genetics = random
@@ -0,0 +1,169 @@
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from darwin import config as c
+
+# Params that do not change what a run computes
+NON_RUN_PARAMS = ("show_vision", "event_log", "lineage_file", "config")
+# Params naming files a run writes, which a cached result cannot provide
+OUTPUT_PARAMS = ("event_log", "lineage_file")
+
+MAGIC = b"DRWNRC01"
+DIGEST_SIZE = 32
+
+
+def _canonical(value: Any) -> Any:
+    # JSON-ready form with a single spelling for equal values
+    if dataclasses.is_dataclass(value):
+        return _canonical(dataclasses.asdict(value))
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if hasattr(value, "item"):  # numpy scalars
+        return value.item()
+    return value
+
+
+@lru_cache(maxsize=1)
+def code_version() -> str:
+    # Hash of the package sources, so changed code never reuses old results
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for folder, dirs, files in sorted(os.walk(root)):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(folder, name)
+                digest.update(os.path.relpath(path, root).encode())
+                with open(path, "rb") as source:
+                    digest.update(source.read())
+    return digest.hexdigest()
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as stream:
+            return hashlib.sha256(stream.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def run_key(
+    params: Dict[str, Any], config: Optional[c.SimulationConfig] = None
+) -> Optional[str]:
+    # Stable hash of the full run spec: params, config, seed and code
+    # version, plus the contents of a terrain image, which the config only
+    # names. Unseeded runs are random and get no key, nor do runs whose
+    # terrain image cannot be read here.
+    if params.get("seed") is None:
+        return None
+    if config is None:
+        config = c.SimulationConfig.from_overrides(params.get("config"))
+    spec = {
+        "params": {k: v for k, v in params.items() if k not in NON_RUN_PARAMS},
+        "config": config.overrides(),
+        "code": code_version(),
+    }
+    if config.terrain not in c.TERRAIN_MODES:
+        spec["terrain"] = _file_digest(config.terrain)
+        if spec["terrain"] is None:
+            return None
+    text = json.dumps(_canonical(spec), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def writes_outputs(params: Dict[str, Any]) -> bool:
+    # Such runs must actually run, though their statistics can still be stored
+    return any(params.get(name) for name in OUTPUT_PARAMS)
+
+
+class RunCache:
+    # Results of headless runs on disk, one file per run key holding a
+    # checksum and the pickled statistics. Reads refresh an entry's time;
+    # writes evict the least recently used entries beyond max_bytes. A
+    # damaged entry is dropped and counts as a miss. Processes may share a
+    # directory, so an entry can vanish at any point through another's
+    # eviction.
+
+    def __init__(
+        self, directory: str = c.RUN_CACHE_DIR, max_bytes: int = c.RUN_CACHE_MAX_BYTES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".run")
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as stream:
+                data = stream.read()
+        except FileNotFoundError:
+            return None
+
+        header = len(MAGIC) + DIGEST_SIZE
+        payload = data[header:]
+        digest = data[len(MAGIC) : header]
+        if data[: len(MAGIC)] != MAGIC or hashlib.sha256(payload).digest() != digest:
+            _remove(path)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted since it was read; the data read is still whole
+            pass
+        return pickle.loads(payload)
+
+    def put(self, key: Optional[str], statistics: Dict[str, Any]):
+        if key is None:
+            return
+        payload = pickle.dumps(statistics, protocol=pickle.HIGHEST_PROTOCOL)
+        # Written next to the entry and renamed, so readers never see half
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(MAGIC + hashlib.sha256(payload).digest() + payload)
+        os.replace(temporary, self._path(key))
+        self.evict()
+
+    def evict(self):
+        # Oldest entries go first until the cache fits its size bound
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".run"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            total -= size
+            _remove(path)
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".run"):
+                _remove(entry.path)
+
+
+def _remove(path: str):
+    # Entries removed by another process meanwhile are already gone
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,254 @@
+import argparse
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, fields, replace
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from darwin import config as c
+from .engines import DEFAULT_ENGINE, ENGINES
+from .environment import default_params
+from .run_cache import RunCache
+from .sweep import run_headless
+
+# Ranges searched by default: the menu limits of the starting populations
+DEFAULT_SPACE = {
+    "prey_count": (c.MIN_PREY_COUNT, c.MAX_PREY_COUNT),
+    "predator_count": (c.MIN_PREDATOR_COUNT, c.MAX_PREDATOR_COUNT),
+    "food_count": (c.MIN_FOOD_COUNT, c.MAX_FOOD_COUNT),
+}
+
+# Numeric config fields; other names in a search space are params
+CONFIG_FIELDS = {
+    f.name for f in fields(c.SimulationConfig) if f.init and f.type in (int, float)
+}
+
+
+# Config fields read only in some modes, with the test for their mode
+MODE_FIELDS: Dict[str, Callable[[c.SimulationConfig], bool]] = {
+    **{
+        name: lambda config: config.food_mode == "field"
+        for name in (
+            "resource_cell_size",
+            "resource_capacity",
+            "resource_regrowth_rate",
+            "resource_diffusion_rate",
+            "grazing_rate",
+        )
+    },
+    "terrain_cell_size": lambda config: config.terrain != "none",
+    "neural_hidden_units": lambda config: config.behavior == "neural",
+    "neural_mutation_scale": lambda config: config.behavior == "neural",
+}
+
+
+@dataclass
+class Trial:
+    # One candidate at one rung: its values, the duration it ran for and the
+    # mean score over the seeds
+    values: Dict[str, Any]
+    duration: int
+    score: float = 0.0
+    stop_reasons: List[Optional[str]] = field(default_factory=list)
+
+
+def balance_score(statistics: Dict[str, Any]) -> float:
+    # Below 1 for runs that collapsed (the fraction of the duration they
+    # lasted), else 1 plus how close the smallest population stayed to its
+    # starting size
+    params = statistics["simulation_params"]
+    history = statistics["population_history"]
+    elapsed = history["time"][-1]
+    final = statistics["final_populations"]
+
+    ratios = []
+    for spec in statistics["species"]:
+        initial = params.get(f"{spec.key}_count", 0)
+        if initial > 0:
+            ratios.append(
+                min(final[spec.name], initial) / max(final[spec.name], initial)
+            )
+    collapsed = statistics.get("stop_reason") in ("extinction", "runaway")
+    if collapsed or min(ratios, default=1) == 0:
+        return elapsed / params["duration"]
+    return 1 + min(ratios, default=1)
+
+
+def propose(
+    space: Dict[str, Tuple[float, float]], count: int, generator: np.random.Generator
+) -> List[Dict[str, Any]]:
+    # Uniform random candidates; ranges with integer bounds give integers
+    candidates = []
+    for _ in range(count):
+        values = {}
+        for name, (low, high) in space.items():
+            if isinstance(low, int) and isinstance(high, int):
+                values[name] = int(generator.integers(low, high + 1))
+            else:
+                values[name] = float(generator.uniform(low, high))
+        candidates.append(values)
+    return candidates
+
+
+def run_params(
+    base: Dict[str, Any], values: Dict[str, Any], duration: int, seed: int
+) -> Dict[str, Any]:
+    # Config field names go to the config overrides, the rest to params
+    overrides = dict(base.get("config") or {})
+    params = dict(base, duration=duration, seed=seed, early_stop=True)
+    for name, value in values.items():
+        if name in CONFIG_FIELDS:
+            overrides[name] = value
+        else:
+            params[name] = value
+    if overrides:
+        params["config"] = overrides
+    return params
+
+
+def check_space(base: Dict[str, Any], space: Dict[str, Tuple[float, float]]):
+    # Rejects ranges no run would read: params other than the starting
+    # counts, config fields of another mode, and config values the base
+    # engine does not support
+    config = c.SimulationConfig.from_overrides(base.get("config"))
+    counts = {f"{spec.key}_count" for spec in config.defined_species}
+    counts.add("food_count")
+    unknown = [name for name in space if name not in counts | CONFIG_FIELDS]
+    if unknown:
+        raise ValueError(f"Cannot search {', '.join(unknown)}")
+    unused = [
+        name for name in space if name in MODE_FIELDS and not MODE_FIELDS[name](config)
+    ]
+    if unused:
+        raise ValueError(
+            f"{', '.join(unused)} unused in this food, terrain or behavior mode"
+        )
+    engine = ENGINES[base.get("engine", DEFAULT_ENGINE)]
+    for bound in (0, 1):
+        overrides = {
+            name: limits[bound]
+            for name, limits in space.items()
+            if name in CONFIG_FIELDS
+        }
+        engine.check_support(replace(config, **overrides))
+
+
+def rung_durations(min_duration: int, max_duration: int, eta: int) -> List[int]:
+    # Durations grow by eta per rung, the last one being the full duration
+    durations = [min_duration]
+    while durations[-1] < max_duration:
+        durations.append(min(durations[-1] * eta, max_duration))
+    return durations
+
+
+def search(
+    base: Dict[str, Any],
+    space: Optional[Dict[str, Tuple[float, float]]] = None,
+    candidates: int = 27,
+    eta: int = 3,
+    min_duration: int = c.MIN_SIMULATION_DURATION,
+    max_duration: int = c.DEFAULT_SIMULATION_DURATION,
+    seeds: Sequence[int] = (0,),
+    workers: Optional[int] = None,
+    cache: Optional[RunCache] = None,
+    seed: Optional[int] = None,
+) -> List[Trial]:
+    # Random search with successive halving: every candidate runs for the
+    # shortest duration, the best 1/eta go on to eta times longer runs, up to
+    # the full duration. Runs stop early on extinction, runaway growth or a
+    # steady state, so hopeless candidates cost little. Returns the trials of
+    # the last rung, best first.
+    if eta < 2:
+        raise ValueError("Successive halving needs eta of at least 2")
+    space = space or DEFAULT_SPACE
+    check_space(base, space)
+    generator = np.random.default_rng(seed)
+    trials = [Trial(values, 0) for values in propose(space, candidates, generator)]
+    run = partial(run_headless, cache=cache)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for rung, duration in enumerate(
+            rung_durations(min_duration, max_duration, eta)
+        ):
+            if rung > 0:
+                keep = max(1, math.ceil(len(trials) / eta))
+                trials = [Trial(trial.values, 0) for trial in trials[:keep]]
+            runs = [
+                run_params(base, trial.values, duration, run_seed)
+                for trial in trials
+                for run_seed in seeds
+            ]
+            results = iter(executor.map(run, runs))
+            for trial in trials:
+                trial.duration = duration
+                statistics = [next(results) for _ in seeds]
+                trial.score = float(np.mean([balance_score(s) for s in statistics]))
+                trial.stop_reasons = [s["stop_reason"] for s in statistics]
+            trials.sort(key=lambda trial: trial.score, reverse=True)
+    return trials
+
+
+def _range_entry(text: str):
+    # "name=low,high"; integer bounds search integers
+    name, _, bounds = text.partition("=")
+    low, high = (float(v) if "." in v else int(v) for v in bounds.split(","))
+    return name, (low, high)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Search for balanced ecosystems with successive halving"
+    )
+    parser.add_argument("--engine", choices=list(ENGINES), default="vectorized")
+    parser.add_argument(
+        "--range",
+        type=_range_entry,
+        action="append",
+        default=[],
+        metavar="NAME=LOW,HIGH",
+        help="param or config range to search (default: starting populations)",
+    )
+    parser.add_argument("--candidates", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--min-duration", type=int, default=c.MIN_SIMULATION_DURATION)
+    parser.add_argument(
+        "--max-duration", type=int, default=c.DEFAULT_SIMULATION_DURATION
+    )
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, help="seed of the candidate proposals")
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--cache-dir", default=c.RUN_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    base = dict(default_params(), engine=args.engine)
+    space = dict(args.range) or DEFAULT_SPACE
+    try:
+        check_space(base, space)
+    except ValueError as error:
+        parser.error(str(error))
+    trials = search(
+        base,
+        space=space,
+        candidates=args.candidates,
+        eta=args.eta,
+        min_duration=args.min_duration,
+        max_duration=args.max_duration,
+        seeds=args.seeds,
+        workers=args.workers,
+        cache=None if args.no_cache else RunCache(args.cache_dir),
+        seed=args.seed,
+    )
+    for trial in trials[: args.top]:
+        print(
+            f"{trial.score:.3f} {trial.values} ({trial.duration}s, {trial.stop_reasons})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,73 +1,205 @@
-import random
+import bisect
 import time
-from typing import List, Dict, Any
+import numpy as np
+from dataclasses import replace
+from typing import List, Dict, Any, Optional
 
 from ..entities import Predator, Prey, Food, Entity
+from ..genetics import PredatorGenome, PreyGenome, SpeciesRegistry
+from . import events, lineage
+from .events import EventLog
+from .food_store import FoodStore
+from .resource_field import ResourceField
+from .rng import RandomStreams
+from .terrain import create_terrain
+from .spatial import SpatialGrid
 from darwin import config as c
 
+# Config fields fixed for the lifetime of a run
+FIXED_CONFIG_FIELDS = (
+    "world_width",
+    "world_height",
+    "spatial_cell_size",
+    "food_mode",
+    "resource_cell_size",
+    "terrain",
+    "terrain_cell_size",
+    "species",
+    "behavior",
+    "neural_hidden_units",
+)
 
-class Simulation:
 
-    def __init__(self, params: Dict[str, Any]):
+class Simulation:
+    # Agents reproduce on contact during their own update unless an engine
+    # pairs them in a separate mating stage
+    mating_stage = False
+    # Object engines implement the default species as Entity subclasses;
+    # engines that work from the species registry alone accept any species
+    generic_species = False
+    # Behavior modes (config.behavior) the engine implements
+    behaviors = ("rules",)
+    # Engines that cache targets for config.perception_interval ticks; the
+    # others perceive every tick and reject a longer interval
+    cached_perception = True
+
+    def __init__(
+        self, params: Dict[str, Any], config: Optional[c.SimulationConfig] = None
+    ):
         self.params = params
+        # Per-run constants: explicit config, else defaults plus params overrides
+        if config is None:
+            config = c.SimulationConfig.from_overrides(params.get("config"))
+        self.config = config
+        self.species_registry = SpeciesRegistry(config.defined_species)
+        self.check_support(config)
+
+        # Per-run random streams; without a seed one is drawn and recorded
+        self.rng = RandomStreams(params.get("seed"))
+        self.seed = self.rng.seed
         self.entities: List[Entity] = []
+        self.tick = 0
+        self._entity_count = 0
+        self.food = FoodStore(config, max(1, params["food_count"]))
+        # Optional biome raster with per-cell movement, energy and food modifiers
+        self.terrain = create_terrain(config, self.rng.spawn.generator)
+        # In "field" food mode prey graze a density grid instead of Food items
+        self.resources = (
+            ResourceField(config, self.terrain) if config.food_mode == "field" else None
+        )
         self.time_remaining = params["duration"]
         self.speed = params["speed"]
         self.show_vision = params["show_vision"]
         self.start_time = time.time()
 
         self.total_reproductions = 0
-        self.population_history = {"predators": [], "prey": [], "time": []}
+        self.total_kills = 0
+        self.population_history = {name: [] for name in self.species_registry.names}
+        self.population_history["time"] = []
+        # Why the run ended before its duration ("extinction", "runaway" or
+        # "steady"); only set when params["early_stop"] is on
+        self.stop_reason: Optional[str] = None
+
+        # Optional binary record of births, kills, meals and starvation
+        event_path = params.get("event_log")
+        self.events = EventLog(event_path) if event_path else None
+        # Parents, birth and death of every agent by id
+        self.lineage = lineage.LineageStore(len(self.species_registry.genes))
 
         # Add simulation stats reference to entities for tracking
         self.simulation_stats = {"total_reproductions": 0}
 
+        # Spatial index over the agents in self.entities, used to cull drawing
+        # to the viewport; food keeps its own index in the food store
+        self.spatial_index = SpatialGrid(
+            config.world_width, config.world_height, config.spatial_cell_size
+        )
+
         # Initialize populations
         self._initialize_populations()
+        self._register_founders()
         self._spawn_food()
+        self._rebuild_spatial_index()
 
         # Record initial population
         self._record_population_data()
 
+    @classmethod
+    def check_support(cls, config: c.SimulationConfig):
+        # Rejects config settings this engine does not implement
+        engine = cls.__name__
+        if not cls.generic_species and config.species is not None:
+            raise ValueError(f"Engine {engine} only supports the default species")
+        if config.behavior not in cls.behaviors:
+            raise ValueError(
+                f"Engine {engine} does not support {config.behavior} behavior"
+            )
+        if not cls.cached_perception and config.perception_interval > 1:
+            raise ValueError(
+                f"Engine {engine} perceives every tick and does not support "
+                "a perception interval"
+            )
+
     def _initialize_populations(self):
+        width = self.config.world_width
+        height = self.config.world_height
+
         # Create predators
         for _ in range(self.params["predator_count"]):
-            x = random.uniform(50, c.SCREEN_WIDTH - 50)
-            y = random.uniform(50, c.SCREEN_HEIGHT - 50)
-            predator = Predator(x, y)
+            x = self.rng.spawn.uniform(50, width - 50)
+            y = self.rng.spawn.uniform(50, height - 50)
+            predator = Predator(x, y, config=self.config, rng=self.rng, world=self)
             self.entities.append(predator)
 
         # Create prey
         for _ in range(self.params["prey_count"]):
-            x = random.uniform(50, c.SCREEN_WIDTH - 50)
-            y = random.uniform(50, c.SCREEN_HEIGHT - 50)
-            prey = Prey(x, y)
+            x = self.rng.spawn.uniform(50, width - 50)
+            y = self.rng.spawn.uniform(50, height - 50)
+            prey = Prey(x, y, config=self.config, rng=self.rng, world=self)
             self.entities.append(prey)
 
-    def _spawn_food(self):
-        current_food = len(
-            [e for e in self.entities if isinstance(e, Food) and e.available]
+    def _register_founders(self):
+        state = self.agent_state()
+        self.lineage.add_births(
+            state["id"], state["kind"], -1, -1, self.tick, state["genes"]
         )
-        food_needed = self.params["food_count"] - current_food
+
+    def _spawn_food(self):
+        if self.resources is not None:
+            return
+
+        # Consumed food slots are recycled by the store
+        food_needed = self.params["food_count"] - len(self.food)
 
         for _ in range(food_needed):
-            x = random.uniform(20, c.SCREEN_WIDTH - 20)
-            y = random.uniform(20, c.SCREEN_HEIGHT - 20)
-            food = Food(x, y)
-            self.entities.append(food)
+            x, y = self._food_position()
+            self.food.spawn(x, y)
 
-    def _record_population_data(self):
-        predator_count = len(
-            [e for e in self.entities if isinstance(e, Predator) and e.alive]
-        )
-        prey_count = len([e for e in self.entities if isinstance(e, Prey) and e.alive])
+    def _food_position(self):
+        # Uniform over the world, or weighted by terrain regrowth via rejection
+        while True:
+            x = self.rng.spawn.uniform(20, self.config.world_width - 20)
+            y = self.rng.spawn.uniform(20, self.config.world_height - 20)
+            if self.terrain is None:
+                return x, y
 
-        self.population_history["predators"].append(predator_count)
-        self.population_history["prey"].append(prey_count)
+            weight = self.terrain.regrowth_at(x, y) / self.terrain.max_regrowth
+            if self.rng.spawn.random() < weight:
+                return x, y
+
+    def _record_population_data(self):
+        for name, count in self._species_counts().items():
+            self.population_history[name].append(count)
         self.population_history["time"].append(
             self.params["duration"] - self.time_remaining
         )
 
+    def _detect_stop(self, steady: bool) -> Optional[str]:
+        # Headless searches stop runs whose outcome is already clear: a
+        # species died out or exploded, or (checked when `steady`) every
+        # population stayed within the tolerance over the last window
+        counts = self._species_counts()
+        for spec in self.species_registry.species:
+            initial = self.params.get(f"{spec.key}_count", 0)
+            count = counts[spec.name]
+            if initial > 0 and count == 0:
+                return "extinction"
+            if count > c.RUNAWAY_POPULATION_FACTOR * max(initial, 1):
+                return "runaway"
+
+        history = self.population_history
+        times = history["time"]
+        if not steady or times[-1] - times[0] < c.STEADY_STATE_WINDOW:
+            return None
+        start = bisect.bisect_left(times, times[-1] - c.STEADY_STATE_WINDOW)
+        for name in self.species_registry.names:
+            window = history[name][start:]
+            spread = max(window) - min(window)
+            # A wobble of one agent never breaks a steady state
+            if spread > max(c.STEADY_STATE_TOLERANCE * sum(window) / len(window), 1):
+                return None
+        return "steady"
+
     def update(self, dt: float):
         # Adjust dt by simulation speed
         dt *= self.speed
@@ -75,19 +207,37 @@ class Simulation:
         # Update timer
         self.time_remaining -= dt
 
+        # Regrow the resource field
+        if self.resources is not None:
+            self.resources.step(dt)
+
+        self._step_agents(dt)
+
+        # Maintain food supply
+        self._spawn_food()
+        self._rebuild_spatial_index()
+
+        self.tick += 1
+
+        if self.params.get("early_stop"):
+            # Collapse is checked every tick, a steady state once a second
+            second = int(self.time_remaining) != int(self.time_remaining + dt)
+            self.stop_reason = self._detect_stop(second)
+
+        # Record population data periodically, and where a run stops early
+        if int(self.time_remaining) % 5 == 0 or self.stop_reason is not None:
+            self._record_population_data()
+
+    def _step_agents(self, dt: float):
+        # One tick for every agent, with births, kills and removal of the dead
         # Count entities before update
         initial_count = len(self.entities)
 
+        # Pre-draw this tick's random numbers in one call per stream
+        self.rng.behavior.reserve(uniforms=2 * initial_count)
+
         # Update all entities
-        for entity in self.entities[
-            :
-        ]:  # Use slice to avoid modification during iteration
-            if isinstance(entity, Food):
-                if entity.available:
-                    entity.update(dt, self.entities)
-            else:
-                if entity.alive:
-                    entity.update(dt, self.entities)
+        self._update_entities(dt)
 
         # Count reproductions based on entity count increase
         final_count = len(self.entities)
@@ -95,20 +245,196 @@ class Simulation:
             new_births = final_count - initial_count
             self.total_reproductions += new_births
 
-        # Remove dead entities
-        self.entities = [
-            e
-            for e in self.entities
-            if (isinstance(e, Food) and e.available)
-            or (not isinstance(e, Food) and e.alive)
+        # Count prey killed by predators this tick
+        self.total_kills += len(
+            [
+                e
+                for e in self.entities
+                if isinstance(e, Prey)
+                and not e.alive
+                and e.damage_taken >= e.genome.attack_resistance
+            ]
+        )
+
+        # Remove dead entities; out of energy means starved, else killed
+        dead = [e for e in self.entities if not e.alive]
+        if dead:
+            self.lineage.add_deaths(
+                [e.id for e in dead],
+                self.tick,
+                [lineage.STARVED if e.energy <= 0 else lineage.KILLED for e in dead],
+            )
+        self.entities = [e for e in self.entities if e.alive]
+
+    def _update_entities(self, dt: float):
+        for entity in self.entities[
+            :
+        ]:  # Use slice to avoid modification during iteration
+            if entity.alive:
+                entity.update(dt, self.entities)
+
+    def record_event(self, event: int, actor, target, x: float, y: float):
+        if self.events is not None:
+            self.events.record(self.tick, event, actor, target, x, y)
+
+    def record_birth(self, child: Entity, parent: Entity, mate: Entity):
+        genes = [
+            getattr(child.genome, gene.name, gene.low)
+            for gene in self.species_registry.genes
         ]
+        self.lineage.add_births(
+            [child.id],
+            [self.species_registry.index[child.species]],
+            [parent.id],
+            [mate.id],
+            self.tick,
+            [genes],
+        )
+        self.record_event(events.BIRTH, parent.id, child.id, child.x, child.y)
+
+    def record_events(
+        self,
+        event: int,
+        actors: np.ndarray,
+        targets: np.ndarray,
+        xs: np.ndarray,
+        ys: np.ndarray,
+    ):
+        if self.events is not None:
+            self.events.record_many(self.tick, event, actors, targets, xs, ys)
+
+    def close(self):
+        # Flush and close the event log and write the lineage file when
+        # params ask for them; the run can still be inspected
+        if self.events is not None:
+            self.events.close()
+        lineage_path = self.params.get("lineage_file")
+        if lineage_path:
+            self.lineage.save(lineage_path)
+
+    def reseed(self, seed: Optional[int] = None):
+        # Continue from here with fresh random streams (drawn when no seed)
+        self.rng = RandomStreams(seed)
+        self.seed = self.rng.seed
+        for entity in self.entities:
+            entity.rng = self.rng
+
+    def reconfigure(self, **overrides):
+        # Change per-run constants mid-run, e.g. the mutation rate; fields
+        # that shape the world's layout or species cannot change
+        for name in FIXED_CONFIG_FIELDS:
+            if name in overrides and overrides[name] != getattr(self.config, name):
+                raise ValueError(f"{name} cannot change during a run")
+        self.config = replace(self.config, **overrides)
+        for entity in self.entities:
+            entity.config = self.config
+        self.food.config = self.config
+        for food in self.food.slots:
+            food.config = self.config
+            food.energy_value = self.config.eating_energy_gain
+        if self.resources is not None:
+            self.resources.config = self.config
+
+    def introduce(self, species: str, count: int):
+        # New founders of a species at random positions, from the spawn stream
+        width = self.config.world_width
+        height = self.config.world_height
+        cls = {Predator.species: Predator, Prey.species: Prey}[species]
+        added = []
+        for _ in range(count):
+            x = self.rng.spawn.uniform(50, width - 50)
+            y = self.rng.spawn.uniform(50, height - 50)
+            added.append(cls(x, y, config=self.config, rng=self.rng, world=self))
+        self.entities.extend(added)
+        genes = self.species_registry.genes
+        self.lineage.add_births(
+            [e.id for e in added],
+            np.full(count, self.species_registry.index[species]),
+            -1,
+            -1,
+            self.tick,
+            [[getattr(e.genome, gene.name, gene.low) for gene in genes] for e in added],
+        )
+        self._rebuild_spatial_index()
+
+    def _migrants(self, kinds: np.ndarray, count: int) -> np.ndarray:
+        # Up to `count` random agents of every species, by index into kinds
+        generator = self.rng.spawn.generator
+        chosen = [np.zeros(0, dtype=np.intp)]
+        for kind in range(len(self.species_registry)):
+            members = np.flatnonzero(kinds == kind)
+            picked = min(count, len(members))
+            chosen.append(generator.choice(members, picked, replace=False))
+        return np.sort(np.concatenate(chosen)).astype(np.intp)
+
+    def emigrate(self, count: int) -> Dict[str, np.ndarray]:
+        # Takes up to `count` random agents of every species out of the world
+        # for island migration: their kind, genes, energy and weights
+        living = self._living()
+        chosen = self._migrants(self.agent_species(), count)
+        leaving = [living[i] for i in chosen]
+        migrants = {
+            "kind": self.agent_species()[chosen],
+            "genes": self.agent_genes()[chosen],
+            "energy": np.array([e.energy for e in leaving], dtype=float),
+            "max_energy": np.array([e.max_energy for e in leaving], dtype=float),
+            "weights": np.zeros((len(leaving), 0)),
+        }
+        for entity in leaving:
+            entity.alive = False
+        self.lineage.add_deaths([e.id for e in leaving], self.tick, lineage.EMIGRATED)
+        self.entities = [e for e in self.entities if e.alive]
+        self._rebuild_spatial_index()
+        return migrants
+
+    def immigrate(self, migrants: Dict[str, np.ndarray]):
+        # Migrants from emigrate() on another island land at random positions
+        # with their genes and energy; the lineage records them as founders
+        registry = self.species_registry
+        types = {
+            Predator.species: (Predator, PredatorGenome),
+            Prey.species: (Prey, PreyGenome),
+        }
+        added = []
+        for kind, genes, energy, max_energy in zip(
+            migrants["kind"],
+            migrants["genes"],
+            migrants["energy"],
+            migrants["max_energy"],
+        ):
+            spec = registry.species[kind]
+            cls, genome_type = types[spec.name]
+            genome = genome_type(
+                **{gene: float(genes[registry.column(gene)]) for gene in spec.genes}
+            )
+            x = self.rng.spawn.uniform(50, self.config.world_width - 50)
+            y = self.rng.spawn.uniform(50, self.config.world_height - 50)
+            entity = cls(x, y, genome, config=self.config, rng=self.rng, world=self)
+            entity.energy = float(energy)
+            entity.max_energy = float(max_energy)
+            added.append(entity)
+        self.entities.extend(added)
+        self.lineage.add_births(
+            [e.id for e in added],
+            migrants["kind"],
+            -1,
+            -1,
+            self.tick,
+            migrants["genes"],
+        )
+        self._rebuild_spatial_index()
 
-        # Maintain food supply
-        self._spawn_food()
+    def next_entity_id(self) -> int:
+        self._entity_count += 1
+        return self._entity_count - 1
 
-        # Record population data periodically
-        if int(self.time_remaining) % 5 == 0:  # Every 5 seconds
-            self._record_population_data()
+    def perception_due(self, entity: Entity) -> bool:
+        # Whether the entity runs full target selection this tick
+        interval = self.config.perception_interval
+        if interval <= 1:
+            return True
+        phase = entity.id if self.config.perception_stagger else 0
+        return (self.tick + phase) % interval == 0
 
     def increase_speed(self):
         self.speed = min(c.MAX_SIMULATION_SPEED, self.speed + 1)
@@ -117,90 +443,140 @@ class Simulation:
         self.speed = max(c.MIN_SIMULATION_SPEED, self.speed - 1)
 
     def is_finished(self) -> bool:
-        return self.time_remaining <= 0
+        return self.time_remaining <= 0 or self.stop_reason is not None
+
+    def _rebuild_spatial_index(self):
+        count = len(self.entities)
+        xs = np.fromiter((e.x for e in self.entities), dtype=float, count=count)
+        ys = np.fromiter((e.y for e in self.entities), dtype=float, count=count)
+        self.spatial_index.build(xs, ys)
+
+    def visible_entities(self, camera, margin: float = 0.0) -> List[Entity]:
+        indices = [
+            self.spatial_index.query_rect(*rect)
+            for rect in camera.visible_rects(margin)
+        ]
+        if not indices:
+            return []
+        return [self.entities[i] for i in np.concatenate(indices)]
+
+    def visible_food(self, camera, margin: float = 0.0) -> List[Food]:
+        visible = []
+        for rect in camera.visible_rects(margin):
+            visible.extend(self.food.query_rect(*rect))
+        return visible
+
+    def draw(self, screen, show_vision: bool, camera):
+        # Only entities inside the viewport (plus room for vision shapes) are drawn
+        if show_vision:
+            margin = c.MAX_GENE * self.config.predator_vision_multiplier
+        else:
+            margin = self.config.entity_radius
+        visible = self.visible_entities(camera, margin)
 
-    def draw(self, screen, show_vision: bool):
         # Sort entities by type for proper layering (food, prey, predators)
-        food_entities = [e for e in self.entities if isinstance(e, Food)]
-        prey_entities = [e for e in self.entities if isinstance(e, Prey)]
-        predator_entities = [e for e in self.entities if isinstance(e, Predator)]
+        food_entities = self.visible_food(camera, self.config.food_radius)
+        prey_entities = [e for e in visible if isinstance(e, Prey)]
+        predator_entities = [e for e in visible if isinstance(e, Predator)]
 
         # Draw in order: food, prey, predators
         for entity in food_entities:
-            entity.draw(screen)
+            entity.draw(screen, camera)
         for entity in prey_entities + predator_entities:
-            entity.draw(screen, show_vision)
+            entity.draw(screen, camera, show_vision)
 
-    def get_statistics(self) -> Dict[str, Any]:
-        predator_count = len(
-            [e for e in self.entities if isinstance(e, Predator) and e.alive]
-        )
-        prey_count = len([e for e in self.entities if isinstance(e, Prey) and e.alive])
+    def _living(self) -> List[Entity]:
+        return [e for e in self.entities if e.alive]
 
-        # Calculate survival rates
-        initial_predators = self.params["predator_count"]
-        initial_prey = self.params["prey_count"]
+    def agent_species(self) -> np.ndarray:
+        # Species index (into the registry) of each living agent, creation order
+        index = self.species_registry.index
+        return np.array([index[e.species] for e in self._living()], dtype=np.intp)
 
-        predator_survival_rate = (
-            (predator_count / initial_predators) * 100 if initial_predators > 0 else 0
-        )
-        prey_survival_rate = (
-            (prey_count / initial_prey) * 100 if initial_prey > 0 else 0
+    def agent_positions(self) -> np.ndarray:
+        points = [(e.x, e.y) for e in self._living()]
+        return np.array(points, dtype=float).reshape(-1, 2)
+
+    def agent_genes(self) -> np.ndarray:
+        return self._gene_rows(self._living())
+
+    def _gene_rows(self, agents: List[Entity]) -> np.ndarray:
+        # Genomes as rows of the shared gene array; genes a genome lacks take
+        # their lower bound
+        genes = self.species_registry.genes
+        rows = [
+            [getattr(a.genome, gene.name, gene.low) for gene in genes] for a in agents
+        ]
+        return np.array(rows, dtype=float).reshape(-1, len(genes))
+
+    def agent_state(self) -> Dict[str, np.ndarray]:
+        # Per-agent arrays of the living agents (id, kind, x, y, direction,
+        # energy, genes), aligned with agent_species()
+        living = self._living()
+        positions = self.agent_positions()
+        return {
+            "id": np.array([e.id for e in living], dtype=np.intp),
+            "kind": self.agent_species(),
+            "x": positions[:, 0],
+            "y": positions[:, 1],
+            "direction": np.array([e.direction for e in living], dtype=float),
+            "energy": np.array([e.energy for e in living], dtype=float),
+            "genes": self.agent_genes(),
+        }
+
+    def _species_counts(self) -> Dict[str, int]:
+        registry = self.species_registry
+        counts = np.bincount(self.agent_species(), minlength=len(registry))
+        return dict(zip(registry.names, counts.tolist()))
+
+    def population_counts(self) -> Dict[str, int]:
+        counts = self._species_counts()
+        food_count = len(self.food)
+        if self.resources is not None:
+            # Field mode reports food as equivalent Food items
+            food_count = int(self.resources.total() / self.config.eating_energy_gain)
+        counts["food"] = food_count
+        return counts
+
+    def positions(self, species: str) -> np.ndarray:
+        # Positions of living entities in creation order, shape (n, 2);
+        # food comes from the store in slot order
+        if species == "food":
+            return self.food.positions()
+
+        kind = self.species_registry.index[species]
+        return self.agent_positions()[self.agent_species() == kind]
+
+    def genome_statistics(self) -> Dict[str, Dict[str, float]]:
+        return self.species_registry.gene_statistics(
+            self.agent_species(), self.agent_genes()
         )
 
+    def get_statistics(self) -> Dict[str, Any]:
+        counts = self._species_counts()
+
+        # Survival rates against the initial counts from params["<key>_count"]
+        survival_stats = {}
+        for spec in self.species_registry.species:
+            initial = self.params.get(f"{spec.key}_count", 0)
+            survival_stats[f"{spec.key}_survival_rate"] = (
+                (counts[spec.name] / initial) * 100 if initial > 0 else 0
+            )
+
         # Get average genome stats
-        predator_stats = self._calculate_genome_statistics("predator")
-        prey_stats = self._calculate_genome_statistics("prey")
+        genome_stats = self.genome_statistics()
 
         return {
-            "final_populations": {"predators": predator_count, "prey": prey_count},
-            "survival_stats": {
-                "predator_survival_rate": predator_survival_rate,
-                "prey_survival_rate": prey_survival_rate,
-            },
+            "species": self.species_registry.species,
+            "final_populations": counts,
+            "survival_stats": survival_stats,
             "evolution_info": {
                 "total_reproductions": self.total_reproductions,
+                "total_kills": self.total_kills,
             },
-            "genome_statistics": {"predators": predator_stats, "prey": prey_stats},
+            "genome_statistics": genome_stats,
             "population_history": self.population_history,
             "simulation_params": self.params,
+            "seed": self.seed,
+            "stop_reason": self.stop_reason,
         }
-
-    def _calculate_genome_statistics(self, species: str) -> Dict[str, float]:
-        if species == "predator":
-            entities = [e for e in self.entities if isinstance(e, Predator) and e.alive]
-            if not entities:
-                return {"speed": 0, "vision": 0, "stamina": 0, "attack_strength": 0}
-
-            avg_speed = sum(e.genome.speed for e in entities) / len(entities)
-            avg_vision = sum(e.genome.vision for e in entities) / len(entities)
-            avg_stamina = sum(e.genome.stamina for e in entities) / len(entities)
-            avg_attack = sum(e.genome.attack_strength for e in entities) / len(entities)
-
-            return {
-                "speed": avg_speed,
-                "vision": avg_vision,
-                "stamina": avg_stamina,
-                "attack_strength": avg_attack,
-            }
-
-        elif species == "prey":
-            entities = [e for e in self.entities if isinstance(e, Prey) and e.alive]
-            if not entities:
-                return {"speed": 0, "vision": 0, "stamina": 0, "attack_resistance": 0}
-
-            avg_speed = sum(e.genome.speed for e in entities) / len(entities)
-            avg_vision = sum(e.genome.vision for e in entities) / len(entities)
-            avg_stamina = sum(e.genome.stamina for e in entities) / len(entities)
-            avg_resistance = sum(e.genome.attack_resistance for e in entities) / len(
-                entities
-            )
-
-            return {
-                "speed": avg_speed,
-                "vision": avg_vision,
-                "stamina": avg_stamina,
-                "attack_resistance": avg_resistance,
-            }
-
-        return {}
@@ -0,0 +1,134 @@
+import math
+import numpy as np
+from typing import Optional, Tuple
+
+
+class SpatialGrid:
+    # Uniform grid over the toroidal world stored in CSR form: point indices
+    # sorted by cell plus the offset where each cell starts. With several
+    # layers the grid indexes independent worlds of the same size at once;
+    # points are only found by queries from their own layer. The per-cell
+    # offsets would then grow with the layer count, so layered grids look
+    # cells up in the sorted cell ids of the points instead.
+
+    def __init__(self, width: float, height: float, cell_size: float, layers: int = 1):
+        self.width = width
+        self.height = height
+        self.cols = max(1, int(math.ceil(width / cell_size)))
+        self.rows = max(1, int(math.ceil(height / cell_size)))
+        self.cell_width = width / self.cols
+        self.cell_height = height / self.rows
+
+        self.xs = np.empty(0)
+        self.ys = np.empty(0)
+        self.order = np.empty(0, dtype=np.intp)
+        self.layers = layers
+        self.starts = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+        self.sorted_cells = np.empty(0, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def build(
+        self, xs: np.ndarray, ys: np.ndarray, layers: Optional[np.ndarray] = None
+    ):
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+
+        cells = self.cell_of(self.xs, self.ys)
+        if layers is not None:
+            cells = cells + np.asarray(layers) * (self.cols * self.rows)
+        self.order = np.argsort(cells, kind="stable")
+        if self.layers > 1:
+            self.sorted_cells = cells[self.order]
+        else:
+            self.starts = np.searchsorted(
+                cells[self.order], np.arange(self.cols * self.rows + 1)
+            )
+
+    def cell_of(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        col = (xs // self.cell_width).astype(np.intp) % self.cols
+        row = (ys // self.cell_height).astype(np.intp) % self.rows
+        return row * self.cols + col
+
+    def _expand(self, begins: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        # Concatenate every [begin, begin + count) slice of `order` without a
+        # Python loop
+        total = int(counts.sum())
+        firsts = np.cumsum(counts) - counts
+        slots = np.arange(total) - np.repeat(firsts - begins, counts)
+        return self.order[slots]
+
+    def _cell_ranges(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Offset into `order` and point count of each cell
+        if self.layers > 1:
+            begins = np.searchsorted(self.sorted_cells, cells, "left")
+            return begins, np.searchsorted(self.sorted_cells, cells, "right") - begins
+        begins = self.starts[cells]
+        return begins, self.starts[cells + 1] - begins
+
+    def points_in_cells(self, cells: np.ndarray) -> np.ndarray:
+        return self._expand(*self._cell_ranges(cells))
+
+    def _offsets(self, reach: int, size: int) -> np.ndarray:
+        # Cell offsets covering +-reach cells, each wrapped cell visited once
+        if 2 * reach + 1 >= size:
+            return np.arange(size)
+        return np.arange(-reach, reach + 1)
+
+    def query_pairs(
+        self,
+        qx: np.ndarray,
+        qy: np.ndarray,
+        radius: float,
+        layers: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Candidate (query, point) pairs whose cells lie within `radius` of the
+        # query cell, wrapping around the world edges. Exact distances are left
+        # to the caller.
+        qx = np.asarray(qx, dtype=float)
+        qy = np.asarray(qy, dtype=float)
+        if len(qx) == 0 or len(self.xs) == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        col_reach = int(math.ceil(radius / self.cell_width))
+        row_reach = int(math.ceil(radius / self.cell_height))
+        col_offsets = self._offsets(col_reach, self.cols)
+        row_offsets = self._offsets(row_reach, self.rows)
+
+        qcol = (qx // self.cell_width).astype(np.intp)
+        qrow = (qy // self.cell_height).astype(np.intp)
+        cols = (qcol[:, None, None] + col_offsets[None, None, :]) % self.cols
+        rows = (qrow[:, None, None] + row_offsets[None, :, None]) % self.rows
+        cells = (rows * self.cols + cols).reshape(len(qx), -1)
+        if layers is not None:
+            cells += (np.asarray(layers) * (self.cols * self.rows))[:, None]
+
+        begins, counts = self._cell_ranges(cells.ravel())
+        queries = np.repeat(np.arange(len(qx)), cells.shape[1])
+
+        return np.repeat(queries, counts), self._expand(begins, counts)
+
+    def query_rect(
+        self, x0: float, y0: float, x1: float, y1: float, layer: int = 0
+    ) -> np.ndarray:
+        # Indices of points inside [x0, x1) x [y0, y1), rectangle within the world
+        if len(self.xs) == 0 or x1 <= x0 or y1 <= y0:
+            return np.empty(0, dtype=np.intp)
+
+        col0 = max(0, int(x0 // self.cell_width))
+        col1 = min(self.cols - 1, int(x1 // self.cell_width))
+        row0 = max(0, int(y0 // self.cell_height))
+        row1 = min(self.rows - 1, int(y1 // self.cell_height))
+
+        cols = np.arange(col0, col1 + 1)
+        rows = np.arange(row0, row1 + 1)
+        cells = (rows[:, None] * self.cols + cols[None, :]).ravel()
+        cells += layer * self.cols * self.rows
+
+        candidates = self.points_in_cells(cells)
+        xs = self.xs[candidates]
+        ys = self.ys[candidates]
+        inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        return np.sort(candidates[inside])
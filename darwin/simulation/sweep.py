@@ -0,0 +1,118 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from darwin import config as c
+from .engines import ENGINES, create_simulation
+from .environment import DEFAULT_DT, default_params
+from .run_cache import RunCache, run_key, writes_outputs
+
+
+def run_cached(
+    params: Dict[str, Any],
+    config: Optional[c.SimulationConfig] = None,
+    cache: Optional[RunCache] = None,
+    dt: float = DEFAULT_DT,
+) -> Tuple[Dict[str, Any], bool]:
+    # Statistics of a full run without the pygame loop, and whether they
+    # came from the cache: they do when the same seeded run spec was computed
+    # before and the run writes no event log or lineage file
+    key = run_key(params, config)
+    if cache is not None and not writes_outputs(params):
+        statistics = cache.get(key)
+        if statistics is not None:
+            return statistics, True
+
+    simulation = create_simulation(params, config)
+    while not simulation.is_finished():
+        simulation.update(dt)
+    simulation.close()
+    statistics = simulation.get_statistics()
+    if cache is not None:
+        cache.put(key, statistics)
+    return statistics, False
+
+
+def run_headless(
+    params: Dict[str, Any],
+    config: Optional[c.SimulationConfig] = None,
+    cache: Optional[RunCache] = None,
+    dt: float = DEFAULT_DT,
+) -> Dict[str, Any]:
+    return run_cached(params, config, cache, dt)[0]
+
+
+def expand(
+    base: Dict[str, Any], grid: Dict[str, Sequence[Any]], seeds: Sequence[int]
+) -> Iterator[Dict[str, Any]]:
+    # Params for every combination of the grid values and seeds
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        for seed in seeds:
+            yield dict(base, **dict(zip(names, values)), seed=seed)
+
+
+def sweep(
+    base: Dict[str, Any],
+    grid: Dict[str, Sequence[Any]],
+    seeds: Sequence[int],
+    cache: Optional[RunCache] = None,
+) -> List[Dict[str, Any]]:
+    return [run_headless(params, cache=cache) for params in expand(base, grid, seeds)]
+
+
+def grid_entry(text: str):
+    # "name=v1,v2,..." with JSON values (bare words stay strings)
+    name, _, values = text.partition("=")
+    parsed = []
+    for value in values.split(","):
+        try:
+            parsed.append(json.loads(value))
+        except ValueError:
+            parsed.append(value)
+    return name, parsed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run a grid of headless simulations, reusing cached results"
+    )
+    parser.add_argument("--engine", choices=list(ENGINES), default="vectorized")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--duration", type=int, default=c.MIN_SIMULATION_DURATION)
+    parser.add_argument(
+        "--set",
+        type=grid_entry,
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="param values to sweep over",
+    )
+    parser.add_argument("--cache-dir", default=c.RUN_CACHE_DIR)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--reports", help="write a report per run under this folder")
+    args = parser.parse_args(argv)
+
+    base = dict(default_params(), engine=args.engine, duration=args.duration)
+    cache = None if args.no_cache else RunCache(args.cache_dir)
+    for params in expand(base, dict(args.set), args.seeds):
+        statistics, cached = run_cached(params, cache=cache)
+        swept = {name: params[name] for name, _ in args.set}
+        origin = "cache" if cached else "run"
+        print(
+            f"seed={params['seed']} {swept} [{origin}]", statistics["final_populations"]
+        )
+
+        if args.reports:
+            from ..analysis import Plotter
+
+            folder = os.path.join(args.reports, run_key(params)[:12])
+            Plotter.generate_report(statistics, folder)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
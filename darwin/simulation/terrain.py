@@ -0,0 +1,154 @@
+import math
+import numpy as np
+import pygame
+from typing import NamedTuple, Optional, Tuple
+
+from darwin import config as c
+
+
+class Biome(NamedTuple):
+    name: str
+    color: Tuple[int, int, int]
+    speed: float  # movement speed multiplier
+    energy_decay: float  # energy decay multiplier
+    vision: float  # vision range multiplier
+    regrowth: float  # food regrowth multiplier
+
+
+BIOMES = (
+    Biome("prateria", (28, 40, 28), 1.0, 1.0, 1.0, 1.0),
+    Biome("foresta", (18, 34, 24), 0.8, 0.9, 0.6, 1.4),
+    Biome("deserto", (52, 46, 30), 1.1, 1.5, 1.2, 0.3),
+    Biome("palude", (22, 32, 42), 0.5, 1.2, 0.9, 0.8),
+    Biome("montagna", (44, 44, 50), 0.6, 1.3, 1.4, 0.5),
+)
+
+
+class Terrain:
+    # Biome raster over the world. Per-cell modifiers are stored as arrays, so
+    # looking them up for any number of positions is one indexing operation.
+
+    def __init__(self, config: c.SimulationConfig, biomes: np.ndarray):
+        self.config = config
+        self.biomes = biomes  # biome index per cell, indexed [row, col]
+        self.rows, self.cols = biomes.shape
+        self.cell_width = config.world_width / self.cols
+        self.cell_height = config.world_height / self.rows
+
+        table = np.array(
+            [[b.speed, b.energy_decay, b.vision, b.regrowth] for b in BIOMES]
+        )
+        self.speed = table[biomes, 0]
+        self.energy_decay = table[biomes, 1]
+        self.vision = table[biomes, 2]
+        self.regrowth = table[biomes, 3]
+        self.max_regrowth = float(self.regrowth.max())
+
+    def cell_of(self, xs, ys) -> Tuple[np.ndarray, np.ndarray]:
+        row = (np.floor_divide(ys, self.cell_height)).astype(np.intp) % self.rows
+        col = (np.floor_divide(xs, self.cell_width)).astype(np.intp) % self.cols
+        return row, col
+
+    def modifiers(
+        self, xs: np.ndarray, ys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Speed, energy decay and vision multipliers for each position
+        row, col = self.cell_of(xs, ys)
+        return self.speed[row, col], self.energy_decay[row, col], self.vision[row, col]
+
+    def modifiers_at(self, x: float, y: float) -> Tuple[float, float, float]:
+        row, col = self.cell_of(x, y)
+        return (
+            float(self.speed[row, col]),
+            float(self.energy_decay[row, col]),
+            float(self.vision[row, col]),
+        )
+
+    def regrowth_at(self, xs, ys) -> np.ndarray:
+        row, col = self.cell_of(xs, ys)
+        return self.regrowth[row, col]
+
+    def colors(self) -> np.ndarray:
+        # Biome colors per cell, shape (rows, cols, 3)
+        palette = np.array([b.color for b in BIOMES], dtype=np.uint8)
+        return palette[self.biomes]
+
+
+def _grid_shape(config: c.SimulationConfig) -> Tuple[int, int]:
+    rows = max(1, int(math.ceil(config.world_height / config.terrain_cell_size)))
+    cols = max(1, int(math.ceil(config.world_width / config.terrain_cell_size)))
+    return rows, cols
+
+
+def _value_noise(
+    generator: np.random.Generator, rows: int, cols: int, feature_cells: float
+) -> np.ndarray:
+    # Smooth noise in [0, 1] that tiles seamlessly: random values on a coarse
+    # lattice, bilinearly interpolated with wrap-around
+    lattice_rows = max(2, int(round(rows / feature_cells)))
+    lattice_cols = max(2, int(round(cols / feature_cells)))
+    lattice = generator.random((lattice_rows, lattice_cols))
+
+    ys = np.arange(rows) * lattice_rows / rows
+    xs = np.arange(cols) * lattice_cols / cols
+    y0 = ys.astype(np.intp)
+    x0 = xs.astype(np.intp)
+    fy = (ys - y0)[:, None]
+    fx = (xs - x0)[None, :]
+    y1 = (y0 + 1) % lattice_rows
+    x1 = (x0 + 1) % lattice_cols
+
+    # Smoothstep weights avoid visible lattice lines
+    fy = fy * fy * (3 - 2 * fy)
+    fx = fx * fx * (3 - 2 * fx)
+
+    top = lattice[y0][:, x0] * (1 - fx) + lattice[y0][:, x1] * fx
+    bottom = lattice[y1][:, x0] * (1 - fx) + lattice[y1][:, x1] * fx
+    return top * (1 - fy) + bottom * fy
+
+
+def generate_terrain(
+    config: c.SimulationConfig, generator: np.random.Generator
+) -> Terrain:
+    # Procedural biomes from two noise fields: elevation picks swamps and
+    # mountains, moisture splits the rest into desert, grassland and forest
+    rows, cols = _grid_shape(config)
+    feature_cells = c.TERRAIN_FEATURE_SIZE / config.terrain_cell_size
+
+    def octaves() -> np.ndarray:
+        coarse = _value_noise(generator, rows, cols, feature_cells)
+        fine = _value_noise(generator, rows, cols, feature_cells / 3)
+        return (2 * coarse + fine) / 3
+
+    elevation = octaves()
+    moisture = octaves()
+
+    biomes = np.zeros((rows, cols), dtype=np.intp)  # prateria
+    biomes[moisture > 0.6] = 1  # foresta
+    biomes[moisture < 0.35] = 2  # deserto
+    biomes[elevation < 0.3] = 3  # palude
+    biomes[elevation > 0.7] = 4  # montagna
+    return Terrain(config, biomes)
+
+
+def load_terrain(config: c.SimulationConfig, path: str) -> Terrain:
+    # Image stretched over the world, each pixel mapped to the biome with the
+    # closest color
+    rows, cols = _grid_shape(config)
+    image = pygame.transform.scale(pygame.image.load(path), (cols, rows))
+    pixels = pygame.surfarray.array3d(image).transpose(1, 0, 2).astype(float)
+
+    palette = np.array([b.color for b in BIOMES], dtype=float)
+    distance = ((pixels[:, :, None, :] - palette[None, None, :, :]) ** 2).sum(axis=3)
+    return Terrain(config, distance.argmin(axis=2))
+
+
+def create_terrain(
+    config: c.SimulationConfig, generator: np.random.Generator
+) -> Optional[Terrain]:
+    # config.terrain is "none", "procedural" or the path of a biome image
+    if config.terrain == "none":
+        return None
+    if config.terrain == "procedural":
+        return generate_terrain(config, generator)
+    return load_terrain(config, config.terrain)
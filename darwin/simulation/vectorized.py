@@ -0,0 +1,833 @@
+import math
+import numpy as np
+import pygame
+from typing import Dict, Optional, Tuple
+
+from darwin import config as c
+from ..genetics import BrainLayout
+from . import events, lineage
+from .collision import resolve_collisions, swept_contact
+from .mating import match_mates
+from .perception import nearest_among, perceive, wrapped_delta
+from .simulation import Simulation
+
+# Per-agent arrays, kept aligned and compacted together
+AGENT_FIELDS = (
+    "x",
+    "y",
+    "direction",
+    "energy",
+    "max_energy",
+    "score",
+    "damage",
+    "kind",
+    "genes",
+    "ids",
+    "weights",
+)
+
+# Neural controller inputs: bearing (sin, cos) and proximity of the agent
+# target, the food and the threat, then energy fraction and mating flag.
+# Outputs: turn and throttle.
+NEURAL_INPUTS = 11
+NEURAL_OUTPUTS = 2
+
+
+def perceive_species(
+    registry,
+    config: c.SimulationConfig,
+    xs: np.ndarray,
+    ys: np.ndarray,
+    directions: np.ndarray,
+    ranges: np.ndarray,
+    kind: np.ndarray,
+    reproducing: np.ndarray,
+    observers: np.ndarray,
+    candidates: np.ndarray,
+    food: Optional[Tuple] = None,
+    layers: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, ...]:
+    # Per observer: nearest visible mate (when reproducing) or prey agent, the
+    # nearest visible threat, and the nearest visible food slot with its
+    # distance. Observers and candidates are sorted indices of living agents,
+    # the candidates a superset of the observers; food is (xs, ys, mask, grid)
+    # over the food slots, the grid optional. Loops over species, never over
+    # agents.
+    count = len(xs)
+    targets = np.full(count, -1, dtype=np.intp)
+    threats = np.full(count, -1, dtype=np.intp)
+    food_slots = np.full(count, -1, dtype=np.intp)
+    food_distance = np.full(count, np.inf)
+
+    def nearest(seeing, seen, cone, exclude_self):
+        return nearest_among(
+            seeing,
+            seen,
+            xs,
+            ys,
+            directions,
+            ranges,
+            cone,
+            config.world_width,
+            config.world_height,
+            exclude_self,
+            layers,
+        )
+
+    for s in range(len(registry)):
+        members = observers[kind[observers] == s]
+        if len(members) == 0:
+            continue
+        cone = registry.cos_half_cone[s]
+
+        mates = members[reproducing[members]]
+        suitors = candidates[(kind[candidates] == s) & reproducing[candidates]]
+        targets[mates] = nearest(mates, suitors, cone, True)
+
+        others = members[~reproducing[members]]
+        if len(others) == 0:
+            continue
+        # A species hunting itself sees its own members as prey and threats
+        cannibal = bool(registry.hunts[s, s])
+        hunters = registry.hunts[kind[candidates], s]
+        if hunters.any():
+            threats[others] = nearest(others, candidates[hunters], cone, cannibal)
+        prey = registry.hunts[s, kind[candidates]]
+        if prey.any():
+            targets[others] = nearest(others, candidates[prey], cone, cannibal)
+
+        if registry.eats_food[s] and food is not None:
+            food_x, food_y, food_mask, grid = food
+            food_slots[others], food_distance[others] = perceive(
+                xs[others],
+                ys[others],
+                directions[others],
+                ranges[others],
+                cone,
+                food_x,
+                food_y,
+                config.world_width,
+                config.world_height,
+                grid=grid,
+                target_mask=food_mask,
+                observer_layers=None if layers is None else layers[others],
+            )
+
+    return targets, threats, food_slots, food_distance
+
+
+class VectorizedSimulation(Simulation):
+    # Struct-of-arrays engine driven only by the species registry: agents are
+    # rows of parallel arrays with a species index and a row of the shared
+    # gene array, and every stage is a handful of array operations over all
+    # species at once. Any species defined in the config works without
+    # per-species code. Agents perceive every tick, so a perception interval
+    # is rejected. In neural behavior mode each agent steers with its own
+    # evolved network instead of the fixed rules.
+
+    mating_stage = True
+    generic_species = True
+    behaviors = c.BEHAVIOR_MODES
+    cached_perception = False
+    agent_fields = AGENT_FIELDS
+
+    def _initialize_populations(self):
+        self._reset_agents()
+        # params["<key>_count"] agents per species, in registry order
+        registry = self.species_registry
+        counts = [self.params.get(f"{spec.key}_count", 0) for spec in registry.species]
+        kinds = np.repeat(np.arange(len(registry)), counts)
+        self._spawn_agents(kinds, self.rng.spawn.generator)
+
+    def _reset_agents(self):
+        for name in self.agent_fields:
+            setattr(self, name, np.zeros(0))
+        self.kind = np.zeros(0, dtype=np.intp)
+        self.ids = np.zeros(0, dtype=np.intp)
+        self.genes = np.zeros((0, len(self.species_registry.genes)))
+
+        self.brain = None
+        if self.config.behavior == "neural":
+            self.brain = BrainLayout(
+                NEURAL_INPUTS, self.config.neural_hidden_units, NEURAL_OUTPUTS
+            )
+        self.weights = np.zeros((0, self.brain.size if self.brain else 0))
+
+    def _spawn_agents(self, kinds: np.ndarray, generator, **fields):
+        # New agents of the given kinds at random positions with random genes;
+        # extra per-agent fields are passed through
+        count = len(kinds)
+        xs = generator.uniform(50, self.config.world_width - 50, count)
+        ys = generator.uniform(50, self.config.world_height - 50, count)
+        genes = self.species_registry.random_genes(kinds, generator)
+        if self.brain is not None:
+            weights = self.brain.random(count, generator)
+        else:
+            weights = np.zeros((count, 0))
+        directions = generator.uniform(0, 2 * math.pi, count)
+        self._add_agents(
+            dict(
+                fields,
+                kind=kinds,
+                x=xs,
+                y=ys,
+                genes=genes,
+                weights=weights,
+                direction=directions,
+            )
+        )
+
+    def introduce(self, species: str, count: int):
+        kinds = np.full(count, self.species_registry.index[species])
+        self._spawn_agents(kinds, self.rng.spawn.generator)
+        self.lineage.add_births(
+            self.ids[len(self.ids) - count :],
+            kinds,
+            -1,
+            -1,
+            self.tick,
+            self.genes[len(self.genes) - count :],
+        )
+        self._rebuild_spatial_index()
+
+    def emigrate(self, count: int) -> Dict[str, np.ndarray]:
+        chosen = self._migrants(self.kind, count)
+        migrants = {
+            "kind": self.kind[chosen],
+            "genes": self.genes[chosen],
+            "energy": self.energy[chosen],
+            "max_energy": self.max_energy[chosen],
+            "weights": self.weights[chosen],
+        }
+        self.lineage.add_deaths(self.ids[chosen], self.tick, lineage.EMIGRATED)
+        keep = np.ones(len(self.x), dtype=bool)
+        keep[chosen] = False
+        self._keep_agents(keep)
+        self._rebuild_spatial_index()
+        return migrants
+
+    def immigrate(self, migrants: Dict[str, np.ndarray]):
+        count = len(migrants["kind"])
+        generator = self.rng.spawn.generator
+        self._add_agents(
+            dict(
+                kind=migrants["kind"],
+                x=generator.uniform(50, self.config.world_width - 50, count),
+                y=generator.uniform(50, self.config.world_height - 50, count),
+                genes=migrants["genes"],
+                weights=migrants["weights"],
+                direction=generator.uniform(0, 2 * math.pi, count),
+            )
+        )
+        arrived = slice(len(self.x) - count, len(self.x))
+        self.energy[arrived] = migrants["energy"]
+        self.max_energy[arrived] = migrants["max_energy"]
+        self.lineage.add_births(
+            self.ids[arrived], migrants["kind"], -1, -1, self.tick, migrants["genes"]
+        )
+        self._rebuild_spatial_index()
+
+    def _add_agents(self, added: Dict[str, np.ndarray]):
+        # Appends agents given their kind, position, direction, genes and
+        # weights; energy, score, damage and ids start fresh
+        count = len(added["kind"])
+        stamina = added["genes"][:, self.species_registry.column("stamina")]
+        added = dict(
+            added,
+            energy=stamina,
+            max_energy=stamina,
+            score=np.zeros(count),
+            damage=np.zeros(count),
+            ids=np.arange(self._entity_count, self._entity_count + count),
+        )
+        self._entity_count += count
+        for name in self.agent_fields:
+            setattr(self, name, np.concatenate([getattr(self, name), added[name]]))
+
+    def _keep_agents(self, keep: np.ndarray):
+        for name in self.agent_fields:
+            setattr(self, name, getattr(self, name)[keep])
+
+    def _draws(self, stream: str, agents) -> np.random.Generator:
+        # Generator for draws with one row per agent in `agents` (indices or
+        # a mask); engines stacking several worlds give each row the stream
+        # of its own world
+        return getattr(self.rng, stream).generator
+
+    def _layers(self) -> Optional[np.ndarray]:
+        # Per-agent world index for the spatial kernels, None for one world
+        return None
+
+    def _inherited(self, parents: np.ndarray) -> Dict[str, np.ndarray]:
+        # Extra fields children take from their first parent
+        return {}
+
+    def _tally(self, children: Optional[Dict[str, np.ndarray]], victims: np.ndarray):
+        if children is not None:
+            self.total_reproductions += len(children["kind"])
+        self.total_kills += len(victims)
+
+    def _step_agents(self, dt: float):
+        config = self.config
+        registry = self.species_registry
+        count = len(self.x)
+        if count == 0:
+            return
+
+        # Stage 1: terrain modifiers
+        if self.terrain is not None:
+            speed_mod, decay_mod, vision_mod = self.terrain.modifiers(self.x, self.y)
+        else:
+            speed_mod = decay_mod = vision_mod = np.ones(count)
+
+        # Stage 2: energy and reproduction status
+        self.energy -= config.energy_decay_rate * dt * decay_mod
+        np.minimum(self.energy, self.max_energy, out=self.energy)
+        alive = self.energy > 0
+        reproducing = alive & (self.score >= config.reproduction_score_threshold)
+
+        steps = self.genes[:, registry.column("speed")] * speed_mod * dt
+        ranges = (
+            self.genes[:, registry.column("vision")]
+            * vision_mod
+            * registry.vision_multiplier[self.kind]
+        )
+
+        # Stage 3: mating; children join the arrays at the end of the tick
+        children = self._mate(reproducing, ranges)
+
+        # Stage 4: perception
+        targets, threats, food_slots, food_distance = self._perceive(
+            alive, reproducing, ranges
+        )
+
+        # Stage 5: steering, by rules or by each agent's network
+        steer = self._steer if self.brain is None else self._steer_neural
+        chasing, foraging, grazing, throttle = steer(
+            alive, reproducing, targets, threats, food_slots, food_distance, ranges
+        )
+        steps *= throttle
+
+        # Stage 6: attacks, eating and grazing, with swept contact tests
+        victims = self._attack(alive, chasing, targets, steps)
+        self._eat(alive & foraging, food_slots, steps)
+        if self.resources is not None:
+            self._graze(np.flatnonzero(alive & grazing), dt)
+
+        # Stage 7: movement and its energy cost
+        self.x = (self.x + np.cos(self.direction) * steps) % config.world_width
+        self.y = (self.y + np.sin(self.direction) * steps) % config.world_height
+        self.direction %= 2 * math.pi
+        self.energy -= config.movement_energy_cost * dt * throttle
+        alive &= self.energy > 0
+
+        # Stage 8: separate overlapping agents of the same species
+        living = np.flatnonzero(alive)
+        layers = self._layers()
+        xs, ys, contacts = resolve_collisions(
+            self.x[living],
+            self.y[living],
+            self.kind[living],
+            config.contact_distance,
+            config.world_width,
+            config.world_height,
+            self._draws("collision", living),
+            None if layers is None else layers[living],
+        )
+        if contacts:
+            self.x[living] = xs
+            self.y[living] = ys
+
+        self._tally(children, victims)
+        starved = ~alive & (self.energy <= 0)
+        starved[victims] = False
+        dead = np.flatnonzero(~alive)
+        self.lineage.add_deaths(
+            self.ids[dead],
+            self.tick,
+            np.where(starved[dead], lineage.STARVED, lineage.KILLED),
+        )
+        self.record_events(
+            events.STARVATION,
+            self.ids[starved],
+            np.full(int(starved.sum()), -1),
+            self.x[starved],
+            self.y[starved],
+        )
+
+        self._keep_agents(alive)
+        if children is not None:
+            self._add_agents(children)
+            born = self.ids[len(self.ids) - len(children["kind"]) :]
+            self.lineage.add_births(
+                born,
+                children["kind"],
+                children["parent"],
+                children["mate"],
+                self.tick,
+                children["genes"],
+            )
+            self.record_events(
+                events.BIRTH, children["parent"], born, children["x"], children["y"]
+            )
+
+    def _mate(
+        self, reproducing: np.ndarray, ranges: np.ndarray
+    ) -> Optional[Dict[str, np.ndarray]]:
+        # Pairs mutually visible reproductive agents in contact and returns
+        # the children's fields for _add_agents (None without matches)
+        config = self.config
+        registry = self.species_registry
+        candidates = np.flatnonzero(reproducing)
+        layers = self._layers()
+
+        first, second = match_mates(
+            self.x[candidates],
+            self.y[candidates],
+            self.direction[candidates],
+            ranges[candidates],
+            registry.cos_half_cone[self.kind[candidates]],
+            self.kind[candidates],
+            config.contact_distance,
+            config.world_width,
+            config.world_height,
+            None if layers is None else layers[candidates],
+        )
+        if len(first) == 0:
+            return None
+        first = candidates[first]
+        second = candidates[second]
+
+        kinds = self.kind[first]
+        genes = registry.crossover(
+            kinds,
+            self.genes[first],
+            self.genes[second],
+            config.mutation_rate,
+            self._draws("genetics", first),
+        )
+
+        # Born around the parents' midpoint
+        spread = registry.birth_spread[kinds][:, None]
+        jitter = self._draws("behavior", first).uniform(-1, 1, (len(first), 2))
+        jitter *= spread
+        dx = wrapped_delta(self.x[second] - self.x[first], config.world_width)
+        dy = wrapped_delta(self.y[second] - self.y[first], config.world_height)
+        xs = (self.x[first] + dx / 2 + jitter[:, 0]) % config.world_width
+        ys = (self.y[first] + dy / 2 + jitter[:, 1]) % config.world_height
+
+        weights = self.weights[first]
+        if self.brain is not None:
+            weights = self.brain.crossover(
+                weights,
+                self.weights[second],
+                config.mutation_rate,
+                config.neural_mutation_scale,
+                self._draws("genetics", first),
+            )
+        directions = self._draws("spawn", first).uniform(0, 2 * math.pi, len(first))
+
+        for parents in (first, second):
+            self.score[parents] = 0
+            reproducing[parents] = False
+        return dict(
+            self._inherited(first),
+            parent=self.ids[first],
+            mate=self.ids[second],
+            kind=kinds,
+            x=xs,
+            y=ys,
+            genes=genes,
+            weights=weights,
+            direction=directions,
+        )
+
+    def _perceive(
+        self, alive: np.ndarray, reproducing: np.ndarray, ranges: np.ndarray
+    ) -> Tuple[np.ndarray, ...]:
+        living = np.flatnonzero(alive)
+        food = None
+        if self.resources is None:
+            store = self.food
+            slot_count = len(store.slots)
+            food = (
+                store.xs[:slot_count],
+                store.ys[:slot_count],
+                store.available[:slot_count],
+                store.index(),
+            )
+        return perceive_species(
+            self.species_registry,
+            self.config,
+            self.x,
+            self.y,
+            self.direction,
+            ranges,
+            self.kind,
+            reproducing,
+            living,
+            living,
+            food,
+            self._layers(),
+        )
+
+    def _offsets(
+        self, agents: np.ndarray, xs: np.ndarray, ys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Wrapped offsets from each agent to a point
+        dx = wrapped_delta(xs - self.x[agents], self.config.world_width)
+        dy = wrapped_delta(ys - self.y[agents], self.config.world_height)
+        return dx, dy
+
+    def _steer(
+        self,
+        alive: np.ndarray,
+        reproducing: np.ndarray,
+        targets: np.ndarray,
+        threats: np.ndarray,
+        food_slots: np.ndarray,
+        food_distance: np.ndarray,
+        ranges: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Turns every agent by priority: mate, flee, nearest of prey and food,
+        # resource gradient, random walk. Returns the masks of agents chasing
+        # prey, heading for food and grazing, and the throttle (always full).
+        count = len(self.x)
+        goal = np.zeros(count)
+        rate = np.zeros(count)
+
+        target_distance, target_angle = self._bearings(targets, self.x, self.y)
+        has_target = targets >= 0
+        goal[has_target] = target_angle[has_target]
+
+        mating = alive & reproducing & has_target
+        rate[mating] = c.MATE_TURN_RATE
+
+        free = alive & ~reproducing
+        fleeing = free & (threats >= 0)
+        _, threat_angle = self._bearings(threats, self.x, self.y)
+        goal[fleeing] = threat_angle[fleeing] + math.pi
+        rate[fleeing] = 1.0
+
+        free &= ~fleeing
+        chasing = free & has_target & (target_distance <= food_distance)
+        rate[chasing] = c.HUNT_TURN_RATE
+
+        foraging = free & ~chasing & (food_slots >= 0)
+        _, food_angle = self._bearings(food_slots, self.food.xs, self.food.ys)
+        goal[foraging] = food_angle[foraging]
+        rate[foraging] = c.FORAGE_TURN_RATE
+
+        grazing = np.zeros(count, dtype=bool)
+        if self.resources is not None:
+            eats_food = self.species_registry.eats_food[self.kind]
+            grazing = free & ~chasing & ~foraging & eats_food
+            agents = np.flatnonzero(grazing)
+            gradient_x, gradient_y = self._gradient(agents, ranges[agents])
+            uphill = (gradient_x != 0) | (gradient_y != 0)
+            goal[agents[uphill]] = np.arctan2(gradient_y[uphill], gradient_x[uphill])
+            rate[agents[uphill]] = c.FORAGE_TURN_RATE
+
+        turning = rate > 0
+        self.direction[turning] += (
+            wrapped_delta(goal[turning] - self.direction[turning], 2 * math.pi)
+            * rate[turning]
+        )
+
+        # Random walk for the rest
+        chance = self._draws("behavior", slice(None)).random(count)
+        walking = alive & ~turning & (chance < 0.1)
+        turns = self._draws("behavior", walking).uniform(-1, 1, int(walking.sum()))
+        self.direction[walking] += turns
+
+        return chasing, foraging, grazing, np.ones(count)
+
+    def _steer_neural(
+        self,
+        alive: np.ndarray,
+        reproducing: np.ndarray,
+        targets: np.ndarray,
+        threats: np.ndarray,
+        food_slots: np.ndarray,
+        food_distance: np.ndarray,
+        ranges: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Every living agent's network maps what it perceives to a turn and a
+        # throttle, evaluated for the whole population in one batched pass.
+        # Agents still attack, eat or graze whatever they reach.
+        count = len(self.x)
+        living = np.flatnonzero(alive)
+        inputs = np.zeros((count, NEURAL_INPUTS))
+
+        def proximity(distance):
+            # 1 at the agent, 0 at the edge of its vision or with nothing seen
+            return np.clip(1 - distance / np.maximum(ranges, 1e-9), 0, 1)
+
+        target_distance, target_angle = self._bearings(targets, self.x, self.y)
+        threat_distance, threat_angle = self._bearings(threats, self.x, self.y)
+        _, food_angle = self._bearings(food_slots, self.food.xs, self.food.ys)
+        food_proximity = proximity(food_distance)
+
+        grazing = np.zeros(count, dtype=bool)
+        if self.resources is not None:
+            # The resource gradient and the density underneath stand in for
+            # the nearest food item
+            grazing = alive & self.species_registry.eats_food[self.kind]
+            agents = np.flatnonzero(grazing)
+            gradient_x, gradient_y = self._gradient(agents, ranges[agents])
+            food_angle[agents] = np.arctan2(gradient_y, gradient_x)
+            food_proximity[agents] = (
+                self.resources.sample(self.x[agents], self.y[agents])
+                / self.config.resource_capacity
+            )
+
+        channels = (
+            (target_angle, proximity(target_distance)),
+            (food_angle, food_proximity),
+            (threat_angle, proximity(threat_distance)),
+        )
+        for channel, (angle, closeness) in enumerate(channels):
+            relative = angle - self.direction
+            seen = closeness > 0
+            inputs[:, 3 * channel] = np.sin(relative) * seen
+            inputs[:, 3 * channel + 1] = np.cos(relative) * seen
+            inputs[:, 3 * channel + 2] = closeness
+        inputs[:, 9] = self.energy / np.maximum(self.max_energy, 1e-9)
+        inputs[:, 10] = reproducing
+
+        outputs = self.brain.evaluate(self.weights[living], inputs[living])
+        self.direction[living] += outputs[:, 0] * c.NEURAL_MAX_TURN
+        throttle = np.ones(count)
+        throttle[living] = (outputs[:, 1] + 1) / 2
+
+        free = alive & ~reproducing
+        chasing = free & (targets >= 0) & (target_distance <= food_distance)
+        foraging = free & ~chasing & (food_slots >= 0)
+        return chasing, foraging, grazing & free & ~chasing, throttle
+
+    def _bearings(
+        self, indices: np.ndarray, xs: np.ndarray, ys: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Distance and heading from each agent to point indices[i] of xs/ys;
+        # inf and 0 where the index is -1
+        count = len(self.x)
+        distance = np.full(count, np.inf)
+        angle = np.zeros(count)
+        agents = np.flatnonzero(indices >= 0)
+        dx, dy = self._offsets(agents, xs[indices[agents]], ys[indices[agents]])
+        distance[agents] = np.sqrt(dx * dx + dy * dy)
+        angle[agents] = np.arctan2(dy, dx)
+        return distance, angle
+
+    def _gradient(
+        self, agents: np.ndarray, reach: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Central difference of the resource field around each agent
+        field = self.resources
+        xs = self.x[agents]
+        ys = self.y[agents]
+        gradient_x = field.sample(xs + reach, ys) - field.sample(xs - reach, ys)
+        gradient_y = field.sample(xs, ys + reach) - field.sample(xs, ys - reach)
+        return gradient_x, gradient_y
+
+    def _attack(
+        self,
+        alive: np.ndarray,
+        chasing: np.ndarray,
+        targets: np.ndarray,
+        steps: np.ndarray,
+    ) -> np.ndarray:
+        # Hunters that reach their prey deal damage. Hits on one target add
+        # up in agent order; the hit that takes the total past the target's
+        # resistance kills it and feeds that hunter, later hits are wasted.
+        # Returns the killed agents.
+        config = self.config
+        registry = self.species_registry
+        hunters = np.flatnonzero(chasing)
+        prey = targets[hunters]
+        hit = swept_contact(
+            self.x[hunters],
+            self.y[hunters],
+            self.direction[hunters],
+            steps[hunters],
+            self.x[prey],
+            self.y[prey],
+            config.contact_distance,
+            config.sweep_fraction,
+            config.world_width,
+            config.world_height,
+        )
+        hunters = hunters[hit]
+        prey = prey[hit]
+        if len(hunters) == 0:
+            return hunters
+
+        order = np.lexsort((hunters, prey))
+        hunters = hunters[order]
+        prey = prey[order]
+        strength = self.genes[hunters, registry.column("attack_strength")]
+        resistance = self.genes[prey, registry.column("attack_resistance")]
+
+        # Damage dealt to the same target by earlier hits this tick
+        total = np.cumsum(strength)
+        starts = np.ones(len(prey), dtype=bool)
+        starts[1:] = prey[1:] != prey[:-1]
+        group = np.cumsum(starts) - 1
+        earlier = total - strength - (total - strength)[starts][group]
+
+        before = self.damage[prey] + earlier
+        landed = before < resistance
+        killed = landed & (before + strength >= resistance)
+
+        np.add.at(self.damage, prey[landed], strength[landed])
+        alive[prey[killed]] = False
+
+        killers = hunters[killed]
+        victims = prey[killed]
+        self.record_events(
+            events.KILL,
+            self.ids[killers],
+            self.ids[victims],
+            self.x[victims],
+            self.y[victims],
+        )
+        self.score[killers] += registry.reproduction_gain[self.kind[killers]]
+        self.energy[killers] = np.minimum(
+            self.max_energy[killers], self.energy[killers] + config.eating_energy_gain
+        )
+        return victims
+
+    def _eat(self, foraging: np.ndarray, food_slots: np.ndarray, steps: np.ndarray):
+        # Foragers that reach their food eat it; when several reach the same
+        # item the first agent gets it
+        config = self.config
+        store = self.food
+        eaters = np.flatnonzero(foraging)
+        slots = food_slots[eaters]
+        hit = swept_contact(
+            self.x[eaters],
+            self.y[eaters],
+            self.direction[eaters],
+            steps[eaters],
+            store.xs[slots],
+            store.ys[slots],
+            config.eating_distance,
+            config.sweep_fraction,
+            config.world_width,
+            config.world_height,
+        )
+        slots, first = np.unique(slots[hit], return_index=True)
+        eaters = eaters[hit][first]
+        if len(eaters) == 0:
+            return
+
+        self.energy[eaters] = np.minimum(
+            self.max_energy[eaters], self.energy[eaters] + config.eating_energy_gain
+        )
+        self.score[eaters] += self.species_registry.reproduction_gain[self.kind[eaters]]
+        self.record_events(
+            events.MEAL, self.ids[eaters], slots, store.xs[slots], store.ys[slots]
+        )
+        for slot in slots.tolist():
+            store.consume(store.slots[slot])
+
+    def _graze(self, grazers: np.ndarray, dt: float):
+        config = self.config
+        eaten = self.resources.graze_many(
+            self.x[grazers], self.y[grazers], config.grazing_rate * dt
+        )
+        self.energy[grazers] = np.minimum(
+            self.max_energy[grazers], self.energy[grazers] + eaten
+        )
+        # Reproduction progress in proportion to a food item's worth of energy
+        gain = self.species_registry.reproduction_gain[self.kind[grazers]]
+        self.score[grazers] += gain * eaten / config.eating_energy_gain
+
+    def _rebuild_spatial_index(self):
+        self.spatial_index.build(self.x, self.y)
+
+    def agent_species(self) -> np.ndarray:
+        return self.kind.copy()
+
+    def agent_positions(self) -> np.ndarray:
+        return np.column_stack([self.x, self.y]).reshape(-1, 2)
+
+    def agent_genes(self) -> np.ndarray:
+        return self.genes.copy()
+
+    def agent_state(self) -> Dict[str, np.ndarray]:
+        # Read-only views of the engine's own arrays, no copies; they stay
+        # valid until the next update
+        state = {}
+        for key in ("id", "kind", "x", "y", "direction", "energy", "genes"):
+            view = getattr(self, "ids" if key == "id" else key).view()
+            view.flags.writeable = False
+            state[key] = view
+        return state
+
+    def visible_agents(self, camera, margin: float = 0.0) -> np.ndarray:
+        indices = [
+            self.spatial_index.query_rect(*rect)
+            for rect in camera.visible_rects(margin)
+        ]
+        if not indices:
+            return np.zeros(0, dtype=np.intp)
+        return np.concatenate(indices)
+
+    def draw(self, screen, show_vision: bool, camera):
+        config = self.config
+        registry = self.species_registry
+        if show_vision:
+            margin = c.MAX_GENE * float(registry.vision_multiplier.max())
+        else:
+            margin = config.entity_radius
+        visible = self.visible_agents(camera, margin)
+
+        for food in self.visible_food(camera, config.food_radius):
+            food.draw(screen, camera)
+
+        # Later species in the registry are drawn first (prey under predators)
+        visible = visible[np.lexsort((visible, -self.kind[visible]))]
+        vision = self.genes[:, registry.column("vision")]
+        radius = camera.scale(config.entity_radius)
+
+        for i in visible.tolist():
+            spec = registry.species[self.kind[i]]
+            screen_x, screen_y = camera.world_to_screen(self.x[i], self.y[i])
+            if show_vision:
+                reach = vision[i] * spec.vision_multiplier
+                self._draw_vision(screen, camera, spec, screen_x, screen_y, reach, i)
+
+            mating = self.score[i] >= config.reproduction_score_threshold
+            color = spec.mating_color if mating else spec.color
+            pygame.draw.circle(screen, color, (screen_x, screen_y), radius)
+
+    def _draw_vision(
+        self,
+        screen: pygame.Surface,
+        camera,
+        spec: c.Species,
+        screen_x: int,
+        screen_y: int,
+        reach: float,
+        agent: int,
+    ):
+        # Circle for all-round vision, cone outline otherwise
+        if spec.vision_angle >= 360:
+            pygame.draw.circle(
+                screen, spec.color, (screen_x, screen_y), camera.scale(reach), 2
+            )
+            return
+
+        length = reach * camera.zoom
+        half_cone = math.radians(spec.vision_angle / 2)
+        ends = [
+            (
+                screen_x + math.cos(self.direction[agent] + side * half_cone) * length,
+                screen_y + math.sin(self.direction[agent] + side * half_cone) * length,
+            )
+            for side in (-1, 1)
+        ]
+        pygame.draw.line(screen, spec.color, (screen_x, screen_y), ends[0], 2)
+        pygame.draw.line(screen, spec.color, (screen_x, screen_y), ends[1], 2)
+        pygame.draw.line(screen, spec.color, ends[0], ends[1], 2)
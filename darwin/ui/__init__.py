@@ -1,12 +1,20 @@
+from .camera import Camera
+from .density_map import DensityMap
 from .menu_screen import MenuScreen
+from .resource_layer import ResourceLayer
 from .simulation_screen import SimulationScreen
 from .statistics_screen import StatisticsScreen
+from .terrain_layer import TerrainLayer
 from .ui_utils import draw_text, text_width
 
 __all__ = [
+    "Camera",
+    "DensityMap",
     "MenuScreen",
+    "ResourceLayer",
     "SimulationScreen",
     "StatisticsScreen",
+    "TerrainLayer",
     "draw_text",
     "text_width",
 ]
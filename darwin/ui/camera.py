@@ -0,0 +1,117 @@
+import numpy as np
+from typing import List, Tuple
+
+from darwin import config as c
+
+
+class Camera:
+
+    def __init__(
+        self,
+        world_width: float,
+        world_height: float,
+        view_width: int = c.SCREEN_WIDTH,
+        view_height: int = c.SCREEN_HEIGHT,
+    ):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = view_width
+        self.view_height = view_height
+
+        # Never zoom out past the point where the whole world fits on screen,
+        # which leaves a margin along the world's relatively shorter side
+        self.min_zoom = min(
+            c.MAX_CAMERA_ZOOM,
+            view_width / world_width,
+            view_height / world_height,
+        )
+        self.reset()
+
+    def reset(self):
+        self.center_x = self.world_width / 2
+        self.center_y = self.world_height / 2
+        self.zoom = self.min_zoom
+
+    @property
+    def left(self) -> float:
+        return self.center_x - self.view_width / (2 * self.zoom)
+
+    @property
+    def top(self) -> float:
+        return self.center_y - self.view_height / (2 * self.zoom)
+
+    def pan(self, dx: float, dy: float):
+        # Offsets are in screen pixels, the world wraps around
+        self.center_x = (self.center_x + dx / self.zoom) % self.world_width
+        self.center_y = (self.center_y + dy / self.zoom) % self.world_height
+
+    def zoom_at(self, factor: float, screen_x: float, screen_y: float):
+        # Keep the world point under the cursor fixed while zooming
+        world_x, world_y = self.screen_to_world(screen_x, screen_y)
+        self.zoom = max(self.min_zoom, min(c.MAX_CAMERA_ZOOM, self.zoom * factor))
+        new_x, new_y = self.screen_to_world(screen_x, screen_y)
+        self.center_x = (self.center_x + world_x - new_x) % self.world_width
+        self.center_y = (self.center_y + world_y - new_y) % self.world_height
+
+    def screen_to_world(self, screen_x: float, screen_y: float) -> Tuple[float, float]:
+        world_x = (self.left + screen_x / self.zoom) % self.world_width
+        world_y = (self.top + screen_y / self.zoom) % self.world_height
+        return world_x, world_y
+
+    def world_to_screen(
+        self, x: float, y: float, margin: float = c.MAX_GENE * 2
+    ) -> Tuple[int, int]:
+        # Wrap relative to the view so entities across the world edge stay contiguous
+        dx = (x - self.left) % self.world_width
+        dy = (y - self.top) % self.world_height
+        if dx > self.view_width / self.zoom + margin:
+            dx -= self.world_width
+        if dy > self.view_height / self.zoom + margin:
+            dy -= self.world_height
+        return int(dx * self.zoom), int(dy * self.zoom)
+
+    def world_to_screen_array(
+        self, xs: np.ndarray, ys: np.ndarray, margin: float = c.MAX_GENE * 2
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # Vectorized world_to_screen, returns float screen coordinates
+        dx = (xs - self.left) % self.world_width
+        dy = (ys - self.top) % self.world_height
+        dx = np.where(
+            dx > self.view_width / self.zoom + margin, dx - self.world_width, dx
+        )
+        dy = np.where(
+            dy > self.view_height / self.zoom + margin, dy - self.world_height, dy
+        )
+        return dx * self.zoom, dy * self.zoom
+
+    def sample_points(
+        self, cols: int, rows: int, cell_size: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # World coordinates under the centers of a grid of screen tiles, as a
+        # column of x values and a row of y values
+        screen_x = (np.arange(cols) + 0.5) * cell_size
+        screen_y = (np.arange(rows) + 0.5) * cell_size
+        world_x = (self.left + screen_x / self.zoom) % self.world_width
+        world_y = (self.top + screen_y / self.zoom) % self.world_height
+        return world_x, world_y
+
+    def scale(self, length: float) -> int:
+        return max(1, int(length * self.zoom))
+
+    def visible_rects(
+        self, margin: float = 0.0
+    ) -> List[Tuple[float, float, float, float]]:
+        # Visible world area split into rectangles that do not cross the world edge
+        width = min(self.world_width, self.view_width / self.zoom + 2 * margin)
+        height = min(self.world_height, self.view_height / self.zoom + 2 * margin)
+        x0 = (self.left - margin) % self.world_width
+        y0 = (self.top - margin) % self.world_height
+
+        x_spans = [(x0, min(x0 + width, self.world_width))]
+        if x0 + width > self.world_width:
+            x_spans.append((0.0, x0 + width - self.world_width))
+        y_spans = [(y0, min(y0 + height, self.world_height))]
+        if y0 + height > self.world_height:
+            y_spans.append((0.0, y0 + height - self.world_height))
+
+        return [(xa, ya, xb, yb) for xa, xb in x_spans for ya, yb in y_spans]
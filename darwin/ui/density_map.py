@@ -0,0 +1,83 @@
+import math
+import numpy as np
+import pygame
+from typing import Dict, Optional, Tuple
+
+from darwin import config as c
+
+# Default layer colors, drawn additively in this order
+LAYER_COLORS = {
+    "food": c.GREEN,
+    "prey": c.BLUE,
+    "predators": c.RED,
+}
+
+
+class DensityMap:
+    # Renders populations as a coarse colored histogram in screen space, so the
+    # frame cost depends on the number of cells instead of the number of entities
+
+    def __init__(
+        self,
+        view_width: int = c.SCREEN_WIDTH,
+        view_height: int = c.SCREEN_HEIGHT,
+        cell_size: int = c.DENSITY_MAP_CELL_SIZE,
+    ):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.cell_size = cell_size
+        self.cols = int(math.ceil(view_width / cell_size))
+        self.rows = int(math.ceil(view_height / cell_size))
+
+    def histogram(self, camera, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        # Entity counts per screen cell, shape (cols, rows) as surfarray expects
+        screen_x, screen_y = camera.world_to_screen_array(xs, ys)
+        col = np.floor(screen_x / self.cell_size).astype(np.intp)
+        row = np.floor(screen_y / self.cell_size).astype(np.intp)
+        inside = (col >= 0) & (col < self.cols) & (row >= 0) & (row < self.rows)
+
+        cells = col[inside] * self.rows + row[inside]
+        counts = np.bincount(cells, minlength=self.cols * self.rows)
+        return counts.reshape(self.cols, self.rows)
+
+    def render(
+        self,
+        camera,
+        layers: Dict[str, np.ndarray],
+        colors: Optional[Dict[str, Tuple[int, int, int]]] = None,
+    ) -> pygame.Surface:
+        rgb = np.zeros((self.cols, self.rows, 3), dtype=float)
+
+        for name, color in (colors or LAYER_COLORS).items():
+            positions = layers.get(name)
+            if positions is None or len(positions) == 0:
+                continue
+
+            counts = self.histogram(camera, positions[:, 0], positions[:, 1])
+            peak = counts.max()
+            if peak == 0:
+                continue
+
+            # Log scale keeps sparse areas visible next to dense clusters
+            intensity = np.log1p(counts) / np.log1p(peak)
+            rgb += intensity[:, :, None] * np.array(color, dtype=float)
+
+        cells = pygame.surfarray.make_surface(np.clip(rgb, 0, 255).astype(np.uint8))
+        return pygame.transform.scale(
+            cells, (self.cols * self.cell_size, self.rows * self.cell_size)
+        )
+
+    def draw(
+        self,
+        screen: pygame.Surface,
+        camera,
+        layers: Dict[str, np.ndarray],
+        position: Tuple[int, int] = (0, 0),
+        colors: Optional[Dict[str, Tuple[int, int, int]]] = None,
+    ):
+        # Added on top so terrain and resources stay visible underneath
+        screen.blit(
+            self.render(camera, layers, colors),
+            position,
+            special_flags=pygame.BLEND_ADD,
+        )
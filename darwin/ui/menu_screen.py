@@ -1,6 +1,7 @@
 import pygame
 import sys
 from darwin import config as c
+from ..simulation.engines import DEFAULT_ENGINE, ENGINES
 from .ui_utils import draw_text, text_width
 
 class MenuScreen:
@@ -43,9 +44,48 @@ class MenuScreen:
                 "min": c.MIN_SIMULATION_SPEED,
                 "max": c.MAX_SIMULATION_SPEED,
             },
+            {
+                "name": "Dimensione Mondo",
+                "value": c.DEFAULT_WORLD_SCALE,
+                "min": c.MIN_WORLD_SCALE,
+                "max": c.MAX_WORLD_SCALE,
+            },
             {"name": "Raggio Visivo", "value": False, "type": "toggle"},
+            {
+                "name": "Motore",
+                "value": DEFAULT_ENGINE,
+                "type": "choice",
+                "options": list(ENGINES),
+            },
+            {
+                "name": "Modalità Cibo",
+                "value": c.DEFAULT_FOOD_MODE,
+                "type": "choice",
+                "options": list(c.FOOD_MODES),
+            },
+            {
+                "name": "Terreno",
+                "value": c.DEFAULT_TERRAIN,
+                "type": "choice",
+                "options": list(c.TERRAIN_MODES),
+            },
+            {
+                "name": "Intervallo Percezione",
+                "value": c.DEFAULT_PERCEPTION_INTERVAL,
+                "min": c.MIN_PERCEPTION_INTERVAL,
+                "max": c.MAX_PERCEPTION_INTERVAL,
+            },
+            {
+                "name": "Comportamento",
+                "value": c.DEFAULT_BEHAVIOR,
+                "type": "choice",
+                "options": list(c.BEHAVIOR_MODES),
+            },
         ]
 
+        # Population maxima for the default world, scaled with the world area
+        self.base_population_max = [param["max"] for param in self.parameters[:3]]
+
         self.selected_index = 0
 
     def _modify_parameter(self, direction):
@@ -54,6 +94,11 @@ class MenuScreen:
         if param.get("type") == "toggle":
             # Toggle boolean value
             param["value"] = not param["value"]
+        elif param.get("type") == "choice":
+            # Cycle through the options
+            options = param["options"]
+            index = (options.index(param["value"]) + direction) % len(options)
+            param["value"] = options[index]
         else:
             # Adjust numeric value
             step = 1
@@ -63,14 +108,43 @@ class MenuScreen:
             new_value = param["value"] + (direction * step)
             param["value"] = max(param["min"], min(param["max"], new_value))
 
+            if param["name"] == "Dimensione Mondo":
+                self._scale_population_limits(param["value"])
+
+    def _scale_population_limits(self, world_scale: int):
+        area_scale = world_scale * world_scale
+        for param, base_max in zip(self.parameters[:3], self.base_population_max):
+            param["max"] = base_max * area_scale
+            param["value"] = min(param["value"], param["max"])
+
     def start_simulation(self):
+        # Neural behavior runs on the vectorized engine when the chosen one
+        # only implements the rules
+        engine = self.parameters[7]["value"]
+        behavior = self.parameters[11]["value"]
+        if behavior not in ENGINES[engine].behaviors:
+            engine = "vectorized"
+        # Engines that perceive every tick ignore the perception interval
+        interval = self.parameters[10]["value"]
+        if not ENGINES[engine].cached_perception:
+            interval = c.DEFAULT_PERCEPTION_INTERVAL
+
         params = {
             "prey_count": self.parameters[0]["value"],
             "predator_count": self.parameters[1]["value"],
             "food_count": self.parameters[2]["value"],
             "duration": self.parameters[3]["value"],
             "speed": self.parameters[4]["value"],
-            "show_vision": self.parameters[5]["value"],
+            "show_vision": self.parameters[6]["value"],
+            "engine": engine,
+            "config": {
+                "world_width": c.WORLD_WIDTH * self.parameters[5]["value"],
+                "world_height": c.WORLD_HEIGHT * self.parameters[5]["value"],
+                "food_mode": self.parameters[8]["value"],
+                "terrain": self.parameters[9]["value"],
+                "perception_interval": interval,
+                "behavior": behavior,
+            },
         }
         self.app.start_simulation(params)
 
@@ -160,7 +234,7 @@ class MenuScreen:
                 screen,
                 param["name"],
                 name_x,
-                y_start + i * 40,
+                y_start + i * 36,
                 color,
                 c.FONT_SIZE_MEDIUM,
             )
@@ -184,7 +258,7 @@ class MenuScreen:
                 screen,
                 value_text,
                 value_x,
-                y_start + i * 40,
+                y_start + i * 36,
                 color,
                 c.FONT_SIZE_MEDIUM,
             )
@@ -196,7 +270,7 @@ class MenuScreen:
             screen,
             start_text,
             start_x,
-            y_start + len(self.parameters) * 40 + 60,
+            y_start + len(self.parameters) * 36 + 50,
             c.GREEN,
             c.FONT_SIZE_MEDIUM,
         )
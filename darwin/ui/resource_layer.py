@@ -0,0 +1,64 @@
+import math
+import numpy as np
+import pygame
+
+from darwin import config as c
+
+
+class ResourceLayer:
+    # Draws a ResourceField under the entities, added on top of the
+    # background or terrain. The colored field is cached as a small texture;
+    # the field changes every tick, so it is recolored at most every
+    # `refresh` frames, and not at all while it stays unchanged. Each frame
+    # samples it at a coarse screen resolution through the camera and scales
+    # the result up, so drawing cost depends on the view, not the world.
+
+    def __init__(
+        self,
+        view_width: int = c.SCREEN_WIDTH,
+        view_height: int = c.SCREEN_HEIGHT,
+        cell_size: int = c.RESOURCE_TEXTURE_CELL_SIZE,
+        refresh: int = c.RESOURCE_TEXTURE_REFRESH,
+    ):
+        self.view_width = view_width
+        self.view_height = view_height
+        self.cell_size = cell_size
+        self.cols = int(math.ceil(view_width / cell_size))
+        self.rows = int(math.ceil(view_height / cell_size))
+        self.refresh = refresh
+
+        self.texture = None
+        self.texture_field = None
+        self.texture_version = None
+        self.texture_age = 0
+
+    def _colored(self, field) -> np.ndarray:
+        # Field colors indexed [row, col], rebuilt for a new field, else once
+        # the field changed and the texture is `refresh` frames old
+        self.texture_age += 1
+        stale = (
+            self.texture_version != field.version and self.texture_age >= self.refresh
+        )
+        if self.texture is None or self.texture_field is not field or stale:
+            fraction = np.clip(field.density / field.config.resource_capacity, 0, 1)
+            full = np.array(c.GREEN, dtype=float) * 0.4
+            self.texture = (fraction[:, :, None] * full).astype(np.uint8)
+            self.texture_field = field
+            self.texture_version = field.version
+            self.texture_age = 0
+        return self.texture
+
+    def render(self, camera, field) -> pygame.Surface:
+        texture = self._colored(field)
+
+        # Field cell under each screen sample, shape (cols, rows)
+        world_x, world_y = camera.sample_points(self.cols, self.rows, self.cell_size)
+        row, col = field.cell_of(world_x[:, None], world_y[None, :])
+
+        samples = pygame.surfarray.make_surface(texture[row, col])
+        return pygame.transform.scale(
+            samples, (self.cols * self.cell_size, self.rows * self.cell_size)
+        )
+
+    def draw(self, screen: pygame.Surface, camera, field):
+        screen.blit(self.render(camera, field), (0, 0), special_flags=pygame.BLEND_ADD)
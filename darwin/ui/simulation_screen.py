@@ -1,5 +1,9 @@
 import pygame
 from darwin import config as c
+from .camera import Camera
+from .density_map import DensityMap
+from .resource_layer import ResourceLayer
+from .terrain_layer import TerrainLayer
 from .ui_utils import draw_text, text_width
 
 class SimulationScreen:
@@ -9,11 +13,23 @@ class SimulationScreen:
         self.simulation = simulation
         self.show_vision = simulation.show_vision
         self.paused = False
+        self.camera = Camera(
+            simulation.config.world_width, simulation.config.world_height
+        )
+        self.dragging = False
+
+        # Render mode: "auto" switches to the density map above the threshold
+        self.render_mode = "auto"
+        self.density_map = DensityMap()
+        self.resource_layer = ResourceLayer()
+        self.terrain_layer = (
+            TerrainLayer(simulation.terrain) if simulation.terrain is not None else None
+        )
 
     def handle_event(self, event: pygame.event.Event):
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_q:
-                self.app.show_statistics(self.simulation.get_statistics())
+                self._finish()
             elif event.key == pygame.K_SPACE:
                 self.paused = not self.paused
             elif event.key == pygame.K_v:
@@ -22,37 +38,70 @@ class SimulationScreen:
                 self.simulation.increase_speed()
             elif event.key == pygame.K_MINUS:
                 self.simulation.decrease_speed()
+            elif event.key == pygame.K_c:
+                self.camera.reset()
+            elif event.key == pygame.K_h:
+                modes = ["auto", "density", "entities"]
+                next_mode = (modes.index(self.render_mode) + 1) % len(modes)
+                self.render_mode = modes[next_mode]
+
+        # Camera: wheel zooms around the cursor, dragging pans the view
+        elif event.type == pygame.MOUSEWHEEL:
+            factor = c.CAMERA_ZOOM_STEP ** event.y
+            self.camera.zoom_at(factor, *pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+            self.dragging = True
+        elif event.type == pygame.MOUSEBUTTONUP and event.button in (1, 3):
+            self.dragging = False
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
+            self.camera.pan(-event.rel[0], -event.rel[1])
 
     def update(self, dt: float):
+        keys = pygame.key.get_pressed()
+        pan_x = keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]
+        pan_y = keys[pygame.K_DOWN] - keys[pygame.K_UP]
+        if pan_x or pan_y:
+            distance = c.CAMERA_PAN_SPEED * dt
+            self.camera.pan(pan_x * distance, pan_y * distance)
+
         if not self.paused:
             self.simulation.update(dt)
 
         # Check if simulation is finished
         if self.simulation.is_finished():
-            self.app.show_statistics(self.simulation.get_statistics())
+            self._finish()
+
+    def _finish(self):
+        # Flush the event log before leaving for the statistics
+        self.simulation.close()
+        self.app.show_statistics(self.simulation.get_statistics())
 
     def draw(self, screen: pygame.Surface):
         screen.fill(c.BLACK)
 
-        # Draw simulation entities
-        self.simulation.draw(screen, self.show_vision)
+        populations = self.simulation.population_counts()
+
+        # Terrain background, then the resource field (field food mode)
+        if self.terrain_layer is not None:
+            self.terrain_layer.draw(screen, self.camera)
+        if self.simulation.resources is not None:
+            self.resource_layer.draw(screen, self.camera, self.simulation.resources)
+
+        # Draw simulation entities, or their density when there are too many
+        species = self.simulation.species_registry.species
+        if self._use_density_map(populations):
+            colors = {"food": c.GREEN}
+            colors.update((spec.name, spec.color) for spec in reversed(species))
+            layers = {name: self.simulation.positions(name) for name in colors}
+            self.density_map.draw(screen, self.camera, layers, colors=colors)
+        else:
+            self.simulation.draw(screen, self.show_vision, self.camera)
 
         # Draw HUD
         simulation_state = {
-            "predator_count": len(
-                [
-                    e
-                    for e in self.simulation.entities
-                    if e.__class__.__name__ == "Predator" and e.alive
-                ]
-            ),
-            "prey_count": len(
-                [
-                    e
-                    for e in self.simulation.entities
-                    if e.__class__.__name__ == "Prey" and e.alive
-                ]
-            ),
+            "populations": [
+                (spec.label, spec.color, populations[spec.name]) for spec in species
+            ],
             "time_remaining": self.simulation.time_remaining,
             "speed": self.simulation.speed,
         }
@@ -77,53 +126,68 @@ class SimulationScreen:
             "Spazio: Pausa",
             "V: Toggle Visione",
             "+/-: Velocità",
+            "Frecce/Trascina: Sposta camera",
+            "Rotella: Zoom",
+            "C: Centra camera",
+            "H: Modalità rendering",
         ]
 
-        y_offset = c.SCREEN_HEIGHT - 100
+        y_offset = c.SCREEN_HEIGHT - 20 * len(controls) - 20
         for control in controls:
             draw_text(screen, control, 20, y_offset, c.WHITE, c.FONT_SIZE_SMALL)
             y_offset += 20
 
+    def _use_density_map(self, populations: dict) -> bool:
+        if self.render_mode == "auto":
+            return sum(populations.values()) > c.DENSITY_MAP_THRESHOLD
+        return self.render_mode == "density"
+
     def _draw_simulation_hud(self, screen: pygame.Surface, simulation_state: dict):
 
         y_offset = 20
 
-        # Population counts
-        predator_count = simulation_state.get("predator_count", 0)
-        prey_count = simulation_state.get("prey_count", 0)
+        # Population counts, one line per species
+        for label, color, count in simulation_state.get("populations", []):
+            draw_text(
+                screen, f"{label}: {count}", 20, y_offset, color, c.FONT_SIZE_MEDIUM
+            )
+            y_offset += 25
 
+        # Time remaining
+        time_remaining = simulation_state.get("time_remaining", 0)
+        minutes = int(time_remaining // 60)
+        seconds = int(time_remaining % 60)
         draw_text(
             screen,
-            f"Predatori: {predator_count}",
+            f"Tempo: {minutes:02d}:{seconds:02d}",
             20,
             y_offset,
-            c.RED,
+            c.WHITE,
             c.FONT_SIZE_MEDIUM,
         )
+
+        # Speed indicator
+        speed = simulation_state.get("speed", 1)
         draw_text(
-            screen,
-            f"Prede: {prey_count}",
-            20,
-            y_offset + 25,
-            c.BLUE,
-            c.FONT_SIZE_MEDIUM,
+            screen, f"Velocità: {speed}x", 20, y_offset + 25, c.WHITE, c.FONT_SIZE_SMALL
         )
 
-        # Time remaining
-        time_remaining = simulation_state.get("time_remaining", 0)
-        minutes = int(time_remaining // 60)
-        seconds = int(time_remaining % 60)
+        # Zoom indicator
         draw_text(
             screen,
-            f"Tempo: {minutes:02d}:{seconds:02d}",
+            f"Zoom: {self.camera.zoom:.2f}x",
             20,
-            y_offset + 50,
+            y_offset + 45,
             c.WHITE,
-            c.FONT_SIZE_MEDIUM,
+            c.FONT_SIZE_SMALL,
         )
 
-        # Speed indicator
-        speed = simulation_state.get("speed", 1)
+        # Render mode indicator
         draw_text(
-            screen, f"Velocità: {speed}x", 20, y_offset + 75, c.WHITE, c.FONT_SIZE_SMALL
+            screen,
+            f"Rendering: {self.render_mode}",
+            20,
+            y_offset + 65,
+            c.WHITE,
+            c.FONT_SIZE_SMALL,
         )
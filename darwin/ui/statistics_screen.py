@@ -9,6 +9,9 @@ class StatisticsScreen:
         self.app = app
         self.statistics = statistics
 
+    def _species(self):
+        return self.statistics.get("species", c.DEFAULT_SPECIES)
+
     def restart_simulation(self):
         self.app.restart_simulation()
 
@@ -60,26 +63,17 @@ class StatisticsScreen:
             draw_text(screen, "Popolazioni:", 50, y_offset, c.WHITE, c.FONT_SIZE_LARGE)
             y_offset += 35
 
-            predators = populations.get("predators", 0)
-            prey = populations.get("prey", 0)
-
-            draw_text(
-                screen,
-                f"Predatori: {predators}",
-                70,
-                y_offset,
-                c.RED,
-                c.FONT_SIZE_MEDIUM,
-            )
-            draw_text(
-                screen,
-                f"Prede: {prey}",
-                70,
-                y_offset + 25,
-                c.BLUE,
-                c.FONT_SIZE_MEDIUM,
-            )
-            y_offset += 60
+            for spec in self._species():
+                draw_text(
+                    screen,
+                    f"{spec.label}: {populations.get(spec.name, 0)}",
+                    70,
+                    y_offset,
+                    spec.color,
+                    c.FONT_SIZE_MEDIUM,
+                )
+                y_offset += 25
+            y_offset += 10
 
         # Evolution info
         if "evolution_info" in self.statistics:
@@ -136,25 +130,17 @@ class StatisticsScreen:
             )
             y_offset += 30
 
-            predator_survival = survival.get("predator_survival_rate", 0)
-            prey_survival = survival.get("prey_survival_rate", 0)
-
-            draw_text(
-                screen,
-                f"Predatori: {predator_survival:.1f}%",
-                70,
-                y_offset,
-                c.RED,
-                c.FONT_SIZE_MEDIUM,
-            )
-            draw_text(
-                screen,
-                f"Prede: {prey_survival:.1f}%",
-                70,
-                y_offset + 25,
-                c.BLUE,
-                c.FONT_SIZE_MEDIUM,
-            )
-            y_offset += 60
+            for spec in self._species():
+                rate = survival.get(f"{spec.key}_survival_rate", 0)
+                draw_text(
+                    screen,
+                    f"{spec.label}: {rate:.1f}%",
+                    70,
+                    y_offset,
+                    spec.color,
+                    c.FONT_SIZE_MEDIUM,
+                )
+                y_offset += 25
+            y_offset += 10
 
         return y_offset
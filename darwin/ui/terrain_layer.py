@@ -0,0 +1,45 @@
+import math
+import pygame
+
+from darwin import config as c
+
+
+class TerrainLayer:
+    # Background for a Terrain. Biome colors are rendered once into a small
+    # texture; the screen image sampled from it through the camera is kept
+    # until the camera moves, so a still view costs a single blit per frame.
+
+    def __init__(
+        self,
+        terrain,
+        view_width: int = c.SCREEN_WIDTH,
+        view_height: int = c.SCREEN_HEIGHT,
+        cell_size: int = c.RESOURCE_TEXTURE_CELL_SIZE,
+    ):
+        self.terrain = terrain
+        self.texture = terrain.colors()
+        self.view_width = view_width
+        self.view_height = view_height
+        self.cell_size = cell_size
+        self.cols = int(math.ceil(view_width / cell_size))
+        self.rows = int(math.ceil(view_height / cell_size))
+
+        self.surface = None
+        self.view = None
+
+    def render(self, camera) -> pygame.Surface:
+        view = (camera.center_x, camera.center_y, camera.zoom)
+        if self.surface is None or self.view != view:
+            world_x, world_y = camera.sample_points(
+                self.cols, self.rows, self.cell_size
+            )
+            row, col = self.terrain.cell_of(world_x[:, None], world_y[None, :])
+            samples = pygame.surfarray.make_surface(self.texture[row, col])
+            self.surface = pygame.transform.scale(
+                samples, (self.cols * self.cell_size, self.rows * self.cell_size)
+            )
+            self.view = view
+        return self.surface
+
+    def draw(self, screen: pygame.Surface, camera):
+        screen.blit(self.render(camera), (0, 0))
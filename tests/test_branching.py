@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from darwin.simulation.branching import Branch, branch, run_ticks
+from darwin.simulation.engines import create_simulation
+from darwin.simulation.environment import default_params
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+
+def _simulation(engine="reference"):
+    simulation = create_simulation(dict(default_params(), engine=engine, seed=5))
+    run_ticks(simulation, 30)
+    return simulation
+
+
+@pytest.mark.parametrize("engine", ["reference", "vectorized"])
+def test_branches_diverge_and_leave_the_parent_alone(engine):
+    simulation = _simulation(engine)
+    before = simulation.tick
+    same, other, richer = branch(
+        simulation,
+        [Branch(seed=1), Branch(seed=1), Branch(seed=1, params={"food_count": 200})],
+        ticks=60,
+        collect=lambda s: (s.tick, s.params["food_count"], s.get_statistics()),
+    )
+    assert simulation.tick == before
+    assert same[0] == before + 60
+    assert same[2]["final_populations"] == other[2]["final_populations"]
+    assert richer[1] == 200
+
+
+def test_a_failing_branch_is_reported():
+    simulation = _simulation()
+    with pytest.raises(RuntimeError, match="branch 1 failed"):
+        branch(simulation, [Branch(), Branch(config={"food_mode": "nope"})], ticks=1)
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_workers_do_not_hold_their_siblings_pipes():
+    simulation = _simulation()
+    counts = branch(
+        simulation,
+        [Branch() for _ in range(4)],
+        ticks=1,
+        collect=lambda s: len(os.listdir("/proc/self/fd")),
+    )
+    assert len(set(counts)) == 1
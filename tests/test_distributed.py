@@ -0,0 +1,116 @@
+import dataclasses
+import json
+import socket
+import threading
+import time
+
+from darwin import config as c
+from darwin.simulation.distributed import (
+    Coordinator,
+    Worker,
+    _portable,
+    config_fields,
+    config_from_fields,
+    receive_message,
+    send_message,
+)
+from darwin.simulation.environment import default_params
+from darwin.simulation.sweep import run_headless
+
+
+def _work(coordinator, outcomes):
+    outcomes.append(Worker(*coordinator.address).run())
+
+
+def test_worker_abandons_a_cancelled_job():
+    # Leases lapse long before the first heartbeat, so every attempt is
+    # cancelled; a run that went on would take minutes
+    spec = dict(default_params(), duration=c.MAX_SIMULATION_DURATION, seed=1)
+    coordinator = Coordinator([spec], port=0, timeout=0.1)
+    outcomes = []
+    worker = threading.Thread(target=_work, args=(coordinator, outcomes))
+    worker.start()
+    started = time.monotonic()
+    results = coordinator.serve()
+    worker.join(timeout=30)
+
+    assert results == [None]
+    assert outcomes == [0]
+    assert coordinator.duplicates == 0
+    assert time.monotonic() - started < 6 * c.MAX_JOB_ATTEMPTS * c.HEARTBEAT_INTERVAL
+
+
+def test_late_results_and_failures_leave_the_current_lease_alone():
+    spec = dict(default_params(), duration=1, seed=2)
+    statistics = _portable(run_headless(spec))
+    coordinator = Coordinator([spec], port=0)
+    expired, current = object(), object()
+    try:
+        assert coordinator._reply(expired, {"type": "request"})["type"] == "job"
+        # The first lease lapses and the job goes to another worker
+        coordinator.leases[0] = (time.monotonic() - 1, expired)
+        assert coordinator._reply(current, {"type": "request"})["type"] == "job"
+
+        failed = {"type": "failed", "job": 0, "error": "late"}
+        coordinator._reply(expired, failed)
+        heartbeat = {"type": "heartbeat", "job": 0}
+        assert coordinator._reply(current, heartbeat)["type"] == "ok"
+        assert coordinator._reply(expired, heartbeat)["type"] == "cancel"
+
+        result = {"type": "result", "job": 0, "statistics": statistics}
+        coordinator._reply(current, result)
+        coordinator._reply(expired, result)
+        assert coordinator.duplicates == 1
+        assert coordinator.finished() and not coordinator.failures
+    finally:
+        coordinator.server.server_close()
+
+
+def test_custom_species_match_a_local_run():
+    prey = dataclasses.replace(c.DEFAULT_SPECIES[1], vision_multiplier=1.5)
+    spec = dict(
+        default_params(),
+        engine="vectorized",
+        duration=3,
+        seed=4,
+        config={"species": (c.DEFAULT_SPECIES[0], prey), "mutation_rate": 0.2},
+    )
+    config = c.SimulationConfig.from_overrides(spec["config"])
+    assert config_from_fields(json.loads(json.dumps(config_fields(config)))) == config
+
+    coordinator = Coordinator([spec], port=0)
+    outcomes = []
+    worker = threading.Thread(target=_work, args=(coordinator, outcomes))
+    worker.start()
+    (remote,) = coordinator.serve()
+    worker.join(timeout=30)
+    local = run_headless(spec)
+
+    assert outcomes == [1]
+    assert remote["species"] == local["species"]
+    assert remote["simulation_params"] == local["simulation_params"]
+    for key in ("final_populations", "genome_statistics", "population_history"):
+        assert remote[key] == local[key]
+
+
+def test_malformed_messages_get_an_error_reply():
+    coordinator = Coordinator([dict(default_params(), duration=1, seed=3)], port=0)
+    thread = threading.Thread(target=coordinator.server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.create_connection(coordinator.address) as connection:
+            for message in (
+                {"type": "heartbeat"},
+                {"type": "result", "job": 5, "statistics": {}},
+                {"type": "failed", "job": "0"},
+                {"type": "result", "job": 0},
+                ["request"],
+            ):
+                send_message(connection, message)
+                assert receive_message(connection)["type"] == "error"
+            # The handler survived and still leases jobs
+            send_message(connection, {"type": "request"})
+            assert receive_message(connection)["type"] == "job"
+    finally:
+        coordinator.server.shutdown()
+        coordinator.server.server_close()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from darwin.simulation.environment import SimulationEnv, default_params
+
+
+def test_steps_need_a_reset():
+    with pytest.raises(RuntimeError, match="reset"):
+        SimulationEnv().step()
+
+
+@pytest.mark.parametrize("engine", ["reference", "batched", "vectorized"])
+def test_same_seed_replays_the_same_run(engine):
+    env = SimulationEnv()
+    params = dict(default_params(), engine=engine)
+    first = env.reset(params, seed=8)
+    assert first.tick == 0 and first.populations["prey"] == params["prey_count"]
+    after = env.step(20)
+    env.reset(params, seed=8)
+    again = env.step(20)
+    env.close()
+
+    assert after.tick == again.tick == 20
+    assert after.time == pytest.approx(20 * env.dt)
+    assert after.populations == again.populations
+    assert after.gene_moments == again.gene_moments
+
+
+def test_stream_yields_every_few_ticks_and_stops_at_the_end():
+    env = SimulationEnv()
+    env.reset(dict(default_params(), duration=1), seed=9)
+    ticks = [observation.tick for observation in env.stream(every=7, ticks=30)]
+    assert ticks == [0, 7, 14, 21, 28, 30]
+
+    observations = list(env.stream(every=25, views=True))
+    assert observations[-1].finished
+    assert all(not o.finished for o in observations[:-1])
+    populations, state = observations[-1].populations, observations[-1].state
+    assert len(state["x"]) == populations["predators"] + populations["prey"]
+    assert np.all(np.isfinite(state["x"]))
+    env.close()
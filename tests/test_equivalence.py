@@ -0,0 +1,28 @@
+from darwin.simulation.environment import default_params
+from darwin.simulation.equivalence import compare_engines
+from darwin.simulation.simulation import Simulation
+
+
+class _Nudged(Simulation):
+    # Reference engine that moves its first prey sideways after tick 3
+    def update(self, dt: float):
+        super().update(dt)
+        if self.tick == 3:
+            prey = next(e for e in self.entities if e.species == "prey")
+            prey.x = (prey.x + 1.0) % self.config.world_width
+
+
+def test_reference_is_equivalent_to_itself():
+    report = compare_engines(Simulation, Simulation, default_params(), seed=1, ticks=30)
+    assert report.equivalent
+    assert report.ticks == 30
+    assert report.max_position_error == 0
+
+
+def test_perturbed_position_is_reported_at_its_tick():
+    report = compare_engines(Simulation, _Nudged, default_params(), seed=1, ticks=30)
+    divergence = report.divergence
+    assert divergence is not None
+    assert (divergence.tick, divergence.quantity) == (3, "position")
+    assert (divergence.species, divergence.entity) == ("prey", 0)
+    assert abs(divergence.candidate[0] - divergence.reference[0]) > 0.5
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from darwin.simulation import events
+from darwin.simulation.engines import create_simulation
+from darwin.simulation.environment import DEFAULT_DT, default_params
+
+
+def _record(log):
+    log.record(1, events.MEAL, 4, 2, 10.0, 20.0)
+    log.record_many(
+        2, events.KILL, np.array([5, 6]), np.array([7, 8]), np.ones(2), np.zeros(2)
+    )
+    log.record(3, events.STARVATION, 9, -1, 0.5, 0.25)
+
+
+def test_file_and_memory_logs_keep_the_same_order(tmp_path):
+    path = str(tmp_path / "events.bin")
+    kept, written = events.EventLog(buffer_size=2), events.EventLog(path, 2)
+    _record(kept)
+    _record(written)
+    written.close()
+
+    stored = events.read_events(path)
+    assert np.array_equal(stored, kept.events())
+    assert stored["tick"].tolist() == [1, 2, 2, 3]
+    assert stored["actor"].tolist() == [4, 5, 6, 9]
+    assert events.select(stored, events.KILL)["target"].tolist() == [7, 8]
+    actors, counts = events.counts_by_actor(stored, events.KILL)
+    assert actors.tolist() == [5, 6] and counts.tolist() == [1, 1]
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not an event log")
+    with pytest.raises(ValueError, match="Not an event log"):
+        events.read_events(str(path))
+
+
+@pytest.mark.parametrize("engine", ["reference", "batched", "vectorized"])
+def test_runs_log_their_births_and_kills(engine, tmp_path):
+    path = str(tmp_path / "events.bin")
+    params = dict(default_params(), engine=engine, seed=3, event_log=path)
+    simulation = create_simulation(params)
+    for _ in range(600):
+        simulation.update(DEFAULT_DT)
+    simulation.close()
+
+    logged = events.read_events(path)
+    assert len(events.select(logged, events.KILL)) == simulation.total_kills > 0
+    assert len(events.select(logged, events.BIRTH)) == simulation.total_reproductions
+    assert len(events.select(logged, events.MEAL)) > 0
+    assert np.all(np.diff(logged["tick"].astype(int)) >= 0)
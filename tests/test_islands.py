@@ -0,0 +1,51 @@
+import multiprocessing
+
+from darwin.simulation.environment import DEFAULT_DT, default_params
+from darwin.simulation.islands import _island, _island_params
+
+
+def test_island_runs_never_stop_early():
+    params = dict(default_params(), early_stop=True)
+    assert _island_params(params, 0, 1)["early_stop"] is False
+
+
+def test_islands_finishing_at_different_epochs_do_not_wait_for_each_other():
+    # The short island stops after its first migration; the others must
+    # still finish and exit
+    durations = [3, 10, 10]
+    inboxes = [multiprocessing.Queue() for _ in durations]
+    results = multiprocessing.Queue()
+    settings = {
+        "interval": 2,
+        "migrants": 2,
+        "topology": "ring",
+        "dt": DEFAULT_DT,
+        "seed": 0,
+    }
+    workers = [
+        multiprocessing.Process(
+            target=_island,
+            args=(
+                index,
+                dict(default_params(), duration=duration, seed=index),
+                inboxes,
+                results,
+                settings,
+            ),
+            daemon=True,
+        )
+        for index, duration in enumerate(durations)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        reports = [results.get(timeout=120) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=30)
+            assert not worker.is_alive()
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+    assert sorted(index for index, _, _ in reports) == [0, 1, 2]
+    assert all(ok for _, ok, _ in reports)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from darwin.simulation import lineage
+from darwin.simulation.engines import create_simulation
+from darwin.simulation.environment import DEFAULT_DT, default_params
+
+
+def _family():
+    # Founders 0-2; 3 = 0 x 1, 4 = 3 x 2, 5 = 3 x 4. The small capacity
+    # makes the columns grow.
+    store = lineage.LineageStore(gene_count=2, capacity=2)
+    store.add_births([0, 1, 2], [0, 0, 1], [-1] * 3, [-1] * 3, 0, np.zeros((3, 2)))
+    store.add_births([3], [0], [0], [1], 5, [[1.0, 2.0]])
+    store.add_births([4, 5], [1, 1], [3, 3], [2, 4], 9, np.ones((2, 2)))
+    store.add_deaths([0, 3], 12, [lineage.KILLED, lineage.STARVED])
+    return store
+
+
+def test_family_queries():
+    store = _family()
+    assert len(store) == 6
+    assert store.ancestors([5]).tolist() == [0, 1, 2, 3, 4]
+    assert store.ancestors([5], generations=1).tolist() == [3, 4]
+    assert store.descendants([0]).tolist() == [3, 4, 5]
+    assert store.descendants([2], generations=1).tolist() == [4]
+    assert store.generations().tolist() == [0, 0, 0, 1, 2, 3]
+    assert store.offspring[: len(store)].tolist() == [1, 1, 1, 2, 1, 0]
+    assert store.lifespans(20).tolist() == [12, 20, 20, 7, 11, 11]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    store = _family()
+    path = str(tmp_path / "lineage.npz")
+    store.save(path)
+    loaded = lineage.LineageStore.load(path)
+    assert len(loaded) == len(store)
+    for name in list(lineage.COLUMNS) + ["genes"]:
+        assert np.array_equal(
+            getattr(loaded, name)[: len(store)], getattr(store, name)[: len(store)]
+        )
+
+
+@pytest.mark.parametrize("engine", ["reference", "vectorized"])
+def test_runs_save_their_lineage(engine, tmp_path):
+    path = str(tmp_path / "lineage.npz")
+    params = dict(default_params(), engine=engine, seed=3, lineage_file=path)
+    simulation = create_simulation(params)
+    for _ in range(600):
+        simulation.update(DEFAULT_DT)
+    simulation.close()
+
+    store = lineage.LineageStore.load(path)
+    founders = params["prey_count"] + params["predator_count"]
+    born = store.first_parent[: len(store)] >= 0
+    assert len(store) == founders + simulation.total_reproductions
+    assert int(born.sum()) == simulation.total_reproductions
+    dead = store.cause[: len(store)] != lineage.ALIVE
+    assert int(dead.sum()) == len(store) - sum(
+        count
+        for name, count in simulation.population_counts().items()
+        if name != "food"
+    )
@@ -0,0 +1,24 @@
+import pytest
+
+from darwin.simulation.environment import DEFAULT_DT, default_params
+from darwin.simulation.multiworld import MultiWorldSimulation
+
+
+def _worlds(count, **overrides):
+    return [
+        dict(default_params(), duration=5, seed=seed, **overrides)
+        for seed in range(count)
+    ]
+
+
+def test_early_stop_is_rejected():
+    with pytest.raises(ValueError, match="cannot stop early"):
+        MultiWorldSimulation(_worlds(2, early_stop=True))
+
+
+def test_runs_to_the_end_without_early_stop():
+    simulation = MultiWorldSimulation(_worlds(2))
+    while not simulation.is_finished():
+        simulation.update(DEFAULT_DT)
+    assert simulation.stop_reason is None
+    assert all(world["stop_reason"] is None for world in simulation.get_statistics())
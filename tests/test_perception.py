@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from darwin.simulation.batched import BatchedSimulation
+from darwin.simulation.environment import DEFAULT_DT, default_params
+from darwin.simulation.multiworld import MultiWorldSimulation
+from darwin.simulation.vectorized import VectorizedSimulation
+
+
+def test_batched_perception_matches_per_entity_perception():
+    # On one frozen world state, the batched pass and every agent's own
+    # perceive() pick the same targets, threats and food
+    simulation = BatchedSimulation(dict(default_params(), seed=3))
+    for _ in range(300):
+        simulation.update(DEFAULT_DT)
+
+    agents = [e for e in simulation.entities if e.alive]
+    batched = simulation._perceive(agents, np.ones(len(agents), dtype=bool))
+    assert any(agent.can_reproduce for agent in agents)
+
+    threatened = foraging = 0
+    for agent, perception in zip(agents, batched):
+        expected = agent.perceive(simulation.entities)
+        assert perception.threat is expected.threat
+        if expected.threat is not None:
+            # A threatened prey flees and looks for nothing else
+            threatened += 1
+            continue
+        assert perception.target is expected.target
+        foraging += expected.target is not None
+    assert threatened and foraging
+
+
+@pytest.mark.parametrize("engine", [VectorizedSimulation, MultiWorldSimulation])
+def test_engines_perceiving_every_tick_reject_an_interval(engine):
+    params = dict(default_params(), config={"perception_interval": 3})
+    with pytest.raises(ValueError, match="perception interval"):
+        engine([params] if engine is MultiWorldSimulation else params)
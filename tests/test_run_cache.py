@@ -0,0 +1,62 @@
+import os
+
+from darwin.simulation.environment import default_params
+from darwin.simulation.run_cache import RunCache, run_key
+from darwin.simulation.sweep import run_cached
+
+
+def _params(**overrides):
+    params = dict(default_params(), duration=1, seed=6)
+    params.update(overrides)
+    return params
+
+
+def test_keys_follow_the_run_spec():
+    assert run_key(_params()) == run_key(_params(show_vision=True))
+    assert run_key(_params()) != run_key(_params(seed=7))
+    assert run_key(_params()) != run_key(_params(config={"mutation_rate": 0.2}))
+    assert run_key(_params(seed=None)) is None
+
+
+def test_terrain_images_enter_the_key_by_content(tmp_path):
+    image = tmp_path / "biomes.png"
+    params = _params(config={"terrain": str(image)})
+    assert run_key(params) is None
+
+    image.write_bytes(b"first")
+    first = run_key(params)
+    image.write_bytes(b"second")
+    assert first is not None and run_key(params) != first
+
+
+def test_second_run_comes_from_the_cache(tmp_path):
+    cache = RunCache(str(tmp_path))
+    statistics, cached = run_cached(_params(), cache=cache)
+    again, cached_again = run_cached(_params(), cache=cache)
+    assert (cached, cached_again) == (False, True)
+    assert again["final_populations"] == statistics["final_populations"]
+    assert again["population_history"] == statistics["population_history"]
+
+    # Runs writing files always run, though their results are stored
+    log = str(tmp_path / "events.log")
+    assert run_cached(_params(event_log=log), cache=cache)[1] is False
+
+
+def test_damaged_entries_are_misses(tmp_path):
+    cache = RunCache(str(tmp_path))
+    cache.put("key", {"value": 1})
+    assert cache.get("key") == {"value": 1}
+
+    path = os.path.join(str(tmp_path), "key.run")
+    with open(path, "r+b") as stream:
+        stream.seek(-1, os.SEEK_END)
+        stream.write(b"\0")
+    assert cache.get("key") is None
+    assert not os.path.exists(path)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = RunCache(str(tmp_path), max_bytes=1)
+    cache.put("old", {"value": 1})
+    cache.put("new", {"value": 2})
+    assert cache.get("old") is None
@@ -0,0 +1,39 @@
+import pytest
+
+from darwin.simulation.engines import create_simulation
+from darwin.simulation.environment import default_params
+from darwin.simulation.search import check_space, run_params
+
+
+def _base(engine, **config):
+    return dict(default_params(), engine=engine, config=config)
+
+
+def test_searched_config_fields_reach_the_engine():
+    base = _base("vectorized")
+    values = {"predator_vision_angle": 360, "prey_reproduction_gain": 0.0}
+    check_space(base, {name: (value, value) for name, value in values.items()})
+    simulation = create_simulation(run_params(base, values, duration=5, seed=0))
+    registry = simulation.species_registry
+    prey = registry.index["prey"]
+    assert registry.cos_half_cone[registry.index["predators"]] == pytest.approx(-1)
+    assert registry.reproduction_gain[prey] == 0
+
+
+@pytest.mark.parametrize(
+    "base, name, message",
+    [
+        (_base("vectorized"), "speed", "Cannot search"),
+        (_base("vectorized"), "food_mode", "Cannot search"),
+        (_base("vectorized"), "grazing_rate", "unused"),
+        (_base("vectorized"), "perception_interval", "perception interval"),
+    ],
+)
+def test_ranges_no_run_reads_are_rejected(base, name, message):
+    with pytest.raises(ValueError, match=message):
+        check_space(base, {name: (1, 3)})
+
+
+def test_mode_fields_are_searchable_in_their_mode():
+    check_space(_base("vectorized", food_mode="field"), {"grazing_rate": (1, 3)})
+    check_space(_base("reference"), {"perception_interval": (1, 3)})
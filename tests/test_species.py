@@ -0,0 +1,31 @@
+import dataclasses
+
+import pytest
+
+from darwin import config as c
+from darwin.simulation.environment import default_params
+from darwin.simulation.vectorized import VectorizedSimulation
+
+
+def test_default_species_follow_the_config_fields():
+    assert c.DEFAULT_CONFIG.defined_species == c.DEFAULT_SPECIES
+    overrides = {
+        "predator_vision_angle": 360,
+        "predator_vision_multiplier": 2.0,
+        "predator_reproduction_gain": 0,
+        "prey_reproduction_gain": 0,
+    }
+    params = dict(default_params(), engine="vectorized", config=overrides)
+    registry = VectorizedSimulation(params).species_registry
+    predators = registry.index["predators"]
+    assert registry.cos_half_cone[predators] == pytest.approx(-1)
+    assert registry.vision_multiplier[predators] == 2.0
+    assert not registry.reproduction_gain.any()
+
+
+def test_explicit_species_reject_the_default_species_fields():
+    prey = dataclasses.replace(c.DEFAULT_SPECIES[1], vision_angle=180)
+    species = (c.DEFAULT_SPECIES[0], prey)
+    assert c.SimulationConfig(species=species).defined_species == species
+    with pytest.raises(ValueError, match="explicit species"):
+        c.SimulationConfig(species=species, prey_vision_angle=180)